@@ -0,0 +1,167 @@
+"""
+Load test of the HTTP API against a SQLite stand-in
+
+Starts the API with uvicorn on a temporary SQLite database, seeds it, and sends concurrent requests to the list and
+simulation endpoints. For comparison it also times the equivalent CLI invocation, which pays interpreter start-up
+and a new database connection per call. Run with ``python -m benchmarks.api``, the API can also be load tested with
+any HTTP tool after ``PROPERTY_TRACKER_DATABASE_URL=sqlite:///stand-in.db uvicorn property_tracker.api:app``.
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+ROOT = Path(__file__).resolve().parent.parent
+PORT = 8765
+
+SIMULATION = {
+    "property_details": {
+        "purchase_price": 250000,
+        "monthly_rent": 1200,
+        "insurance": 30,
+        "service_charge": 100,
+        "ground_rent": 20,
+        "annual_price_appreciation": 0.03,
+        "annual_rent_appreciation": 0.02,
+    },
+    "investment_details": {
+        "down_payment": 62500,
+        "interest_rate": 4.5,
+        "payment_term": 25,
+        "legal_fees": 2000,
+        "refurbishment_cost": 5000,
+        "furnishing_cost": 3000,
+    },
+    "investor_type": "Sole Trader",
+    "num_years": 25,
+}
+
+
+async def seed(client: httpx.AsyncClient, num_properties: int):
+    """Create properties to list"""
+    for number in range(num_properties):
+        await client.post(
+            "/properties",
+            json={
+                "address": f"{number} Benchmark Road",
+                "postcode": "E1 1AA",
+                "city": "London",
+                "no_of_bedrooms": 2,
+                "no_of_bathrooms": 1,
+                "sqm": 60,
+                "floor": 1,
+                "furnished": False,
+                "property_type": "Flat",
+                "status": "Rented",
+            },
+        )
+
+
+async def load(client: httpx.AsyncClient, method: str, path: str, num_requests: int, concurrency: int, **kwargs):
+    """Send requests with a bounded concurrency, returning the throughput and the latencies in milliseconds"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(number: int):
+        async with semaphore:
+            start = time.perf_counter()
+            json = kwargs.get("json")
+            if json is not None:
+                # vary the inputs so that the simulations are not answered from the cache
+                json = {**json, "num_years": 5 + number % 30}
+            response = await client.request(method, path, params=kwargs.get("params"), json=json)
+            response.raise_for_status()
+            latencies.append(1000 * (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(number) for number in range(num_requests)))
+    elapsed = time.perf_counter() - start
+    return num_requests / elapsed, latencies
+
+
+def wait_for_server(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{url}/docs")
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("The API did not start")
+
+
+def cli_latency_ms(env, repeat: int = 5) -> float:
+    """Median latency of listing the properties with the CLI"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py", "property", "ls"], cwd=ROOT, env=env, capture_output=True, check=True
+        )
+        latencies.append(1000 * (time.perf_counter() - start))
+    return statistics.median(latencies)
+
+
+async def run_load(url: str, num_requests: int, concurrency: int):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        await seed(client, 50)
+        return {
+            "GET /properties": await load(
+                client, "GET", "/properties", num_requests, concurrency, params={"limit": 20}
+            ),
+            "POST /simulations": await load(
+                client, "POST", "/simulations", num_requests // 4, concurrency, json=SIMULATION
+            ),
+        }
+
+
+def run(num_requests: int = 1000, concurrency: int = 20):
+    """Load test the API and report the throughput and latency of each endpoint"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, "PROPERTY_TRACKER_DATABASE_URL": f"sqlite:///{Path(directory) / 'stand-in.db'}"}
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "property_tracker.api:app",
+                "--port",
+                str(PORT),
+                "--log-level",
+                "warning",
+            ],
+            cwd=ROOT,
+            env=env,
+        )
+        url = f"http://127.0.0.1:{PORT}"
+        try:
+            wait_for_server(url)
+            results = asyncio.run(run_load(url, num_requests, concurrency))
+            cli_ms = cli_latency_ms(env)
+        finally:
+            server.terminate()
+            server.wait()
+
+    table = Table(title=f"API load test on SQLite ({concurrency} concurrent requests)")
+    table.add_column("Endpoint")
+    table.add_column("Requests / s", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    for endpoint, (throughput, latencies) in results.items():
+        percentiles = statistics.quantiles(latencies, n=100)
+        table.add_row(endpoint, f"{throughput:,.0f}", f"{percentiles[49]:.1f}", f"{percentiles[94]:.1f}")
+    table.add_row("CLI property ls", f"{1000 / cli_ms:,.1f}", f"{cli_ms:.1f}", "")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    run()
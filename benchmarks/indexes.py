@@ -0,0 +1,134 @@
+"""
+Benchmark of the per-property expense lookups with and without the composite indexes
+
+Fills a SQLite database with a synthetic expense table, times the lookups on the schema without the indexes, then
+creates them with the migration and times the lookups again. Run with ``python -m benchmarks.indexes``, pass the
+number of rows as the first argument (one million by default).
+"""
+
+import datetime
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import Index, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from property_tracker.migrations import upgrade
+from property_tracker.models import Base
+from property_tracker.models.finance import Expense
+from property_tracker.repositories import FinanceRepository
+
+NUM_PROPERTIES = 5000
+NUM_INVESTORS = 500
+START_DATE = datetime.date(2015, 1, 1)
+
+
+def fill_expenses(engine, num_rows: int, batch_size: int = 100000):
+    """Insert the synthetic expenses, spread over the properties, investors and ten years"""
+    rng = random.Random(0)
+    with engine.begin() as connection:
+        for start in range(0, num_rows, batch_size):
+            rows = [
+                (
+                    "Synthetic expense",
+                    round(rng.uniform(10, 5000), 2),
+                    (START_DATE + datetime.timedelta(days=rng.randrange(3650))).isoformat(),
+                    rng.randrange(1, NUM_INVESTORS + 1),
+                    rng.randrange(1, NUM_PROPERTIES + 1),
+                )
+                for _ in range(start, min(start + batch_size, num_rows))
+            ]
+            connection.exec_driver_sql(
+                "INSERT INTO expenses (description, amount, date, investor_id, property_id) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+
+def drop_composite_indexes(engine):
+    """Drop the indexes added by the migration, to measure the schema as it was before"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if len(index.expressions) > 1 or index.name.endswith(("property_id", "investor_id")):
+                index.drop(engine, checkfirst=True)
+
+
+def lookups(session: Session, property_id: int):
+    """The lookups of a per-property expense timeline"""
+    finance_repository = FinanceRepository(session)
+    return {
+        "expenses of a property": lambda: finance_repository.get_all_expenses_for_property(property_id),
+        "expenses of a property in a year": lambda: finance_repository.get_all_expenses_for_property(
+            property_id, "2020-01-01", "2020-12-31"
+        ),
+        "total of a property in a year": lambda: session.execute(
+            select(func.sum(Expense.amount)).where(
+                Expense.property_id == property_id,
+                Expense.date.between(datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)),
+            )
+        ).scalar(),
+    }
+
+
+def time_lookups(engine, repeat: int):
+    """Median latency in milliseconds of every lookup over random properties"""
+    rng = random.Random(1)
+    latencies = {}
+    with Session(engine) as session:
+        for _ in range(repeat):
+            for name, lookup in lookups(session, rng.randrange(1, NUM_PROPERTIES + 1)).items():
+                start = time.perf_counter()
+                lookup()
+                latencies.setdefault(name, []).append(1000 * (time.perf_counter() - start))
+                session.expunge_all()
+    return {name: statistics.median(values) for name, values in latencies.items()}
+
+
+def query_plan(engine) -> str:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM expenses WHERE property_id = 1 ORDER BY date, id"
+        ).all()
+    return "; ".join(row[-1] for row in rows)
+
+
+def run(num_rows: int = 1000000, repeat: int = 20):
+    """Time the lookups before and after the migration and report them"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'benchmark.db'}")
+        Base.metadata.create_all(engine)
+        drop_composite_indexes(engine)
+
+        start = time.perf_counter()
+        fill_expenses(engine, num_rows)
+        console = Console()
+        console.print(f"Inserted {num_rows:,} expenses in {time.perf_counter() - start:.1f}s")
+
+        before = time_lookups(engine, repeat)
+        plan_before = query_plan(engine)
+        start = time.perf_counter()
+        created = upgrade(engine)
+        console.print(f"Created {len(created)} indexes in {time.perf_counter() - start:.1f}s")
+        after = time_lookups(engine, repeat)
+        plan_after = query_plan(engine)
+        engine.dispose()
+
+    table = Table(title=f"Expense lookups on {num_rows:,} rows (SQLite, median of {repeat})")
+    table.add_column("Lookup")
+    table.add_column("Without indexes (ms)", justify="right")
+    table.add_column("With indexes (ms)", justify="right")
+    table.add_column("Speed-up", justify="right")
+    for name in before:
+        table.add_row(name, f"{before[name]:.2f}", f"{after[name]:.2f}", f"{before[name] / after[name]:.0f}x")
+    console.print(table)
+    console.print(f"Plan without indexes: {plan_before}")
+    console.print(f"Plan with indexes: {plan_after}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,137 @@
+"""
+Benchmark of the database round trips of FinanceService.purchase_property
+
+Compares writing the purchase record by record, where every repository call commits and refreshes, with the single
+unit of work used by the service. Run with ``python -m benchmarks.purchase``.
+"""
+
+import time
+
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from property_tracker.instrumentation import count_statements
+from property_tracker.models import Base
+from property_tracker.models.finance import TransactionType, ValuationType
+from property_tracker.models.investor import Investor, InvestorType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, InvestorRepository
+from property_tracker.services import FinanceService
+from property_tracker.services.finance import LEGAL_FEES, calculate_stamp_duty
+
+PURCHASE = dict(
+    transaction_date="2024-06-01",
+    transaction_amount=250000,
+    transaction_notes="Benchmark purchase",
+    cash_payment=62500,
+    ownership_share=100,
+    annual_interest_rate=4.5,
+    principal=187500,
+    payment_term=25,
+)
+
+
+def purchase_record_by_record(session: Session, property_id: int, investor_id: int):
+    """Write a purchase the way FinanceService did before the unit of work, committing every record"""
+    finance_repository = FinanceRepository(session)
+    mortgage = finance_repository.create_mortgage_record(
+        property_id=property_id,
+        investor_id=investor_id,
+        start_date=PURCHASE["transaction_date"],
+        end_date=PURCHASE["transaction_date"],
+        annual_interest_rate=PURCHASE["annual_interest_rate"],
+        principal=PURCHASE["principal"],
+        payment_term=PURCHASE["payment_term"],
+    )
+    transaction = finance_repository.create_property_transaction(
+        property_id=property_id,
+        mortgage_id=mortgage.id,
+        transaction_type=TransactionType.PURCHASE,
+        transaction_date=PURCHASE["transaction_date"],
+        transaction_amount=PURCHASE["transaction_amount"],
+        cash_payment=PURCHASE["cash_payment"],
+        notes=PURCHASE["transaction_notes"],
+    )
+    finance_repository.create_valuation_record(
+        property_id=property_id,
+        valuation_date=PURCHASE["transaction_date"],
+        valuation_amount=PURCHASE["transaction_amount"],
+        valuation_type=ValuationType.PURCHASE,
+    )
+    finance_repository.create_ownership_record(
+        property_id=property_id,
+        investor_id=investor_id,
+        transaction_id=transaction.id,
+        ownership_start_date=PURCHASE["transaction_date"],
+        ownership_share=PURCHASE["ownership_share"],
+    )
+    finance_repository.create_expense("Legal Fees", LEGAL_FEES, PURCHASE["transaction_date"], investor_id, property_id)
+    investor = session.query(Investor).filter(Investor.id == investor_id).first()
+    stamp_duty = calculate_stamp_duty(PURCHASE["transaction_amount"], investor.investor_type)
+    finance_repository.create_expense("Stamp Duty", stamp_duty, PURCHASE["transaction_date"], investor_id, property_id)
+
+
+def purchase_in_unit_of_work(session: Session, property_id: int, investor_id: int):
+    """Write a purchase through FinanceService, in a single unit of work"""
+    FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+        property_id=property_id, investor_id=investor_id, **PURCHASE
+    )
+
+
+def setup_database(engine, num_properties: int):
+    """Create the schema, an investor and the properties to purchase"""
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Investor(
+                first_name="Ada",
+                last_name="Lovelace",
+                email="ada@example.com",
+                phone_number="0123456789",
+                address="1 Example Street",
+                investor_type=InvestorType.SOLE_TRADER,
+            )
+        )
+        session.add_all(
+            Property(address=f"{number} Benchmark Road", property_type=PropertyType.FLAT, status=Status.VACANT)
+            for number in range(num_properties)
+        )
+        session.commit()
+
+
+def run(num_purchases: int = 200):
+    """Run both purchase paths and report their round trips and latency"""
+    engine = create_engine("sqlite://")
+    setup_database(engine, 2 * num_purchases)
+
+    table = Table(title=f"purchase_property round trips ({num_purchases} purchases on SQLite)")
+    table.add_column("Path")
+    table.add_column("Statements / purchase", justify="right")
+    table.add_column("Commits / purchase", justify="right")
+    table.add_column("Round trips / purchase", justify="right")
+    table.add_column("ms / purchase", justify="right")
+
+    paths = [("record by record", purchase_record_by_record), ("unit of work", purchase_in_unit_of_work)]
+    for offset, (name, purchase) in enumerate(paths):
+        start = time.perf_counter()
+        with count_statements(repeat_threshold=None) as counter:
+            for purchase_number in range(num_purchases):
+                # a fresh session per purchase, like a CLI invocation
+                with Session(engine) as session:
+                    purchase(session, property_id=offset * num_purchases + purchase_number + 1, investor_id=1)
+        elapsed = time.perf_counter() - start
+        table.add_row(
+            name,
+            f"{counter.statements / num_purchases:.1f}",
+            f"{counter.commits / num_purchases:.1f}",
+            f"{counter.round_trips / num_purchases:.1f}",
+            f"{1000 * elapsed / num_purchases:.2f}",
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""
+Benchmark of the CLI start-up time
+
+Runs CLI invocations under ``python -X importtime`` and checks the time spent importing modules against a budget.
+Run with ``python -m benchmarks.startup``, it exits with status 1 when a budget is exceeded.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Import time budgets in milliseconds
+STARTUP_BUDGETS_MS = {
+    ("--help",): 300,
+    ("investor", "--help"): 750,
+    ("investor", "ls"): 750,
+    ("property", "ls"): 750,
+    ("simulate", "--help"): 1500,
+}
+
+
+def import_times(args: List[str]) -> Dict[str, int]:
+    """
+    Run the CLI with ``-X importtime`` against an in-memory database
+
+    :param args: the arguments of the CLI
+    :return: the cumulative import time in microseconds of every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT,
+        env={**os.environ, "PROPERTY_TRACKER_DATABASE_URL": "sqlite://"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            times[name.rstrip()] = int(cumulative)
+    return times
+
+
+def total_import_time_ms(times: Dict[str, int]) -> float:
+    """Sum the cumulative time of the top-level imports"""
+    return sum(cumulative for name, cumulative in times.items() if not name.startswith("  ")) / 1000
+
+
+def run(repeat: int = 5) -> bool:
+    """Measure every invocation and report it against its budget"""
+    table = Table(title="CLI start-up")
+    table.add_column("Command")
+    table.add_column("Import time (ms)", justify="right")
+    table.add_column("Wall time (ms)", justify="right")
+    table.add_column("Budget (ms)", justify="right")
+    table.add_column("Heavy modules")
+
+    within_budget = True
+    for args, budget in STARTUP_BUDGETS_MS.items():
+        import_ms, wall_ms = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            times = import_times(list(args))
+            wall_ms.append(1000 * (time.perf_counter() - start))
+            import_ms.append(total_import_time_ms(times))
+        heavy = sorted(name.strip() for name in times if name.strip() in ("pandas", "numpy", "sqlalchemy", "pydantic"))
+        median_import_ms = statistics.median(import_ms)
+        within_budget &= median_import_ms <= budget
+        table.add_row(
+            " ".join(args),
+            f"{median_import_ms:.0f}",
+            f"{statistics.median(wall_ms):.0f}",
+            f"[{'green' if median_import_ms <= budget else 'red'}]{budget}[/]",
+            ", ".join(heavy),
+        )
+
+    Console().print(table)
+    return within_budget
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,417 @@
+"""
+Benchmark suite of the simulation and persistence hot paths
+
+Times the mortgage schedule, the stamp duty, the simulations over several horizons, the purchase of a property and
+the listing repositories on SQLite tables of several sizes, and writes the results to a JSON file named after the
+commit, so that two commits can be compared. Run with ``python -m benchmarks.suite run``, and compare two result
+files with ``python -m benchmarks.suite compare OLD NEW``, which exits with status 1 when a benchmark regressed.
+"""
+
+import dataclasses
+import datetime
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from property_tracker.models import Base
+from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository
+from property_tracker.services import FinanceService
+from property_tracker.services.simulate_v2 import (
+    PAYMENT_SCHEDULE_CACHE,
+    SIMULATION_CACHE,
+    STAMP_DUTY_CACHE,
+    IncrementalSimulation,
+    InvestmentDetails,
+    InvestorType,
+    MortgageCalculator,
+    PropertyDetails,
+    SimulationService,
+    StampDutyCalculator,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIRECTORY = ROOT / "benchmarks" / "results"
+
+DEFAULT_ROWS = (1000, 100000, 1000000)
+DEFAULT_YEARS = (5, 10, 25, 50)
+DEFAULT_REPEAT = 10
+
+# A benchmark is reported as regressed or improved when its median changed by more than this fraction
+DEFAULT_THRESHOLD = 0.1
+
+PROPERTY_DETAILS = PropertyDetails(
+    purchase_price=250000,
+    monthly_rent=1250,
+    insurance=300,
+    service_charge=1200,
+    ground_rent=250,
+    annual_price_appreciation=3,
+    annual_rent_appreciation=2,
+)
+INVESTMENT_DETAILS = InvestmentDetails(
+    down_payment=62500,
+    interest_rate=4.5,
+    payment_term=25,
+    legal_fees=1500,
+    refurbishment_cost=5000,
+    furnishing_cost=3000,
+)
+PURCHASE = dict(
+    transaction_date=datetime.date(2024, 6, 1),
+    transaction_amount=250000,
+    transaction_notes="Benchmark purchase",
+    cash_payment=62500,
+    ownership_share=100,
+    annual_interest_rate=4.5,
+    principal=187500,
+    payment_term=25,
+)
+
+app = typer.Typer()
+console = Console()
+
+
+@app.callback()
+def callback():
+    """
+    Run the benchmark suite and compare its results between commits.
+    """
+
+
+@dataclass
+class Benchmark:
+    """A function to time, and a function run before every call and not timed"""
+
+    name: str
+    function: Callable[[], Any]
+    repeat: int
+    before_each: Optional[Callable[[], Any]] = None
+
+
+def clear_caches():
+    """Empty the memoization caches, so that the calculations are timed and not the cache lookups"""
+    PAYMENT_SCHEDULE_CACHE.clear()
+    STAMP_DUTY_CACHE.clear()
+    SIMULATION_CACHE.clear()
+
+
+def calculation_benchmarks(years: List[int], repeat: int) -> Iterator[Benchmark]:
+    """The calculations of the simulations, timed without their caches"""
+    yield Benchmark(
+        "mortgage.generate_payment_schedule[term=25]",
+        lambda: MortgageCalculator.generate_payment_schedule(187500, 25, 4.5),
+        repeat,
+        clear_caches,
+    )
+    yield Benchmark(
+        "stamp_duty.calculate_stamp_duty[scalar]",
+        lambda: StampDutyCalculator.calculate_stamp_duty(250000.0, InvestorType.SOLE_TRADER),
+        repeat,
+        clear_caches,
+    )
+    prices = np.random.default_rng(0).uniform(50000, 2000000, 100000)
+    yield Benchmark(
+        "stamp_duty.calculate_stamp_duty[array=100000]",
+        lambda: StampDutyCalculator.calculate_stamp_duty(prices, InvestorType.LIMITED_COMPANY),
+        repeat,
+    )
+    simulation_service = SimulationService()
+    for num_years in years:
+        yield Benchmark(
+            f"simulation.run_simulation[years={num_years}]",
+            lambda num_years=num_years: simulation_service.run_simulation(
+                PROPERTY_DETAILS, INVESTMENT_DETAILS, InvestorType.SOLE_TRADER, num_years
+            ),
+            repeat,
+            clear_caches,
+        )
+    yield Benchmark(
+        "simulation.run_simulation[years=25,cached]",
+        lambda: simulation_service.run_simulation(PROPERTY_DETAILS, INVESTMENT_DETAILS, InvestorType.SOLE_TRADER, 25),
+        repeat,
+    )
+    # a what-if rerun changing only the insurance, which reuses the stamp duty, the loan and the payment schedule
+    simulation = IncrementalSimulation()
+    insurances = itertools.cycle([PROPERTY_DETAILS.insurance, PROPERTY_DETAILS.insurance + 10])
+    yield Benchmark(
+        "simulation.incremental[years=25,insurance]",
+        lambda: simulation.run(
+            dataclasses.replace(PROPERTY_DETAILS, insurance=next(insurances)),
+            INVESTMENT_DETAILS,
+            InvestorType.SOLE_TRADER,
+            25,
+        ),
+        repeat,
+        clear_caches,
+    )
+
+
+def fill_tables(engine, num_rows: int, batch_size: int = 100000):
+    """Insert the synthetic investors, properties, mortgages and expenses, num_rows of each"""
+    rng = random.Random(0)
+    statements = {
+        "INSERT INTO investors (first_name, last_name, email, phone_number, address, investor_type) "
+        "VALUES (?, ?, ?, ?, ?, ?)": lambda i: (
+            "Ada",
+            f"Investor {i}",
+            f"investor{i}@example.com",
+            "0123456789",
+            f"{i} Investor Street",
+            "SOLE_TRADER",
+        ),
+        "INSERT INTO properties (address, postcode, city, no_of_bedrooms, sqm, property_type, status, monthly_rent) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)": lambda i: (
+            f"{i} Benchmark Road",
+            "AB1 2CD",
+            "London",
+            rng.randrange(1, 6),
+            round(rng.uniform(30, 200), 1),
+            "FLAT",
+            "RENTED",
+            1250.0,
+        ),
+        "INSERT INTO mortgages (start_date, end_date, principal, payment_term, annual_interest_rate, property_id, "
+        "investor_id) VALUES (?, ?, ?, ?, ?, ?, ?)": lambda i: (
+            "2020-01-01",
+            "2045-01-01",
+            round(rng.uniform(50000, 500000), 2),
+            25,
+            4.5,
+            i,
+            i,
+        ),
+        "INSERT INTO expenses (description, amount, date, investor_id, property_id) VALUES (?, ?, ?, ?, ?)": lambda i: (
+            "Synthetic expense",
+            round(rng.uniform(10, 5000), 2),
+            (datetime.date(2015, 1, 1) + datetime.timedelta(days=rng.randrange(3650))).isoformat(),
+            i,
+            i,
+        ),
+    }
+    with engine.begin() as connection:
+        for statement, row in statements.items():
+            for start in range(0, num_rows, batch_size):
+                connection.exec_driver_sql(
+                    statement, [row(i) for i in range(start + 1, min(start + batch_size, num_rows) + 1)]
+                )
+
+
+REPOSITORY_LISTINGS = (
+    "get_all_investors",
+    "get_all_properties",
+    "get_all_mortgages",
+    "get_all_expenses",
+    "get_properties_frame",
+)
+
+
+def repository_benchmarks(rows: List[int], repeat: int, match: Optional[str] = None) -> Iterator[Benchmark]:
+    """The get_all_* listings on SQLite files of every size, fewer times on the larger tables"""
+    for num_rows in rows:
+        names = [f"repository.{listing}[rows={num_rows}]" for listing in REPOSITORY_LISTINGS]
+        if match and not any(match in name for name in names):
+            # do not fill tables that no selected benchmark reads
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{Path(directory) / 'benchmark.db'}")
+            Base.metadata.create_all(engine)
+            fill_tables(engine, num_rows)
+            with Session(engine) as session:
+                repositories = [InvestorRepository(session), PropertyRepository(session), FinanceRepository(session)]
+                for name, listing in zip(names, REPOSITORY_LISTINGS):
+                    repository = next(repository for repository in repositories if hasattr(repository, listing))
+                    yield Benchmark(
+                        name,
+                        getattr(repository, listing),
+                        max(1, min(repeat, 300000 // num_rows)),
+                        session.expunge_all,
+                    )
+            engine.dispose()
+
+
+def purchase_benchmarks(repeat: int) -> Iterator[Benchmark]:
+    """FinanceService.purchase_property on an in-memory database, a new property and session for every purchase"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    fill_tables(engine, repeat + 1)
+    property_ids = iter(range(1, repeat + 2))
+
+    def purchase():
+        with Session(engine) as session:
+            FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+                property_id=next(property_ids), investor_id=1, **PURCHASE
+            )
+
+    yield Benchmark("finance.purchase_property", purchase, repeat)
+    engine.dispose()
+
+
+def time_benchmark(benchmark: Benchmark) -> Dict[str, float]:
+    """Call a benchmark once to warm up, then time it repeat times"""
+    if benchmark.before_each:
+        benchmark.before_each()
+    benchmark.function()
+
+    timings = []
+    for _ in range(benchmark.repeat):
+        if benchmark.before_each:
+            benchmark.before_each()
+        start = time.perf_counter()
+        benchmark.function()
+        timings.append(1000 * (time.perf_counter() - start))
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeat": len(timings),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """The short hash of the checked out commit, suffixed with -dirty when the tree has changes"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if changes else commit
+
+
+def run_suite(
+    rows: List[int], years: List[int], repeat: int = DEFAULT_REPEAT, match: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks
+
+    :param rows: the table sizes of the repository benchmarks
+    :param years: the horizons of the simulation benchmarks
+    :param repeat: the number of timed calls of each benchmark, fewer on the tables of more than 30k rows
+    :param match: only run the benchmarks whose name contains this text
+    :return: the results with the commit, the environment and the timings of every benchmark by name
+    """
+    groups = [
+        calculation_benchmarks(years, repeat),
+        purchase_benchmarks(repeat),
+        repository_benchmarks(rows, repeat, match),
+    ]
+    results = {}
+    for group in groups:
+        for benchmark in group:
+            if match and match not in benchmark.name:
+                continue
+            results[benchmark.name] = time_benchmark(benchmark)
+            console.print(f"{escape(benchmark.name)}: {results[benchmark.name]['median_ms']:.3f} ms")
+    return {
+        "commit": git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare the medians of two result files
+
+    :param old: the results of the baseline
+    :param new: the results to compare with the baseline
+    :param threshold: the relative change of a median above which it counts as a regression or an improvement
+    :return: a row per benchmark with its name, the old and new medians, their ratio and its status, which is one of
+        regressed, improved, unchanged, added or removed
+    """
+    comparison = []
+    for name in sorted(old["benchmarks"].keys() | new["benchmarks"].keys()):
+        old_ms = old["benchmarks"].get(name, {}).get("median_ms")
+        new_ms = new["benchmarks"].get(name, {}).get("median_ms")
+        ratio = new_ms / old_ms if old_ms and new_ms is not None else None
+        if old_ms is None:
+            status = "added"
+        elif new_ms is None:
+            status = "removed"
+        elif ratio > 1 + threshold:
+            status = "regressed"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "unchanged"
+        comparison.append({"name": name, "old_ms": old_ms, "new_ms": new_ms, "ratio": ratio, "status": status})
+    return comparison
+
+
+@app.command()
+def run(
+    rows: List[int] = typer.Option(list(DEFAULT_ROWS), help="Table sizes of the repository benchmarks."),
+    years: List[int] = typer.Option(list(DEFAULT_YEARS), help="Horizons of the simulation benchmarks."),
+    repeat: int = typer.Option(DEFAULT_REPEAT, min=1, help="Timed calls of each benchmark."),
+    match: Optional[str] = typer.Option(None, help="Only run the benchmarks whose name contains this text."),
+    output: Optional[Path] = typer.Option(None, help="Result file, benchmarks/results/<commit>.json by default."),
+):
+    """
+    Run the benchmarks and write their results to a JSON file.
+    """
+    results = run_suite(rows, years, repeat, match)
+    if output is None:
+        output = RESULTS_DIRECTORY / f"{results['commit'] or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    console.print(f"Wrote {len(results['benchmarks'])} results to {output}")
+
+
+@app.command()
+def compare(
+    old: Path = typer.Argument(..., exists=True, dir_okay=False, help="Result file of the baseline."),
+    new: Path = typer.Argument(..., exists=True, dir_okay=False, help="Result file to compare."),
+    threshold: float = typer.Option(DEFAULT_THRESHOLD, min=0, help="Relative change counted as a regression."),
+):
+    """
+    Compare two result files, exiting with status 1 when a benchmark regressed.
+    """
+    old_results, new_results = json.loads(old.read_text()), json.loads(new.read_text())
+    comparison = compare_results(old_results, new_results, threshold)
+
+    styles = {"regressed": "red", "improved": "green"}
+    table = Table(title=f"{old_results.get('commit') or old} → {new_results.get('commit') or new} (median ms)")
+    table.add_column("Benchmark", overflow="fold")
+    table.add_column("Old", justify="right")
+    table.add_column("New", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Status")
+    for row in comparison:
+        table.add_row(
+            escape(row["name"]),
+            "" if row["old_ms"] is None else f"{row['old_ms']:.3f}",
+            "" if row["new_ms"] is None else f"{row['new_ms']:.3f}",
+            "" if row["ratio"] is None else f"{row['ratio'] - 1:+.1%}",
+            row["status"],
+            style=styles.get(row["status"]),
+        )
+    console.print(table)
+
+    if any(row["status"] == "regressed" for row in comparison):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,96 @@
+import datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy.orm import Session, sessionmaker
+
+from property_tracker import database
+from property_tracker.repositories import InvestorRepository, PortfolioRepository, PropertyRepository
+from property_tracker.services import InvestorService, PortfolioService, PropertyService
+from property_tracker.services.property import PROPERTY_DETAIL_COLUMNS, detail_rows
+
+# How long query results are reused before they are read again, writes made through the app clear them right away
+QUERY_TTL_SECONDS = 60
+
+# The columns of the listings, only these are selected, the property id and address also fill the detail selectbox
+PROPERTY_LISTING_COLUMNS = (
+    "id",
+    "address",
+    "postcode",
+    "city",
+    "property_type",
+    "status",
+    "no_of_bedrooms",
+    "no_of_bathrooms",
+    "sqm",
+    "furnished",
+    "monthly_rent",
+)
+INVESTOR_LISTING_COLUMNS = ("id", "first_name", "last_name", "email", "phone_number", "investor_type", "company_name")
+
+
+@st.cache_resource
+def get_session_factory() -> sessionmaker:
+    """
+    The engine and its session factory, created once per server process and shared by every browser session
+    """
+    return database.get_session_factory()
+
+
+def new_session() -> Session:
+    """
+    A session from the shared factory, to use as a context manager for the duration of one query or write
+    """
+    return get_session_factory()()
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def load_properties() -> pd.DataFrame:
+    with new_session() as session:
+        return PropertyService(PropertyRepository(session)).get_properties_frame(list(PROPERTY_LISTING_COLUMNS))
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def load_investors() -> pd.DataFrame:
+    with new_session() as session:
+        return InvestorService(InvestorRepository(session)).get_investors_frame(list(INVESTOR_LISTING_COLUMNS))
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def load_portfolio(as_of: datetime.date) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float]]:
+    with new_session() as session:
+        portfolio_service = PortfolioService(PortfolioRepository(session))
+        property_summaries = portfolio_service.get_property_summaries(as_of)
+        investor_summaries = portfolio_service.get_investor_summaries(as_of)
+        return (
+            pd.DataFrame(property_summaries),
+            pd.DataFrame(investor_summaries),
+            portfolio_service.get_totals(property_summaries),
+        )
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def load_property_detail(property_id: int, include: Tuple[str, ...]) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    The records of a property, a frame per included relationship, None when the property does not exist
+    """
+    with new_session() as session:
+        inv_properties = PropertyService(PropertyRepository(session)).get_property_detail([property_id], include)
+        if not inv_properties:
+            return None
+        return {
+            relationship: pd.DataFrame(
+                detail_rows(inv_properties[0], relationship), columns=list(PROPERTY_DETAIL_COLUMNS[relationship])
+            )
+            for relationship in include
+        }
+
+
+def invalidate_properties():
+    """
+    Clear the cached queries that read the properties, after a property was added
+    """
+    load_properties.clear()
+    load_portfolio.clear()
+    load_property_detail.clear()
@@ -1,13 +1,8 @@
-import pandas as pd
 import streamlit as st
 
-from property_tracker.repositories import InvestorRepository
-from property_tracker.services import InvestorService
+from frontend.cache import load_investors
 
 
-def show_investors(session):
-    investor_service = InvestorService(InvestorRepository(session))
+def show_investors():
     st.write("### Investors")
-    investors = investor_service.get_all_investors()
-    investors_df = pd.DataFrame([investor.__dict__ for investor in investors])
-    st.dataframe(investors_df, hide_index=True)
+    st.dataframe(load_investors(), hide_index=True)
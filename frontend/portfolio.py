@@ -0,0 +1,21 @@
+import streamlit as st
+
+from frontend.cache import load_portfolio
+
+
+def show_portfolio():
+    st.write("### Portfolio")
+    as_of = st.date_input("As of")
+    property_summaries, investor_summaries, totals = load_portfolio(as_of)
+
+    columns = st.columns(4)
+    columns[0].metric("Purchase Cost", f"£{totals['purchase_cost']:,.0f}")
+    columns[1].metric("Latest Valuation", f"£{totals['latest_valuation']:,.0f}")
+    columns[2].metric("Outstanding Principal", f"£{totals['outstanding_principal']:,.0f}")
+    columns[3].metric("Equity", f"£{totals['equity']:,.0f}")
+
+    st.write("#### By Property")
+    st.dataframe(property_summaries, hide_index=True)
+
+    st.write("#### By Investor")
+    st.dataframe(investor_summaries, hide_index=True)
@@ -1,19 +1,20 @@
-import pandas as pd
 import streamlit as st
 
-from property_tracker.models.property import Property, PropertyType, Status
+from frontend.cache import invalidate_properties, load_properties, load_property_detail, new_session
+from property_tracker.models.property import PropertyType, Status
 from property_tracker.repositories import PropertyRepository
+from property_tracker.repositories.property import PROPERTY_DETAIL_RELATIONSHIPS
 from property_tracker.services import PropertyService
 
 
-def show_properties(session):
-    property_service = PropertyService(PropertyRepository(session))
-
+def show_properties():
     st.write("### Properties")
-    inv_properties = property_service.get_all_properties()
-    inv_properties_df = pd.DataFrame([inv_property.__dict__ for inv_property in inv_properties])
+    inv_properties_df = load_properties()
     st.dataframe(inv_properties_df, hide_index=True)
 
+    if not inv_properties_df.empty:
+        show_property_detail(inv_properties_df)
+
     st.write("### Add New Property")
     with st.form(key="property_form"):
         address = st.text_input("Address")
@@ -27,20 +28,44 @@ def show_properties(session):
         furnished = st.checkbox("Furnished")
         property_type = st.selectbox("Property Type", [property_type.value for property_type in PropertyType])
         status = st.selectbox("Status", [status.value for status in Status])
+        monthly_rent = st.number_input("Monthly Rent", min_value=0.0, step=50.0)
         submit_button = st.form_submit_button(label="Add Property")
 
         if submit_button:
-            property_service.create_property(
-                address=address,
-                postcode=postcode,
-                city=city,
-                description=description,
-                no_of_bedrooms=no_of_bedrooms,
-                no_of_bathrooms=no_of_bathrooms,
-                sqm=sqm,
-                floor=floor,
-                furnished=furnished,
-                property_type=PropertyType(property_type),
-                status=Status(status),
-            )
+            with new_session() as session:
+                PropertyService(PropertyRepository(session)).create_property(
+                    address=address,
+                    postcode=postcode,
+                    city=city,
+                    description=description,
+                    no_of_bedrooms=no_of_bedrooms,
+                    no_of_bathrooms=no_of_bathrooms,
+                    sqm=sqm,
+                    floor=floor,
+                    furnished=furnished,
+                    property_type=PropertyType(property_type),
+                    status=Status(status),
+                    monthly_rent=monthly_rent or None,
+                )
+            invalidate_properties()
             st.success("Property added successfully!")
+
+
+def show_property_detail(inv_properties_df):
+    st.write("### Property Detail")
+    addresses = dict(zip(inv_properties_df["id"], inv_properties_df["address"]))
+    property_id = st.selectbox("Property", inv_properties_df["id"], format_func=addresses.get, key="detail_property")
+    include = st.multiselect(
+        "Records",
+        PROPERTY_DETAIL_RELATIONSHIPS,
+        default=list(PROPERTY_DETAIL_RELATIONSHIPS),
+        format_func=lambda relationship: relationship.replace("_", " ").capitalize(),
+    )
+    # the records of all the selected relationships are read in one query per relationship
+    detail = load_property_detail(int(property_id), tuple(include))
+    if detail is None:
+        st.warning("Property not found.")
+        return
+    for relationship, records_df in detail.items():
+        with st.expander(f"{relationship.replace('_', ' ').capitalize()} ({len(records_df)})", expanded=True):
+            st.dataframe(records_df, hide_index=True)
@@ -1,14 +1,25 @@
+import pandas as pd
 import streamlit as st
 
 from property_tracker.services.simulate_v2 import (
+    IncrementalSimulation,
     InvestmentDetails,
     InvestorType,
-    MortgageCalculator,
     PropertyDetails,
     SimulationService,
 )
 
-simulation_service = SimulationService()
+
+def format_yearly_metrics(yearly_metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format the numeric yearly metrics of a simulation for display
+    """
+    formatted_metrics = yearly_metrics.copy()
+    formatted_metrics["Annual Cash Flow"] = formatted_metrics["Annual Cash Flow"].map("£{:,.0f}".format)
+    formatted_metrics["Rental ROI"] = formatted_metrics["Rental ROI"].map("{:.2%}".format)
+    # Show equity as £ in a human readable money format like "£100K"
+    formatted_metrics["equity"] = formatted_metrics["equity"].map(lambda equity: f"£{equity / 1000:.0f}K")
+    return formatted_metrics
 
 
 def show_simulate():
@@ -61,21 +72,25 @@ def show_simulate():
         investor_type = st.selectbox("Investor Type", [InvestorType.SOLE_TRADER, InvestorType.LIMITED_COMPANY])
         num_years = st.number_input("Number of Years", value=0)
 
-        # Add a button to run the simulation
-        run_simulation = st.button("Run Simulation")
+        if purchase_price <= 0 or payment_term <= 0 or num_years <= 0:
+            st.info("Enter a purchase price, a payment term and a number of years to run the simulation.")
+            return
 
-        if run_simulation:
-            total_cash_investment, mortgage_payment, yearly_metrics = simulation_service.run_simulation(
-                property_details=property_details,
-                investment_details=investment_details,
-                investor_type=investor_type,
-                num_years=num_years,
-            )
+        # The page reruns on every change of the inputs. Results are read from the shared simulation cache, and on a
+        # miss the simulation of the session only recomputes the results that depend on the inputs that changed
+        if "simulation_service" not in st.session_state:
+            st.session_state.simulation_service = SimulationService(simulation=IncrementalSimulation())
+        total_cash_investment, mortgage_payment, yearly_metrics = st.session_state.simulation_service.run_simulation(
+            property_details=property_details,
+            investment_details=investment_details,
+            investor_type=investor_type,
+            num_years=num_years,
+        )
 
-            # Display the simulation results
-            st.write("#### Simulation Results")
-            st.write(f"Total Cash Investment: £{total_cash_investment}")
-            st.write(f"Mortgage Payment: £{mortgage_payment}")
-            st.write("Yearly Metrics")
-            yearly_metrics_df = yearly_metrics.reset_index()
-            st.dataframe(yearly_metrics_df, hide_index=True)
+        # Display the simulation results
+        st.write("#### Simulation Results")
+        st.write(f"Total Cash Investment: £{total_cash_investment}")
+        st.write(f"Mortgage Payment: £{mortgage_payment}")
+        st.write("Yearly Metrics")
+        yearly_metrics_df = format_yearly_metrics(yearly_metrics).reset_index()
+        st.dataframe(yearly_metrics_df, hide_index=True)
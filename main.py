@@ -1,22 +1,88 @@
+import importlib
+from pathlib import Path
+
+import click
 import typer
 from rich.console import Console
+from typer.core import TyperGroup
 
-from property_tracker.commands import finance, investor, property, simulate
+from property_tracker.profiling import DEFAULT_PROFILE_OUTPUT, DEFAULT_TOP, profile as profile_command
 
-app = typer.Typer()
-console = Console()
+# Sub-commands are imported only when invoked, so that --help and each command load only what they use
+SUB_COMMANDS = {
+    "investor": ("property_tracker.commands.investor", "Manage investors."),
+    "property": ("property_tracker.commands.property", "Manage properties and purchases."),
+    "finance": ("property_tracker.commands.finance", "List mortgages and expenses."),
+    "simulate": ("property_tracker.commands.simulate", "Simulate property investments."),
+    "portfolio": ("property_tracker.commands.portfolio", "Summarise the portfolio."),
+    "rent": ("property_tracker.commands.rent", "Generate and record the rent of many properties."),
+    "ledger": ("property_tracker.commands.ledger", "Show and rebuild the monthly cash flow ledger."),
+    "api": ("property_tracker.commands.api", "Serve the HTTP API."),
+    "db": ("property_tracker.commands.db", "Manage the database."),
+    "import": ("property_tracker.commands.importer", "Bulk import records from CSV or JSON Lines files."),
+}
+
+
+class LazySubCommand(TyperGroup):
+    """
+    A sub-command whose Typer app is imported when it is invoked
+    """
+
+    def __init__(self, name: str, import_path: str, help_text: str):
+        super().__init__(name=name, help=help_text)
+        self.import_path = import_path
+
+    def load(self) -> click.Command:
+        command = typer.main.get_command(importlib.import_module(self.import_path).app)
+        # the help registered in SUB_COMMANDS, as add_typer(..., help=...) would set it
+        command.help = self.help
+        return command
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+    def list_commands(self, ctx):
+        return self.load().list_commands(ctx)
 
-app.add_typer(investor.app, name="investor")
-app.add_typer(property.app, name="property")
-app.add_typer(finance.app, name="finance")
-app.add_typer(simulate.app, name="simulate")
+    def get_command(self, ctx, cmd_name):
+        return self.load().get_command(ctx, cmd_name)
+
+
+class LazyGroup(TyperGroup):
+    """
+    The top-level group, registering the sub-commands without importing them
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, (import_path, help_text) in SUB_COMMANDS.items():
+            self.add_command(LazySubCommand(name, import_path, help_text))
+
+
+app = typer.Typer(cls=LazyGroup)
+console = Console()
 
 
 @app.callback()
-def callback():
+def callback(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Profile the command and print its hottest functions."),
+    profile_output: Path = typer.Option(
+        DEFAULT_PROFILE_OUTPUT, help="File the profile is written to, in the pstats format."
+    ),
+    profile_top: int = typer.Option(DEFAULT_TOP, min=1, help="Number of functions in the profile summary."),
+    sql_stats: bool = typer.Option(False, "--sql-stats", help="Count the SQL statements and report repeated ones."),
+):
     """
     This applications helps you to create tasks and manage them.
     """
+    if profile:
+        ctx.with_resource(profile_command(profile_output, profile_top))
+    if sql_stats:
+        # imported here so that --help does not import SQLAlchemy
+        from property_tracker.instrumentation import report_statements
+
+        ctx.with_resource(report_statements())
 
 
 if __name__ == "__main__":
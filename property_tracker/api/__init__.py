@@ -0,0 +1,4 @@
+from property_tracker.api.app import create_app
+
+# The application served by ``uvicorn property_tracker.api:app``, configured from the environment on startup
+app = create_app()
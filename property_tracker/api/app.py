@@ -0,0 +1,266 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from property_tracker.api.schemas import (
+    ExpenseIn,
+    ExpenseOut,
+    InvestorIn,
+    InvestorOut,
+    InvestorSummaryOut,
+    MortgageOut,
+    OwnershipOut,
+    PropertyIn,
+    PropertyOut,
+    PropertySummaryOut,
+    PurchaseIn,
+    RentPaymentIn,
+    RentPaymentOut,
+    SimulationIn,
+    SimulationOut,
+)
+from property_tracker.database import DatabaseSettings, build_async_engine
+from property_tracker.instrumentation import count_statements
+from property_tracker.models import Base
+from property_tracker.repositories import (
+    FinanceRepository,
+    InvestorRepository,
+    PortfolioRepository,
+    PropertyRepository,
+)
+from property_tracker.services import FinanceService, InvestorService, PortfolioService, PropertyService
+from property_tracker.services.simulate_v2 import SimulationService
+
+# The simulation service of the process, each executor worker process keeps its own cache of simulations
+simulation_service = SimulationService()
+
+
+def run_simulation(simulation: SimulationIn) -> SimulationOut:
+    """
+    Run a simulation and convert its results, in an executor worker
+    """
+    total_cash_investment, mortgage_payment, yearly_metrics = simulation_service.run_simulation(
+        simulation.property_details, simulation.investment_details, simulation.investor_type, simulation.num_years
+    )
+    return SimulationOut(
+        total_cash_investment=total_cash_investment,
+        mortgage_payment=mortgage_payment,
+        yearly_metrics=yearly_metrics.to_dict(orient="records"),
+    )
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    async with request.app.state.session_factory() as db:
+        yield db
+
+
+async def run_sync(db: AsyncSession, schema, function: Callable[[Session], object]):
+    """
+    Call the synchronous repositories and services with the session of an AsyncSession
+
+    The results are converted to the schema inside the call, so that attributes expired by a commit are loaded
+    before leaving the synchronous context.
+
+    :param db: the AsyncSession of the request
+    :param schema: the pydantic model of the results
+    :param function: a function of a Session, returning a model instance, a list of them or None
+    :return: the converted results
+    """
+
+    def call(session: Session):
+        result = function(session)
+        if result is None:
+            return None
+        if isinstance(result, list):
+            return [schema.model_validate(item) for item in result]
+        return schema.model_validate(result)
+
+    return await db.run_sync(call)
+
+
+def create_app(settings: Optional[DatabaseSettings] = None, executor: Optional[Executor] = None) -> FastAPI:
+    """
+    Create the HTTP API
+
+    Requests share an asyncio engine and its connection pool, and the synchronous repositories run on the
+    connections of the engine through AsyncSession.run_sync. Simulations are CPU bound, they run in a process
+    pool so they do not block the event loop. Every response reports the statements, round trips and database time
+    of its request in the X-DB-Statements, X-DB-Round-Trips and X-DB-Time-Ms headers.
+
+    :param settings: the connection settings, read from the environment when not given
+    :param executor: the executor of the simulations, a process pool with a worker per CPU when not given
+    :return: the FastAPI application
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        engine = build_async_engine(settings or DatabaseSettings.from_env())
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        app.state.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        app.state.executor = executor or ProcessPoolExecutor()
+        yield
+        if executor is None:
+            app.state.executor.shutdown()
+        await engine.dispose()
+
+    app = FastAPI(title="Property Investment Tracker", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def statement_stats(request: Request, call_next):
+        # the statements of the request are counted in its context, apart from the concurrent requests
+        with count_statements() as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Statements"] = str(stats.statements)
+        response.headers["X-DB-Round-Trips"] = str(stats.round_trips)
+        response.headers["X-DB-Time-Ms"] = f"{stats.db_time * 1000:.2f}"
+        return response
+
+    @app.exception_handler(ValueError)
+    async def value_error(request: Request, error: ValueError):
+        return JSONResponse(status_code=400, content={"detail": str(error)})
+
+    @app.get("/properties", response_model=List[PropertyOut])
+    async def list_properties(
+        limit: Optional[int] = Query(None, ge=0),
+        offset: Optional[int] = Query(None, ge=0),
+        after_id: Optional[int] = None,
+        db: AsyncSession = Depends(get_db),
+    ):
+        return await run_sync(
+            db,
+            PropertyOut,
+            lambda session: PropertyService(PropertyRepository(session)).get_all_properties(limit, offset, after_id),
+        )
+
+    @app.get("/properties/{property_id}", response_model=PropertyOut)
+    async def get_property(property_id: int, db: AsyncSession = Depends(get_db)):
+        inv_property = await run_sync(
+            db, PropertyOut, lambda session: PropertyService(PropertyRepository(session)).get_property(property_id)
+        )
+        if inv_property is None:
+            raise HTTPException(status_code=404, detail="Property not found")
+        return inv_property
+
+    @app.post("/properties", response_model=PropertyOut, status_code=201)
+    async def create_property(inv_property: PropertyIn, db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            PropertyOut,
+            lambda session: PropertyService(PropertyRepository(session)).create_property(**inv_property.model_dump()),
+        )
+
+    @app.get("/investors", response_model=List[InvestorOut])
+    async def list_investors(
+        limit: Optional[int] = Query(None, ge=0),
+        offset: Optional[int] = Query(None, ge=0),
+        after_id: Optional[int] = None,
+        db: AsyncSession = Depends(get_db),
+    ):
+        return await run_sync(
+            db,
+            InvestorOut,
+            lambda session: InvestorService(InvestorRepository(session)).get_all_investors(limit, offset, after_id),
+        )
+
+    @app.get("/investors/{investor_id}", response_model=InvestorOut)
+    async def get_investor(investor_id: int, db: AsyncSession = Depends(get_db)):
+        investor = await run_sync(
+            db, InvestorOut, lambda session: InvestorService(InvestorRepository(session)).get_investor(investor_id)
+        )
+        if investor is None:
+            raise HTTPException(status_code=404, detail="Investor not found")
+        return investor
+
+    @app.post("/investors", response_model=InvestorOut, status_code=201)
+    async def create_investor(investor: InvestorIn, db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            InvestorOut,
+            lambda session: InvestorService(InvestorRepository(session)).create_investor(**investor.model_dump()),
+        )
+
+    @app.get("/mortgages", response_model=List[MortgageOut])
+    async def list_mortgages(
+        limit: Optional[int] = Query(None, ge=0),
+        offset: Optional[int] = Query(None, ge=0),
+        after_id: Optional[int] = None,
+        db: AsyncSession = Depends(get_db),
+    ):
+        return await run_sync(
+            db, MortgageOut, lambda session: FinanceRepository(session).get_all_mortgages(limit, offset, after_id)
+        )
+
+    @app.get("/expenses", response_model=List[ExpenseOut])
+    async def list_expenses(
+        property_id: Optional[int] = None,
+        limit: Optional[int] = Query(None, ge=0),
+        offset: Optional[int] = Query(None, ge=0),
+        after_id: Optional[int] = None,
+        db: AsyncSession = Depends(get_db),
+    ):
+        def expenses(session: Session):
+            if property_id is not None:
+                return FinanceRepository(session).get_all_expenses_for_property(property_id)
+            return FinanceRepository(session).get_all_expenses(limit, offset, after_id)
+
+        return await run_sync(db, ExpenseOut, expenses)
+
+    @app.post("/expenses", response_model=ExpenseOut, status_code=201)
+    async def create_expense(expense: ExpenseIn, db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            ExpenseOut,
+            lambda session: FinanceService(FinanceRepository(session), InvestorRepository(session)).generate_expense(
+                **expense.model_dump()
+            ),
+        )
+
+    @app.post("/rent", response_model=RentPaymentOut, status_code=201)
+    async def collect_rent(rent_payment: RentPaymentIn, db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            RentPaymentOut,
+            lambda session: FinanceService(FinanceRepository(session), InvestorRepository(session)).collect_rent(
+                **rent_payment.model_dump()
+            ),
+        )
+
+    @app.post("/purchases", response_model=OwnershipOut, status_code=201)
+    async def purchase_property(purchase: PurchaseIn, db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            OwnershipOut,
+            lambda session: FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+                **purchase.model_dump()
+            ),
+        )
+
+    @app.get("/portfolio/properties", response_model=List[PropertySummaryOut])
+    async def property_summaries(db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            PropertySummaryOut,
+            lambda session: PortfolioService(PortfolioRepository(session)).get_property_summaries(),
+        )
+
+    @app.get("/portfolio/investors", response_model=List[InvestorSummaryOut])
+    async def investor_summaries(db: AsyncSession = Depends(get_db)):
+        return await run_sync(
+            db,
+            InvestorSummaryOut,
+            lambda session: PortfolioService(PortfolioRepository(session)).get_investor_summaries(),
+        )
+
+    @app.post("/simulations", response_model=SimulationOut)
+    async def simulate(simulation: SimulationIn, request: Request):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(request.app.state.executor, run_simulation, simulation)
+
+    return app
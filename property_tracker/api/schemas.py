@@ -0,0 +1,166 @@
+import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from property_tracker.models.investor import InvestorType
+from property_tracker.models.property import PropertyType, Status
+from property_tracker.services.simulate_v2 import InvestmentDetails, PropertyDetails
+from property_tracker.services.simulate_v2 import InvestorType as SimulationInvestorType
+
+
+class Record(BaseModel):
+    """
+    Base class of the records returned by the API, read from the attributes of the models
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PropertyIn(BaseModel):
+    address: str
+    postcode: str
+    city: str
+    description: Optional[str] = None
+    no_of_bedrooms: int
+    no_of_bathrooms: int
+    sqm: float
+    floor: int
+    furnished: bool
+    property_type: PropertyType
+    status: Status
+    monthly_rent: Optional[float] = None
+
+
+class PropertyOut(Record):
+    id: int
+    address: Optional[str]
+    postcode: Optional[str]
+    city: Optional[str]
+    description: Optional[str]
+    no_of_bedrooms: Optional[int]
+    no_of_bathrooms: Optional[int]
+    sqm: Optional[float]
+    floor: Optional[int]
+    furnished: Optional[bool]
+    property_type: Optional[PropertyType]
+    status: Optional[Status]
+    monthly_rent: Optional[float]
+
+
+class InvestorIn(BaseModel):
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+    address: str
+    investor_type: InvestorType
+    company_name: Optional[str] = None
+
+
+class InvestorOut(Record, InvestorIn):
+    id: int
+
+
+class MortgageOut(Record):
+    id: int
+    start_date: Optional[datetime.date]
+    end_date: Optional[datetime.date]
+    principal: Optional[float]
+    payment_term: Optional[int]
+    annual_interest_rate: Optional[float]
+    property_id: Optional[int]
+    investor_id: Optional[int]
+
+
+class ExpenseIn(BaseModel):
+    description: str
+    amount: float
+    date: datetime.date
+    investor_id: int
+    property_id: int
+
+
+class ExpenseOut(Record):
+    id: int
+    description: Optional[str]
+    amount: Optional[float]
+    date: Optional[datetime.date]
+    investor_id: Optional[int]
+    property_id: Optional[int]
+
+
+class RentPaymentIn(BaseModel):
+    property_id: int
+    investor_id: int
+    amount: float
+    date: datetime.date
+    period: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}$")
+
+
+class RentPaymentOut(Record):
+    id: int
+    property_id: Optional[int]
+    investor_id: Optional[int]
+    amount: Optional[float]
+    date: Optional[datetime.date]
+    period: Optional[datetime.date] = None
+    expected_amount: Optional[float] = None
+
+
+class PurchaseIn(BaseModel):
+    property_id: int
+    investor_id: int
+    transaction_date: datetime.date
+    transaction_amount: float
+    transaction_notes: str = ""
+    cash_payment: float
+    ownership_share: float = 100
+    annual_interest_rate: float
+    principal: float
+    payment_term: int
+
+
+class OwnershipOut(Record):
+    id: int
+    property_id: int
+    investor_id: int
+    ownership_start_date: datetime.date
+    ownership_share: float
+    transaction_id: Optional[int]
+
+
+class PropertySummaryOut(Record):
+    property_id: int
+    address: Optional[str]
+    purchase_cost: float
+    latest_valuation: float
+    outstanding_principal: float
+    expenses: float
+    rent_collected: float
+    equity: float
+
+
+class InvestorSummaryOut(Record):
+    investor_id: int
+    name: str
+    properties: int
+    purchase_cost: float
+    latest_valuation: float
+    outstanding_principal: float
+    expenses: float
+    rent_collected: float
+    equity: float
+
+
+class SimulationIn(BaseModel):
+    property_details: PropertyDetails
+    investment_details: InvestmentDetails
+    investor_type: SimulationInvestorType
+    num_years: int = Field(10, ge=1, le=100)
+
+
+class SimulationOut(BaseModel):
+    total_cash_investment: float
+    mortgage_payment: float
+    yearly_metrics: List[Dict[str, float]]
@@ -0,0 +1,20 @@
+import typer
+
+app = typer.Typer(add_completion=False)
+
+
+@app.callback()
+def callback():
+    """
+    Serve the HTTP API.
+    """
+
+
+@app.command()
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 1):
+    """
+    Serve the HTTP API with uvicorn, connecting to the database of the environment settings.
+    """
+    import uvicorn
+
+    uvicorn.run("property_tracker.api:app", host=host, port=port, workers=workers)
@@ -0,0 +1,26 @@
+import typer
+from rich.console import Console
+
+from property_tracker.database import get_engine
+from property_tracker.migrations import upgrade
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+@app.callback()
+def callback():
+    """
+    Manage the database.
+    """
+
+
+@app.command()
+def migrate():
+    """
+    Create the missing tables, columns and indexes of an existing database.
+    """
+    created = upgrade(get_engine())
+    for name in created:
+        console.print(f"Created {name}")
+    console.print(f"Database is up to date, {len(created)} columns and indexes created.")
@@ -1,23 +1,58 @@
+from typing import List, Optional
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from property_tracker.database import session
-from property_tracker.repositories import FinanceRepository
+from property_tracker import services
+from property_tracker.commands.listing import AFTER_ID, LIMIT, OFFSET, STREAM, write_csv
+from property_tracker.database import get_session
+from property_tracker.models.finance import Expense, Mortgage
+from property_tracker.repositories import FinanceRepository, InvestorRepository
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 console = Console()
 
 
+def mortgage_row(mortgage: Mortgage) -> List[str]:
+    return [
+        str(mortgage.id),
+        str(mortgage.property_id),
+        str(mortgage.investor_id),
+        str(mortgage.start_date),
+        str(mortgage.end_date),
+        str(mortgage.principal),
+        str(mortgage.payment_term),
+        str(mortgage.annual_interest_rate),
+    ]
+
+
+def expense_row(expense: Expense) -> List[str]:
+    return [
+        str(expense.id),
+        expense.description,
+        str(expense.amount),
+        str(expense.date),
+        str(expense.investor_id),
+        str(expense.property_id),
+    ]
+
+
 @app.command()
-def ls(entity: str):
+def ls(
+    entity: str,
+    limit: Optional[int] = LIMIT,
+    offset: Optional[int] = OFFSET,
+    after_id: Optional[int] = AFTER_ID,
+    stream: bool = STREAM,
+):
     """
-    List all instances of an entity.
+    List all instances of an entity, or a page of them.
     """
+    session = get_session()
 
     if entity == "mortgages":
         finance_repository = FinanceRepository(session)
-        mortgages = finance_repository.get_all_mortgages()
         table = Table(title="Mortgages")
         table.add_column("ID")
         table.add_column("Property ID")
@@ -28,22 +63,15 @@ def ls(entity: str):
         table.add_column("Payment Term")
         table.add_column("Annual Interest Rate")
 
-        for mortgage in mortgages:
-            table.add_row(
-                str(mortgage.id),
-                str(mortgage.property_id),
-                str(mortgage.investor_id),
-                str(mortgage.start_date),
-                str(mortgage.end_date),
-                str(mortgage.principal),
-                str(mortgage.payment_term),
-                str(mortgage.annual_interest_rate),
-            )
-        console.print(table)
+        if stream:
+            write_csv(table, map(mortgage_row, finance_repository.iter_mortgages(limit, offset, after_id)))
+        else:
+            for mortgage in finance_repository.get_all_mortgages(limit, offset, after_id):
+                table.add_row(*mortgage_row(mortgage))
+            console.print(table)
 
     if entity == "expenses":
         finance_repository = FinanceRepository(session)
-        expenses = finance_repository.get_all_expenses()
         table = Table(title="Expenses")
         table.add_column("ID")
         table.add_column("Description")
@@ -51,13 +79,34 @@ def ls(entity: str):
         table.add_column("Date")
         table.add_column("Investor ID")
         table.add_column("Property ID")
-        for expense in expenses:
-            table.add_row(
-                str(expense.id),
-                expense.description,
-                str(expense.amount),
-                str(expense.date),
-                str(expense.investor_id),
-                str(expense.property_id),
-            )
-        console.print(table)
+
+        if stream:
+            write_csv(table, map(expense_row, finance_repository.iter_expenses(limit, offset, after_id)))
+        else:
+            for expense in finance_repository.get_all_expenses(limit, offset, after_id):
+                table.add_row(*expense_row(expense))
+            console.print(table)
+
+    session.close()
+
+
+@app.command()
+def rent(
+    property_id: int,
+    investor_id: int,
+    amount: float,
+    date: str,
+    period: Optional[str] = typer.Option(
+        None, help="Month the rent is for, YYYY-MM, the month of the date by default."
+    ),
+):
+    """
+    Record a rent payment received for a property, added to the rent of its month.
+    """
+    session = get_session()
+    finance_service = services.FinanceService(FinanceRepository(session), InvestorRepository(session))
+    finance_service.collect_rent(
+        property_id=property_id, investor_id=investor_id, amount=amount, date=date, period=period
+    )
+    session.close()
+    console.print(f"Rent of {amount:,.2f} recorded for property {property_id}.")
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from property_tracker.database import get_session
+from property_tracker.repositories import ImportRepository
+from property_tracker.services import ImportService
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+def import_file(entity: str, path: Path, rejects: Path, chunk_size: int):
+    """Import a file and report the throughput and rejected rows"""
+    session = get_session()
+    import_service = ImportService(ImportRepository(session))
+    result = import_service.import_file(entity, path, rejects_path=rejects, chunk_size=chunk_size)
+    session.close()
+
+    console.print(
+        f"Imported {result.rows_imported} of {result.rows_read} {entity} "
+        f"in {result.elapsed_seconds:.2f}s ({result.rows_per_second:,.0f} rows/sec)."
+    )
+    if result.rows_rejected:
+        console.print(
+            f"[bold red]{result.rows_rejected} rows rejected[/bold red], "
+            f"see {rejects or path.with_suffix('.rejects.jsonl')}"
+        )
+
+
+@app.command()
+def properties(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    rejects: Path = typer.Option(None, help="File for the rejected rows, next to the input file by default"),
+    chunk_size: int = 1000,
+):
+    """
+    Import properties from a CSV or JSON Lines file.
+    """
+    import_file("properties", path, rejects, chunk_size)
+
+
+@app.command()
+def investors(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    rejects: Path = typer.Option(None, help="File for the rejected rows, next to the input file by default"),
+    chunk_size: int = 1000,
+):
+    """
+    Import investors from a CSV or JSON Lines file.
+    """
+    import_file("investors", path, rejects, chunk_size)
+
+
+@app.command()
+def expenses(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    rejects: Path = typer.Option(None, help="File for the rejected rows, next to the input file by default"),
+    chunk_size: int = 1000,
+):
+    """
+    Import expenses from a CSV or JSON Lines file.
+    """
+    import_file("expenses", path, rejects, chunk_size)
+
+
+@app.command()
+def valuations(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    rejects: Path = typer.Option(None, help="File for the rejected rows, next to the input file by default"),
+    chunk_size: int = 1000,
+):
+    """
+    Import valuations from a CSV or JSON Lines file.
+    """
+    import_file("valuations", path, rejects, chunk_size)
@@ -1,12 +1,16 @@
+from typing import List, Optional
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from property_tracker.database import session
+from property_tracker.commands.listing import AFTER_ID, LIMIT, OFFSET, STREAM, write_csv
+from property_tracker.database import get_session
+from property_tracker.models.investor import Investor
 from property_tracker.repositories import InvestorRepository
 from property_tracker.services import InvestorService
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 console = Console()
 
 
@@ -26,6 +30,7 @@ def add(
         investor_type (str): Type of the investor
         company_name (str): Name of the company
     """
+    session = get_session()
     investor_repository = InvestorRepository(session)
     investor_service = InvestorService(investor_repository)
     investor = investor_service.create_investor(
@@ -35,16 +40,29 @@ def add(
     typer.echo(f"Investor {investor.first_name} {investor.last_name} added successfully")
 
 
+def investor_row(investor: Investor) -> List[str]:
+    return [
+        str(investor.id),
+        investor.first_name,
+        investor.last_name,
+        investor.email,
+        investor.phone_number,
+        investor.address,
+        investor.investor_type.value,
+        investor.company_name,
+    ]
+
+
 @app.command()
-def ls():
+def ls(
+    limit: Optional[int] = LIMIT,
+    offset: Optional[int] = OFFSET,
+    after_id: Optional[int] = AFTER_ID,
+    stream: bool = STREAM,
+):
     """
-    List all investors
+    List all investors, or a page of them
     """
-    investor_repository = InvestorRepository(session)
-    investor_service = InvestorService(investor_repository)
-    investors = investor_service.get_all_investors()
-    session.close()
-
     table = Table(title="Investors")
 
     table.add_column("ID", justify="right", style="cyan", no_wrap=True)
@@ -56,17 +74,19 @@ def ls():
     table.add_column("Investor Type", style="cyan")
     table.add_column("Company Name", style="magenta")
 
+    session = get_session()
+    investor_repository = InvestorRepository(session)
+    investor_service = InvestorService(investor_repository)
+    if stream:
+        investors = investor_service.iter_investors(limit, offset, after_id)
+        write_csv(table, map(investor_row, investors))
+        session.close()
+        return
+
+    investors = investor_service.get_all_investors(limit, offset, after_id)
+    session.close()
     for investor in investors:
-        table.add_row(
-            str(investor.id),
-            investor.first_name,
-            investor.last_name,
-            investor.email,
-            investor.phone_number,
-            investor.address,
-            investor.investor_type.value,
-            investor.company_name,
-        )
+        table.add_row(*investor_row(investor))
 
     console.print(table)
 
@@ -79,6 +99,7 @@ def rm(investor_id: int):
     Args:
         investor_id (int): ID of the investor
     """
+    session = get_session()
     investor_repository = InvestorRepository(session)
     investor_service = InvestorService(investor_repository)
     investor_service.delete_investor(investor_id)
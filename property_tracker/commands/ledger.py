@@ -0,0 +1,58 @@
+import datetime
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from property_tracker.database import get_session
+from property_tracker.repositories import LedgerRepository
+from property_tracker.services import LedgerService
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+@app.command()
+def rebuild(property_id: Optional[int] = typer.Option(None, help="Rebuild the ledger of this property only.")):
+    """
+    Rebuild the monthly ledger from the expenses, rent payments, purchases and mortgages.
+    """
+    session = get_session()
+    ledger_service = LedgerService(LedgerRepository(session))
+    rows = ledger_service.rebuild(property_id)
+    session.close()
+    console.print(f"Ledger rebuilt, {rows} monthly rows.")
+
+
+@app.command()
+def show(
+    property_id: int,
+    as_of: Optional[datetime.datetime] = typer.Option(
+        None, formats=["%Y-%m-%d"], help="Show the ledger up to the month of this date, today by default."
+    ),
+):
+    """
+    Show the monthly ledger of a property, without the scheduled mortgage payments of later months.
+    """
+    session = get_session()
+    ledger_service = LedgerService(LedgerRepository(session))
+    table = Table(title=f"Monthly Ledger of Property {property_id}")
+    table.add_column("Month")
+    table.add_column("Rent Collected", justify="right")
+    table.add_column("Expenses", justify="right")
+    table.add_column("Mortgage Payments", justify="right")
+    table.add_column("Net Cash Flow", justify="right")
+    table.add_column("Capital Invested", justify="right")
+
+    for row in ledger_service.get_ledger(property_id, as_of=as_of.date() if as_of else None):
+        table.add_row(
+            row.month.strftime("%Y-%m"),
+            f"{row.rent_collected:,.2f}",
+            f"{row.expenses:,.2f}",
+            f"{row.mortgage_payments:,.2f}",
+            f"{row.net_cash_flow:,.2f}",
+            f"{row.capital_invested:,.2f}",
+        )
+    session.close()
+    console.print(table)
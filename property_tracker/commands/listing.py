@@ -0,0 +1,28 @@
+import csv
+import sys
+from typing import Iterable, List
+
+import typer
+from rich.table import Table
+
+# Options shared by the ls commands
+LIMIT = typer.Option(None, min=0, help="Maximum number of rows to list.")
+OFFSET = typer.Option(None, min=0, help="Number of rows to skip.")
+AFTER_ID = typer.Option(None, help="Only list the rows with a greater ID, faster than --offset on large tables.")
+STREAM = typer.Option(False, "--stream", help="Write the rows as CSV while they are fetched, in constant memory.")
+
+
+def write_csv(table: Table, rows: Iterable[List[str]]):
+    """
+    Write rows to the standard output as CSV, under the column headers of a table
+
+    The rows are written one by one as the iterable produces them, so streamed query results are never held in
+    memory together.
+
+    :param table: the table whose column headers are written as the header row
+    :param rows: the cells of each row
+    """
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow([str(column.header) for column in table.columns])
+    for row in rows:
+        writer.writerow(row)
@@ -0,0 +1,74 @@
+import datetime
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from property_tracker.database import get_session
+from property_tracker.repositories import PortfolioRepository, ValuationRepository
+from property_tracker.services import PortfolioService, ValuationService
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+SUMMARY_COLUMNS = {
+    "purchase_cost": "Purchase Cost",
+    "latest_valuation": "Latest Valuation",
+    "outstanding_principal": "Outstanding Principal",
+    "expenses": "Expenses",
+    "rent_collected": "Rent Collected",
+    "equity": "Equity",
+}
+
+
+@app.callback()
+def callback():
+    """
+    Summarise the portfolio.
+    """
+
+
+@app.command()
+def summary(
+    by: str = typer.Option("property", help="Summarise by 'property' or 'investor'."),
+    as_of: Optional[datetime.datetime] = typer.Option(None, formats=["%Y-%m-%d"], help="Date of the totals."),
+):
+    """
+    Show the totals of the portfolio per property or per investor.
+    """
+    if by not in ("property", "investor"):
+        raise typer.BadParameter("must be 'property' or 'investor'", param_hint="--by")
+
+    session = get_session()
+    portfolio_service = PortfolioService(PortfolioRepository(session), ValuationService(ValuationRepository(session)))
+    as_of = as_of.date() if as_of else None
+    property_summaries = portfolio_service.get_property_summaries(as_of)
+    totals = portfolio_service.get_totals(property_summaries)
+    if by == "property":
+        summaries = property_summaries
+        table = Table(title="Portfolio by Property")
+        table.add_column("ID", justify="right", style="cyan")
+        table.add_column("Address")
+    else:
+        summaries = portfolio_service.get_investor_summaries(as_of)
+        table = Table(title="Portfolio by Investor")
+        table.add_column("ID", justify="right", style="cyan")
+        table.add_column("Investor")
+        table.add_column("Properties", justify="right")
+    session.close()
+
+    for title in SUMMARY_COLUMNS.values():
+        table.add_column(title, justify="right")
+
+    for summary in summaries:
+        if by == "property":
+            labels = [str(summary.property_id), summary.address]
+        else:
+            labels = [str(summary.investor_id), summary.name, str(summary.properties)]
+        table.add_row(*labels, *(f"{getattr(summary, column):,.2f}" for column in SUMMARY_COLUMNS))
+
+    if by == "property":
+        table.add_section()
+        table.add_row("", "Total", *(f"{totals[column]:,.2f}" for column in SUMMARY_COLUMNS), style="bold")
+    console.print(table)
@@ -1,13 +1,18 @@
+from typing import List, Optional
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from property_tracker.database import session
-from property_tracker.models.property import PropertyType, Status
-from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository
-from property_tracker.services import FinanceService, PropertyService
+from property_tracker import services
+from property_tracker.commands.listing import AFTER_ID, LIMIT, OFFSET, STREAM, write_csv
+from property_tracker.database import get_session
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository, ValuationRepository
+from property_tracker.repositories.property import PROPERTY_DETAIL_RELATIONSHIPS
+from property_tracker.services.property import PROPERTY_DETAIL_COLUMNS, detail_rows
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 console = Console()
 
 
@@ -24,12 +29,14 @@ def add(
     furnished: bool,
     property_type: PropertyType,
     status: Status,
+    monthly_rent: Optional[float] = typer.Option(None, help="Rent of the property per month."),
 ):
     """
     Add a new property.
     """
+    session = get_session()
 
-    property_service = PropertyService(PropertyRepository(session))
+    property_service = services.PropertyService(PropertyRepository(session))
     property = property_service.create_property(
         address,
         postcode,
@@ -42,18 +49,37 @@ def add(
         furnished,
         property_type,
         status,
+        monthly_rent,
     )
     session.close()
     console.print(f"Property {property.address} added successfully.")
 
 
+def property_row(inv_property: Property) -> List[str]:
+    return [
+        str(inv_property.id),
+        inv_property.address,
+        inv_property.city,
+        inv_property.property_type.value,
+        inv_property.status.value,
+        str(inv_property.no_of_bedrooms),
+        str(inv_property.no_of_bathrooms),
+        str(inv_property.sqm),
+        str(inv_property.floor),
+        str(inv_property.furnished),
+    ]
+
+
 @app.command()
-def ls():
+def ls(
+    limit: Optional[int] = LIMIT,
+    offset: Optional[int] = OFFSET,
+    after_id: Optional[int] = AFTER_ID,
+    stream: bool = STREAM,
+):
     """
-    List all properties.
+    List all properties, or a page of them.
     """
-    property_service = PropertyService(PropertyRepository(session))
-    inv_properties = property_service.get_all_properties()
     table = Table(title="Properties")
     table.add_column("ID", style="cyan")
     table.add_column("Address")
@@ -66,20 +92,70 @@ def ls():
     table.add_column("Floor")
     table.add_column("Furnished")
 
+    session = get_session()
+    property_service = services.PropertyService(PropertyRepository(session))
+    if stream:
+        write_csv(table, map(property_row, property_service.iter_properties(limit, offset, after_id)))
+        session.close()
+        return
+
+    for inv_property in property_service.get_all_properties(limit, offset, after_id):
+        table.add_row(*property_row(inv_property))
+    console.print(table)
+    session.close()
+
+
+def detail_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+@app.command()
+def show(
+    property_ids: List[int] = typer.Argument(..., help="Ids of the properties."),
+    include: Optional[List[str]] = typer.Option(
+        None, help=f"Records to show, all by default: {', '.join(PROPERTY_DETAIL_RELATIONSHIPS)}."
+    ),
+):
+    """
+    Show properties with their valuations, transactions, ownerships, mortgages, expenses and rental income.
+    """
+    include = include or list(PROPERTY_DETAIL_RELATIONSHIPS)
+    session = get_session()
+    property_service = services.PropertyService(PropertyRepository(session))
+    try:
+        inv_properties = property_service.get_property_detail(property_ids, include)
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="--include") from error
+
+    valuation_service = services.ValuationService(ValuationRepository(session))
     for inv_property in inv_properties:
-        table.add_row(
-            str(inv_property.id),
-            inv_property.address,
+        valuation = valuation_service.get_valuation(inv_property.id)
+        details = [
             inv_property.city,
-            inv_property.property_type.value,
-            inv_property.status.value,
-            str(inv_property.no_of_bedrooms),
-            str(inv_property.no_of_bathrooms),
-            str(inv_property.sqm),
-            str(inv_property.floor),
-            str(inv_property.furnished),
+            getattr(inv_property.property_type, "value", None),
+            getattr(inv_property.status, "value", None),
+            f"rent {inv_property.monthly_rent:,.2f}" if inv_property.monthly_rent is not None else None,
+            f"valued {valuation.valuation_amount:,.2f} on {valuation.valuation_date}" if valuation else None,
+        ]
+        console.print(
+            f"[bold cyan]{inv_property.id}[/bold cyan] [bold]{inv_property.address}[/bold] "
+            + ", ".join(detail for detail in details if detail)
         )
-    console.print(table)
+        for relationship in include:
+            table = Table(title=relationship.replace("_", " ").capitalize(), title_justify="left")
+            for column in PROPERTY_DETAIL_COLUMNS[relationship]:
+                table.add_column(column.replace(".", " ").replace("_", " ").capitalize())
+            for row in detail_rows(inv_property, relationship):
+                table.add_row(*map(detail_value, row.values()))
+            console.print(table)
+
+    missing = sorted(set(property_ids) - {inv_property.id for inv_property in inv_properties})
+    if missing:
+        console.print(f"Properties not found: {', '.join(map(str, missing))}")
     session.close()
 
 
@@ -88,7 +164,8 @@ def rm(property_id: int):
     """
     Remove a property from the database.
     """
-    property_service = PropertyService(PropertyRepository(session))
+    session = get_session()
+    property_service = services.PropertyService(PropertyRepository(session))
     property_service.delete_property(property_id)
     console.print("Property removed successfully.")
     session.close()
@@ -105,12 +182,15 @@ def purchase(
     ownership_share: float,
     mortgage_interest_rate: float,
     mortgage_loan_amount: float,
+    mortgage_payment_term: int = typer.Option(25, min=1, help="Term of the mortgage in years."),
 ):
     """
     Purchase a property.
     """
+    session = get_session()
 
-    finance_service = FinanceService(FinanceRepository(session), InvestorRepository(session))
+    # the finance services load the simulation engine, they are only imported for purchases
+    finance_service = services.FinanceService(FinanceRepository(session), InvestorRepository(session))
     finance_service.purchase_property(
         property_id,
         investor_id,
@@ -121,6 +201,7 @@ def purchase(
         ownership_share,
         mortgage_interest_rate,
         mortgage_loan_amount,
+        mortgage_payment_term,
     )
     session.close()
     console.print("Property purchased successfully.")
@@ -0,0 +1,54 @@
+import datetime
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from property_tracker.database import get_session
+from property_tracker.repositories import RentRepository
+from property_tracker.services import RentService
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+MONTH_FORMATS = ["%Y-%m", "%Y-%m-%d"]
+
+
+@app.command()
+def generate(
+    start: datetime.datetime = typer.Argument(..., formats=MONTH_FORMATS, help="First month, YYYY-MM."),
+    end: datetime.datetime = typer.Argument(..., formats=MONTH_FORMATS, help="Last month, YYYY-MM."),
+):
+    """
+    Generate the expected monthly rent of every rented property, skipping the months already generated.
+    """
+    session = get_session()
+    rent_service = RentService(RentRepository(session))
+    generated = rent_service.generate_rent(start.date(), end.date())
+    session.close()
+    console.print(f"Generated {generated} monthly rents.")
+
+
+@app.command()
+def record(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    rejects: Path = typer.Option(None, help="File for the rejected rows, next to the input file by default"),
+    chunk_size: int = 1000,
+):
+    """
+    Record the rent payments of a CSV or JSON Lines file, with property_id, period, amount, date and investor_id.
+    """
+    session = get_session()
+    rent_service = RentService(RentRepository(session))
+    result = rent_service.record_payments_file(path, rejects_path=rejects, chunk_size=chunk_size)
+    session.close()
+
+    console.print(
+        f"Recorded {result.rows_imported} of {result.rows_read} rent payments "
+        f"in {result.elapsed_seconds:.2f}s ({result.rows_per_second:,.0f} rows/sec)."
+    )
+    if result.rows_rejected:
+        console.print(
+            f"[bold red]{result.rows_rejected} rows rejected[/bold red], "
+            f"see {rejects or path.with_suffix('.rejects.jsonl')}"
+        )
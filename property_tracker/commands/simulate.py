@@ -1,5 +1,7 @@
 import datetime
+from typing import List, Tuple
 
+import numpy as np
 import typer
 from rich import print as rprint
 from rich.console import Console
@@ -9,20 +11,14 @@ from rich.prompt import Confirm, Prompt
 from rich.table import Table
 from rich.text import Text
 
-from property_tracker.database import session
+from property_tracker.database import get_session
 from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository
 from property_tracker.services import FinanceService, InvestorService, PropertyService
+from property_tracker.services.simulate_v2 import InvestmentDetails, InvestorType, PropertyDetails, SimulationService
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 console = Console()
 
-investor_repository = InvestorRepository(session)
-property_repository = PropertyRepository(session)
-finance_repository = FinanceRepository(session)
-investor_service = InvestorService(investor_repository)
-property_service = PropertyService(property_repository)
-finance_service = FinanceService(finance_repository, investor_repository)
-
 LTV = 0.75
 LEGAL_FEES = 2000
 PROPERTY_MANAGEMENT_CUT = 0.12
@@ -69,6 +65,11 @@ def run(investor_id: int, property_id: int, investment_type: str):
     """
     Run the property investment simulation
     """
+    session = get_session()
+    investor_repository = InvestorRepository(session)
+    investor_service = InvestorService(investor_repository)
+    property_service = PropertyService(PropertyRepository(session))
+    finance_service = FinanceService(FinanceRepository(session), investor_repository)
 
     show_information_panel(
         "Property Investment Simulation",
@@ -229,3 +230,88 @@ def run(investor_id: int, property_id: int, investment_type: str):
         - **ROI**: {roi * 100}%
         """,
     )
+
+
+def parse_grid_dimension(spec: str) -> Tuple[str, List[float]]:
+    """Parse a grid dimension given as name=start:stop:step or name=value1,value2,..."""
+    name, separator, values = spec.partition("=")
+    if not separator:
+        raise typer.BadParameter(f"Expected name=start:stop:step or name=value1,value2 but got {spec!r}")
+
+    try:
+        if ":" in values:
+            start, stop, step = (float(value) for value in values.split(":"))
+            # the stop value is included in the grid
+            return name, list(np.arange(start, stop + step / 2, step))
+        return name, [float(value) for value in values.split(",")]
+    except ValueError as error:
+        raise typer.BadParameter(f"Invalid values in grid dimension {spec!r}") from error
+
+
+@app.command()
+def sweep(
+    purchase_price: float,
+    monthly_rent: float,
+    grid: List[str] = typer.Option(..., help="Grid dimension as name=start:stop:step or name=value1,value2"),
+    insurance: float = 0,
+    service_charge: float = 0,
+    ground_rent: float = 0,
+    annual_price_appreciation: float = 0,
+    annual_rent_appreciation: float = 0,
+    down_payment: float = None,
+    interest_rate: float = 5,
+    payment_term: int = PAYMENT_TERM,
+    legal_fees: float = LEGAL_FEES,
+    refurbishment_cost: float = 0,
+    furnishing_cost: float = 0,
+    investor_type: InvestorType = InvestorType.SOLE_TRADER,
+    years: int = 10,
+    metric: str = "total_roi",
+    top: int = 10,
+    workers: int = 1,
+):
+    """
+    Sweep the simulation over a grid of inputs and rank the results by a metric
+    """
+    property_details = PropertyDetails(
+        purchase_price=purchase_price,
+        monthly_rent=monthly_rent,
+        insurance=insurance,
+        service_charge=service_charge,
+        ground_rent=ground_rent,
+        annual_price_appreciation=annual_price_appreciation,
+        annual_rent_appreciation=annual_rent_appreciation,
+    )
+    investment_details = InvestmentDetails(
+        down_payment=purchase_price * (1 - LTV) if down_payment is None else down_payment,
+        interest_rate=interest_rate,
+        payment_term=payment_term,
+        legal_fees=legal_fees,
+        refurbishment_cost=refurbishment_cost,
+        furnishing_cost=furnishing_cost,
+    )
+
+    try:
+        results = SimulationService().run_sweep(
+            property_details,
+            investment_details,
+            investor_type,
+            years,
+            dict(parse_grid_dimension(spec) for spec in grid),
+            metric=metric,
+            max_workers=workers,
+        )
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+
+    table = Table(title=f"Top {top} of {len(results)} grid points by {metric}")
+    for column in results.columns:
+        table.add_column(column, justify="right")
+    for row in results.head(top).itertuples(index=False):
+        table.add_row(
+            *[
+                f"{value:.2%}" if column.endswith("roi") else f"{value:,.2f}"
+                for column, value in zip(results.columns, row)
+            ]
+        )
+    console.print(table)
@@ -0,0 +1,155 @@
+import time
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# A statement run more times than this in one scope is reported as a likely N+1 query
+DEFAULT_REPEAT_THRESHOLD = 10
+
+# The statistics of the scopes open in the current context, innermost last
+_scopes: ContextVar[Tuple["StatementStats", ...]] = ContextVar("statement_scopes", default=())
+_listening = False
+
+
+class RepeatedStatementWarning(UserWarning):
+    """
+    Warns that the same statement ran many times in one scope, usually lazy loads in a loop
+    """
+
+
+@dataclass
+class StatementStats:
+    """
+    The statements sent to the database in a scope
+
+    Statements are counted by their parameterized SQL, an executemany counts as one statement.
+    """
+
+    statements: int = 0
+    commits: int = 0
+    db_time: float = 0.0
+    counts: Counter = field(default_factory=Counter)
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+    def repeated(self, threshold: int = DEFAULT_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """
+        Get the statements that ran more than threshold times, the most repeated first
+        """
+        return [(statement, count) for statement, count in self.counts.most_common() if count > threshold]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _scopes.get():
+        conn.info.setdefault("statement_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    scopes = _scopes.get()
+    start_times = conn.info.get("statement_start_times")
+    if not scopes or not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    for stats in scopes:
+        stats.statements += 1
+        stats.db_time += elapsed
+        stats.counts[statement] += 1
+
+
+def _commit(conn):
+    for stats in _scopes.get():
+        stats.commits += 1
+
+
+def listen():
+    """
+    Install the listeners on every engine, once
+
+    The listeners return straight away when no scope is open, so the cost outside of ``count_statements`` is a
+    context variable lookup per statement.
+    """
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "commit", _commit)
+        _listening = True
+
+
+@contextmanager
+def count_statements(
+    repeat_threshold: Optional[int] = DEFAULT_REPEAT_THRESHOLD, max_statements: Optional[int] = None
+) -> Iterator[StatementStats]:
+    """
+    Count the statements, commits and database time of the block, on every engine
+
+    Scopes follow the context, so concurrent requests of the API are counted separately, and nested scopes all count
+    the statements of the inner block. On exit a RepeatedStatementWarning is issued for every statement that ran
+    more than repeat_threshold times.
+
+    :param repeat_threshold: the number of runs of one statement above which it is reported, None to not report
+    :param max_statements: the statement budget of the block, an AssertionError is raised on exit when it is exceeded
+    :return: the statistics, filled as the block runs
+    """
+    listen()
+    stats = StatementStats()
+    token = _scopes.set(_scopes.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _scopes.reset(token)
+
+    if repeat_threshold is not None:
+        for statement, count in stats.repeated(repeat_threshold):
+            warnings.warn(
+                f"Statement ran {count} times, is it lazy loading in a loop? {statement}",
+                RepeatedStatementWarning,
+                stacklevel=3,
+            )
+    if max_statements is not None and stats.statements > max_statements:
+        raise AssertionError(f"{stats.statements} statements exceed the budget of {max_statements}")
+
+
+def print_statement_stats(stats: StatementStats, repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD, top: int = 5):
+    """
+    Print the totals of a scope and its most repeated statements to stderr
+    """
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    console = Console(stderr=True)
+    console.print(
+        f"{stats.statements} statements, {stats.commits} commits, {stats.round_trips} round trips, "
+        f"{stats.db_time * 1000:.2f} ms in the database"
+    )
+    repeated = stats.repeated(repeat_threshold)[:top]
+    if repeated:
+        table = Table(title=f"Statements run more than {repeat_threshold} times")
+        table.add_column("Runs", justify="right")
+        table.add_column("Statement", overflow="fold")
+        for statement, count in repeated:
+            table.add_row(str(count), escape(" ".join(statement.split())))
+        console.print(table)
+
+
+@contextmanager
+def report_statements(repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD) -> Iterator[StatementStats]:
+    """
+    Count the statements of the block and print their totals on exit, even when the block fails
+    """
+    stats = None
+    try:
+        with count_statements(repeat_threshold=None) as stats:
+            yield stats
+    finally:
+        if stats is not None:
+            print_statement_stats(stats, repeat_threshold)
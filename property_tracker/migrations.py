@@ -0,0 +1,41 @@
+from typing import List
+
+from sqlalchemy import Engine, inspect
+from sqlalchemy.schema import CreateColumn
+
+from property_tracker.models import Base
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """
+    Bring an existing database up to date with the models
+
+    ``create_all`` only creates the missing tables, so the columns and indexes added to the models after a table was
+    created are created here. New columns must be nullable, they are added empty. Creating an index on a large table
+    takes a while and, outside PostgreSQL's CONCURRENTLY mode, blocks the writes to the table, so run this when the
+    database is quiet.
+
+    :param engine: the engine of the database
+    :return: the names of the columns, as table.column, and of the indexes that were created
+    """
+    Base.metadata.create_all(engine)
+
+    created = []
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    definition = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+                    created.append(f"{table.name}.{column.name}")
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(engine)
+                created.append(index.name)
+    return created
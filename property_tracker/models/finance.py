@@ -1,6 +1,6 @@
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Date, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, Date, Enum, Float, ForeignKey, Index, Integer, String, desc
 from sqlalchemy.orm import relationship
 
 from property_tracker.models import Base
@@ -12,6 +12,10 @@ class Mortgage(Base):
     """
 
     __tablename__ = "mortgages"
+    __table_args__ = (
+        Index("ix_mortgages_property_id", "property_id"),
+        Index("ix_mortgages_investor_id", "investor_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     start_date = Column(Date)
     end_date = Column(Date)
@@ -42,6 +46,9 @@ class PropertyTransaction(Base):
     """
 
     __tablename__ = "property_transactions"
+    __table_args__ = (
+        Index("ix_property_transactions_property_id_transaction_date", "property_id", "transaction_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     transaction_date = Column(Date, nullable=False)
     transaction_amount = Column(Float, nullable=False)
@@ -61,6 +68,10 @@ class PropertyOwnership(Base):
     """
 
     __tablename__ = "property_ownerships"
+    __table_args__ = (
+        Index("ix_property_ownerships_property_id", "property_id"),
+        Index("ix_property_ownerships_investor_id", "investor_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     ownership_start_date = Column(Date, nullable=False)
     ownership_end_date = Column(Date)
@@ -71,6 +82,7 @@ class PropertyOwnership(Base):
 
     investor = relationship("Investor", back_populates="ownerships")
     property = relationship("Property", back_populates="ownerships")
+    transaction = relationship("PropertyTransaction")
 
 
 class ValuationType(PyEnum):
@@ -87,6 +99,15 @@ class Valuation(Base):
     """
 
     __tablename__ = "valuations"
+    __table_args__ = (
+        # Newest first, so the latest valuation of a property is the first index entry of the property
+        Index(
+            "ix_valuations_property_id_valuation_date",
+            "property_id",
+            desc("valuation_date"),
+            postgresql_include=["valuation_amount"],
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     valuation_date = Column(Date, nullable=False)
     valuation_amount = Column(Float, nullable=False)
@@ -102,6 +123,11 @@ class Expense(Base):
     """
 
     __tablename__ = "expenses"
+    __table_args__ = (
+        # The amount is included so that totals over a date range are answered from the index alone on PostgreSQL
+        Index("ix_expenses_property_id_date", "property_id", "date", postgresql_include=["amount"]),
+        Index("ix_expenses_investor_id_date", "investor_id", "date", postgresql_include=["amount"]),
+    )
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String)
     amount = Column(Float)
@@ -116,14 +142,42 @@ class Expense(Base):
 class RentalIncome(Base):
     """
     Represents a rent payment received for a property.
+    Rent generated for a month has a period and an expected amount, and no amount or date until it is received.
     """
 
     __tablename__ = "rental_incomes"
+    __table_args__ = (
+        Index("ix_rental_incomes_property_id_date", "property_id", "date", postgresql_include=["amount"]),
+        Index("ix_rental_incomes_investor_id_date", "investor_id", "date", postgresql_include=["amount"]),
+        # One rent per property and month, so that generating or recording the rent of a month twice is a no-op
+        Index("ux_rental_incomes_property_id_period", "property_id", "period", unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float)
     date = Column(Date)
+    period = Column(Date)
+    expected_amount = Column(Float)
     property_id = Column(Integer, ForeignKey("properties.id"))
     investor_id = Column(Integer, ForeignKey("investors.id"))
 
     property = relationship("Property", back_populates="rental_income")
     investor = relationship("Investor", back_populates="rental_incomes")
+
+
+class PropertyMonthlyLedger(Base):
+    """
+    Represents the cash flows of a property in a month.
+    Maintained incrementally as expenses, rent payments and purchases are recorded.
+    """
+
+    __tablename__ = "property_monthly_ledger"
+    property_id = Column(Integer, ForeignKey("properties.id"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    rent_collected = Column(Float, nullable=False, default=0)
+    expenses = Column(Float, nullable=False, default=0)
+    mortgage_payments = Column(Float, nullable=False, default=0)
+    capital_invested = Column(Float, nullable=False, default=0)
+
+    @property
+    def net_cash_flow(self) -> float:
+        return self.rent_collected - self.expenses - self.mortgage_payments
@@ -54,6 +54,7 @@ class Property(Base):
     furnished = Column(Boolean)
     property_type = Column(Enum(PropertyType))
     status = Column(Enum(Status))
+    monthly_rent = Column(Float)
 
     valuations = relationship("Valuation", back_populates="property")
     property_transactions = relationship("PropertyTransaction", back_populates="property")
@@ -0,0 +1,121 @@
+import functools
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+DEFAULT_PROFILE_OUTPUT = Path("property_tracker.pstats")
+DEFAULT_TOP = 20
+
+# The durations in seconds of the timed spans by name, while spans are recorded, None otherwise
+_spans: Optional[Dict[str, List[float]]] = None
+
+
+def timed_span(function: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Mark a function as a timed span, reported with the profile of a command
+
+    Outside of ``record_spans`` the decorated function is called straight away, the span only costs a global lookup.
+
+    :param function: the function to time, when used as ``@timed_span``
+    :param name: the name of the span, the qualified name of the function by default
+    :return: the decorated function, or a decorator when only a name is given
+    """
+
+    def decorator(function: Callable) -> Callable:
+        span = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            spans = _spans
+            if spans is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                spans.setdefault(span, []).append(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator(function) if function is not None else decorator
+
+
+@contextmanager
+def record_spans() -> Iterator[Dict[str, List[float]]]:
+    """
+    Record the durations of the timed spans called inside the block
+
+    :return: the durations in seconds of every call by span name, filled as the spans are called
+    """
+    global _spans
+    previous, _spans = _spans, {}
+    try:
+        yield _spans
+    finally:
+        _spans = previous
+
+
+@contextmanager
+def profile(output: Path = DEFAULT_PROFILE_OUTPUT, top: int = DEFAULT_TOP):
+    """
+    Profile the block with cProfile, write the statistics and print the hottest functions and the timed spans
+
+    The statistics are written in the pstats format, open them with ``python -m pstats`` or a viewer such as
+    snakeviz. The report is printed to stderr, so that it does not mix with the output of the command.
+
+    :param output: the file the statistics are written to
+    :param top: the number of functions in the report, by cumulative time
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    with record_spans() as spans:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output)
+            print_report(profiler, spans, output, top)
+
+
+def print_report(profiler, spans: Dict[str, List[float]], output: Path, top: int):
+    """
+    Print the hottest functions of a profile and the totals of the timed spans
+    """
+    import pstats
+
+    from rich.console import Console
+    from rich.table import Table
+
+    stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+    table = Table(title=f"Top {top} functions by cumulative time ({stats.total_tt * 1000:.1f} ms in total)")
+    table.add_column("Function", overflow="fold")
+    table.add_column("Calls", justify="right")
+    table.add_column("Own (ms)", justify="right")
+    table.add_column("Cumulative (ms)", justify="right")
+    for function in stats.fcn_list[:top]:
+        primitive_calls, calls, own_time, cumulative_time, _ = stats.stats[function]
+        filename, line, function_name = function
+        location = function_name if filename == "~" else f"{function_name} ({Path(filename).name}:{line})"
+        table.add_row(
+            location,
+            str(calls) if calls == primitive_calls else f"{calls}/{primitive_calls}",
+            f"{own_time * 1000:.2f}",
+            f"{cumulative_time * 1000:.2f}",
+        )
+
+    console = Console(stderr=True)
+    console.print(table)
+    if spans:
+        span_table = Table(title="Timed spans")
+        span_table.add_column("Span")
+        span_table.add_column("Calls", justify="right")
+        span_table.add_column("Total (ms)", justify="right")
+        span_table.add_column("Mean (ms)", justify="right")
+        for span, durations in sorted(spans.items(), key=lambda item: -sum(item[1])):
+            total = sum(durations)
+            span_table.add_row(span, str(len(durations)), f"{total * 1000:.2f}", f"{total * 1000 / len(durations):.2f}")
+        console.print(span_table)
+    console.print(f"Profile written to {output}")
@@ -1,3 +1,8 @@
 from .finance import FinanceRepository
+from .importer import ImportRepository
 from .investor import InvestorRepository
+from .ledger import LedgerRepository
+from .portfolio import PortfolioRepository
 from .property import PropertyRepository
+from .rent import RentRepository
+from .valuation import ValuationRepository
@@ -1,4 +1,6 @@
 import datetime
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
 
 from dateutil.relativedelta import relativedelta
 from sqlalchemy.orm import Session
@@ -8,15 +10,74 @@ from property_tracker.models.finance import (
     Mortgage,
     PropertyOwnership,
     PropertyTransaction,
+    RentalIncome,
     TransactionType,
     Valuation,
     ValuationType,
 )
+from property_tracker.repositories.ledger import LedgerRepository, month_of
+from property_tracker.repositories.pagination import DEFAULT_BATCH_SIZE, paginate, stream
+from property_tracker.repositories.rent import RentRepository
+
+
+def parse_date(value: Union[str, datetime.date]) -> datetime.date:
+    """
+    Parse a date given as a YYYY-MM-DD string, dates are returned unchanged
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_period(value: Union[str, datetime.date]) -> datetime.date:
+    """
+    Parse a rent period given as a YYYY-MM string or as any date of the month, into the first day of the month
+    """
+    if isinstance(value, str) and len(value) == 7:
+        return datetime.datetime.strptime(value, "%Y-%m").date()
+    return month_of(parse_date(value))
 
 
 class FinanceRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.in_unit_of_work = False
+        self.ledger = LedgerRepository(db)
+        self.rent = RentRepository(db)
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Group the records created in the block into a single transaction
+
+        Inside the block records are only added to the session. They are flushed and committed once when the block
+        exits, or rolled back together if it raises.
+        """
+        if self.in_unit_of_work:
+            yield self
+            return
+
+        self.in_unit_of_work = True
+        try:
+            yield self
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self.in_unit_of_work = False
+
+    def save(self, record):
+        """
+        Add a record to the session, committing it right away unless in a unit of work
+        """
+        self.db.add(record)
+        if not self.in_unit_of_work:
+            self.db.commit()
+            self.db.refresh(record)
+        return record
 
     def create_property_transaction(
         self,
@@ -27,37 +88,55 @@ class FinanceRepository:
         transaction_amount: float,
         cash_payment: float,
         notes: str,
+        mortgage: Mortgage = None,
     ):
-        # Create the property transaction record
+        # Create the property transaction record, the mortgage can be linked before it has an id
         transaction = PropertyTransaction(
             property_id=property_id,
             mortgage_id=mortgage_id,
             transaction_type=transaction_type,
-            transaction_date=transaction_date,
+            transaction_date=parse_date(transaction_date),
             transaction_amount=transaction_amount,
             cash_payment=cash_payment,
             notes=notes,
         )
+        if mortgage is not None:
+            transaction.mortgage = mortgage
 
-        self.db.add(transaction)
-        self.db.commit()
-        self.db.refresh(transaction)
+        with self.unit_of_work():
+            self.save(transaction)
+            if transaction_type == TransactionType.PURCHASE:
+                self.ledger.add(
+                    [
+                        {
+                            "property_id": property_id,
+                            "date": transaction.transaction_date,
+                            "capital_invested": cash_payment,
+                        }
+                    ]
+                )
         return transaction
 
     def create_ownership_record(
-        self, property_id: int, investor_id: int, ownership_start_date: str, ownership_share: float, transaction_id: int
+        self,
+        property_id: int,
+        investor_id: int,
+        ownership_start_date: str,
+        ownership_share: float,
+        transaction_id: int,
+        transaction: PropertyTransaction = None,
     ):
         ownership = PropertyOwnership(
             property_id=property_id,
             investor_id=investor_id,
-            ownership_start_date=ownership_start_date,
+            ownership_start_date=parse_date(ownership_start_date),
             ownership_share=ownership_share,
             transaction_id=transaction_id,
         )
-        self.db.add(ownership)
-        self.db.commit()
-        self.db.refresh(ownership)
-        return ownership
+        if transaction is not None:
+            ownership.transaction = transaction
+
+        return self.save(ownership)
 
     def create_mortgage_record(
         self,
@@ -70,7 +149,7 @@ class FinanceRepository:
         payment_term: int,
     ):
         # parse the start date
-        start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        start_date = parse_date(start_date)
         # calculate the end date of the mortgage based on the payment term
         end_date = start_date + relativedelta(years=payment_term)
 
@@ -83,10 +162,7 @@ class FinanceRepository:
             annual_interest_rate=annual_interest_rate,
             payment_term=payment_term,
         )
-        self.db.add(mortgage)
-        self.db.commit()
-        self.db.refresh(mortgage)
-        return mortgage
+        return self.save(mortgage)
 
     def create_valuation_record(
         self,
@@ -97,29 +173,94 @@ class FinanceRepository:
     ):
         valuation = Valuation(
             property_id=property_id,
-            valuation_date=valuation_date,
+            valuation_date=parse_date(valuation_date),
             valuation_amount=valuation_amount,
             valuation_type=valuation_type,
         )
-        self.db.add(valuation)
-        self.db.commit()
-        self.db.refresh(valuation)
-        return valuation
+        return self.save(valuation)
 
     def create_expense(self, description: str, amount: float, date: str, investor_id: int, property_id: int):
         expense = Expense(
-            description=description, amount=amount, date=date, investor_id=investor_id, property_id=property_id
+            description=description,
+            amount=amount,
+            date=parse_date(date),
+            investor_id=investor_id,
+            property_id=property_id,
         )
-        self.db.add(expense)
-        self.db.commit()
-        self.db.refresh(expense)
+        with self.unit_of_work():
+            self.save(expense)
+            self.ledger.add([{"property_id": property_id, "date": expense.date, "expenses": amount}])
         return expense
 
-    def get_all_mortgages(self):
-        return self.db.query(Mortgage).all()
+    def create_rent_payment(
+        self,
+        property_id: int,
+        investor_id: int,
+        amount: float,
+        date: str,
+        period: Optional[Union[str, datetime.date]] = None,
+    ):
+        """
+        Record a rent payment of a period, added to the rent already collected for that period
+
+        Payments share the upsert of ``RentRepository``, so collecting the rent of a month and recording it from a
+        file or generating the expected rent of the month all write the same row. Rent paid late is collected with the
+        period it pays for, and rent paid in parts adds up.
 
-    def get_all_expenses(self):
-        return self.db.query(Expense).all()
+        :param period: the month the rent is for, YYYY-MM, the month of the payment date by default
+        """
+        payment_date = parse_date(date)
+        period = month_of(payment_date) if period is None else parse_period(period)
+        with self.unit_of_work():
+            self.rent.upsert_payments(
+                [
+                    {
+                        "property_id": property_id,
+                        "investor_id": investor_id,
+                        "amount": amount,
+                        "date": payment_date,
+                        "period": period,
+                    }
+                ],
+                accumulate=True,
+            )
+        return self.db.query(RentalIncome).filter_by(property_id=property_id, period=period).populate_existing().one()
+
+    def get_all_mortgages(
+        self, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Mortgage]:
+        return paginate(self.db.query(Mortgage), Mortgage.id, limit, offset, after_id).all()
+
+    def iter_mortgages(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Mortgage]:
+        return stream(self.db.query(Mortgage), Mortgage.id, limit, offset, after_id, batch_size)
+
+    def get_all_expenses(
+        self, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Expense]:
+        return paginate(self.db.query(Expense), Expense.id, limit, offset, after_id).all()
+
+    def iter_expenses(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Expense]:
+        return stream(self.db.query(Expense), Expense.id, limit, offset, after_id, batch_size)
 
-    def get_all_expenses_for_property(self, property_id: int):
-        return self.db.query(Expense).filter(Expense.property_id == property_id).all()
+    def get_all_expenses_for_property(
+        self, property_id: int, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[Expense]:
+        # Answered from the (property_id, date) index, in date order
+        query = self.db.query(Expense).filter(Expense.property_id == property_id)
+        if start_date is not None:
+            query = query.filter(Expense.date >= parse_date(start_date))
+        if end_date is not None:
+            query = query.filter(Expense.date <= parse_date(end_date))
+        return query.order_by(Expense.date, Expense.id).all()
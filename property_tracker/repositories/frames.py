@@ -0,0 +1,62 @@
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Enum, Select, String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from property_tracker.models import Base
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def select_columns(model: Type[Base], columns: Optional[Sequence[str]] = None) -> Tuple[Select, Dict[str, Type]]:
+    """
+    Select columns of a model without loading its instances
+
+    Enum columns are selected as the raw names stored in the database, so that SQLAlchemy does not convert every
+    value to an enum member, they are decoded by ``read_frame`` once per column instead.
+
+    :param model: the model to select from
+    :param columns: the names of the columns, every column of the table when not given
+    :return: the select statement, and the enum class of each enum column by name
+    """
+    table = model.__table__
+    columns = columns or [column.name for column in table.columns]
+    unknown = [name for name in columns if name not in table.columns]
+    if unknown:
+        raise ValueError(f"Unknown {table.name} columns: {', '.join(unknown)}")
+
+    selected, enums = [], {}
+    for name in columns:
+        column = table.columns[name]
+        if isinstance(column.type, Enum) and column.type.enum_class is not None:
+            enums[name] = column.type.enum_class
+            selected.append(type_coerce(column, String).label(name))
+        else:
+            selected.append(column)
+    return select(*selected), enums
+
+
+def read_frame(db: Session, statement: Select, enums: Optional[Dict[str, Type]] = None) -> "pd.DataFrame":
+    """
+    Read the rows of a statement into a DataFrame
+
+    The rows are read on the connection of the session, straight into the columns of the frame, without going
+    through the identity map. Enum columns become categoricals whose categories are renamed from the stored names to
+    the values of the enum, so each distinct name is decoded once whatever the number of rows.
+
+    :param db: the session
+    :param statement: the statement to read, usually from ``select_columns``
+    :param enums: the enum class of each enum column by name
+    :return: the DataFrame, with a column per selected column
+    """
+    # pandas is imported here so that the commands which do not read frames do not import it
+    import pandas as pd
+
+    frame = pd.read_sql(statement, db.connection())
+    for name, enum_class in (enums or {}).items():
+        names = frame[name].astype("category")
+        frame[name] = names.cat.rename_categories(
+            {member.name: member.value for member in enum_class if member.name in names.cat.categories}
+        )
+    return frame
@@ -0,0 +1,61 @@
+from typing import Dict, List, Type
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from property_tracker.models import Base
+from property_tracker.models.finance import Valuation
+from property_tracker.repositories.ledger import LedgerRepository
+from property_tracker.repositories.valuation import mark_valuations_changed
+
+
+class ImportRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.ledger = LedgerRepository(db)
+
+    def bulk_insert(self, model: Type[Base], rows: List[Dict]) -> List[int]:
+        """
+        Insert a chunk of rows in one executemany and one commit
+
+        When the chunk violates a constraint it is rolled back and retried row by row, each row in a savepoint,
+        so only the offending rows are rejected. Expenses and rent payments are added to the monthly ledger in the
+        same transaction.
+
+        :param model: the model of the table
+        :param rows: the values of the rows
+        :return: the positions in the chunk of the rows that could not be inserted
+        """
+        if not rows:
+            return []
+
+        try:
+            self.db.execute(insert(model), rows)
+            self.ledger.add(self.ledger.entries_for(model, rows))
+            self.mark_changed(model, rows)
+            self.db.commit()
+            return []
+        except IntegrityError:
+            self.db.rollback()
+
+        rejected = []
+        for position, row in enumerate(rows):
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(model), [row])
+            except IntegrityError:
+                rejected.append(position)
+        rejected_positions = set(rejected)
+        inserted = [row for position, row in enumerate(rows) if position not in rejected_positions]
+        self.ledger.add(self.ledger.entries_for(model, inserted))
+        self.mark_changed(model, inserted)
+        self.db.commit()
+        return rejected
+
+    def mark_changed(self, model: Type[Base], rows: List[Dict]):
+        """
+        Drop the properties of inserted valuations from the valuation index when the chunk commits
+        """
+        if model is Valuation:
+            mark_valuations_changed(self.db, (row.get("property_id") for row in rows))
@@ -1,6 +1,13 @@
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
+
 from sqlalchemy.orm import Session
 
 from property_tracker.models.investor import Investor
+from property_tracker.repositories.frames import read_frame, select_columns
+from property_tracker.repositories.pagination import DEFAULT_BATCH_SIZE, paginate, stream
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class InvestorRepository:
@@ -14,10 +21,32 @@ class InvestorRepository:
         return investor
 
     def get_investor(self, investor_id: int):
-        return self.db.query(Investor).filter(Investor.id == investor_id).first()
-
-    def get_all_investors(self):
-        return self.db.query(Investor).all()
+        # Session.get answers from the identity map without a round trip when the investor is already loaded
+        return self.db.get(Investor, investor_id)
+
+    def get_all_investors(
+        self, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Investor]:
+        return paginate(self.db.query(Investor), Investor.id, limit, offset, after_id).all()
+
+    def get_investors_frame(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> "pd.DataFrame":
+        statement, enums = select_columns(Investor, columns)
+        return read_frame(self.db, paginate(statement, Investor.id, limit, offset, after_id), enums)
+
+    def iter_investors(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Investor]:
+        return stream(self.db.query(Investor), Investor.id, limit, offset, after_id, batch_size)
 
     def update_investor(self, investor_id: int, name: str, email: str):
         investor = self.get_investor(investor_id)
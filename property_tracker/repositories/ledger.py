@@ -0,0 +1,177 @@
+import datetime
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from property_tracker.models import Base
+from property_tracker.models.finance import (
+    Expense,
+    Mortgage,
+    PropertyMonthlyLedger,
+    PropertyTransaction,
+    RentalIncome,
+    TransactionType,
+)
+
+LEDGER_AMOUNTS = ("rent_collected", "expenses", "mortgage_payments", "capital_invested")
+
+# The ledger amount each imported row adds to, by model
+LEDGER_AMOUNT_OF_MODEL = {Expense: "expenses", RentalIncome: "rent_collected"}
+
+
+def dialect_insert(db: Session, table):
+    """
+    An insert statement in the dialect of the database of a session, for the ON CONFLICT clauses
+
+    :param db: the session
+    :param table: the table or model to insert into
+    :return: the insert statement
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"INSERT ... ON CONFLICT is not supported on the {dialect} database")
+    return insert(table)
+
+
+def month_of(date: Union[str, datetime.date]) -> datetime.date:
+    """
+    Get the first day of the month of a date, given as a date, a datetime or an ISO formatted string
+    """
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    elif isinstance(date, str):
+        date = datetime.date.fromisoformat(date[:10])
+    return date.replace(day=1)
+
+
+class LedgerRepository:
+    """
+    Maintains the property_monthly_ledger table
+
+    Amounts are added to the row of their property and month with an INSERT ... ON CONFLICT DO UPDATE, in the
+    transaction of the session, so the ledger is committed together with the records it summarises.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def upsert(self):
+        """
+        An insert statement that adds the amounts to the existing row of the property and month
+        """
+        table = PropertyMonthlyLedger.__table__
+        statement = dialect_insert(self.db, table)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.property_id, table.c.month],
+            set_={amount: table.c[amount] + statement.excluded[amount] for amount in LEDGER_AMOUNTS},
+        )
+
+    def add(self, entries: Iterable[Dict]):
+        """
+        Add amounts to the ledger
+
+        Entries of the same property and month are added up first, so each ledger row is written once.
+
+        :param entries: dictionaries with a property_id, a date and any of the LEDGER_AMOUNTS, entries without a
+            property are ignored
+        """
+        totals = {}
+        for entry in entries:
+            if entry.get("property_id") is None:
+                continue
+            key = (entry["property_id"], month_of(entry["date"]))
+            row = totals.setdefault(key, dict.fromkeys(LEDGER_AMOUNTS, 0.0))
+            for amount in LEDGER_AMOUNTS:
+                row[amount] += entry.get(amount) or 0
+
+        if totals:
+            rows = [{"property_id": property_id, "month": month, **row} for (property_id, month), row in totals.items()]
+            self.db.execute(self.upsert(), rows)
+
+    @staticmethod
+    def entries_for(model: Type[Base], rows: Iterable[Dict]) -> List[Dict]:
+        """
+        Get the ledger entries of rows inserted into a table, none for the tables the ledger does not summarise
+        """
+        amount = LEDGER_AMOUNT_OF_MODEL.get(model)
+        if amount is None:
+            return []
+        return [{"property_id": row.get("property_id"), "date": row["date"], amount: row["amount"]} for row in rows]
+
+    def get_ledger(
+        self,
+        property_id: int,
+        start_month: Optional[datetime.date] = None,
+        end_month: Optional[datetime.date] = None,
+    ) -> List[PropertyMonthlyLedger]:
+        query = self.db.query(PropertyMonthlyLedger).filter(PropertyMonthlyLedger.property_id == property_id)
+        if start_month is not None:
+            query = query.filter(PropertyMonthlyLedger.month >= month_of(start_month))
+        if end_month is not None:
+            query = query.filter(PropertyMonthlyLedger.month <= month_of(end_month))
+        return query.order_by(PropertyMonthlyLedger.month).all()
+
+    def count(self, property_id: Optional[int] = None) -> int:
+        query = self.db.query(PropertyMonthlyLedger)
+        if property_id is not None:
+            query = query.filter(PropertyMonthlyLedger.property_id == property_id)
+        return query.count()
+
+    def clear(self, property_id: Optional[int] = None):
+        statement = delete(PropertyMonthlyLedger)
+        if property_id is not None:
+            statement = statement.where(PropertyMonthlyLedger.property_id == property_id)
+        self.db.execute(statement)
+
+    def month_start(self, date_column):
+        """
+        The first day of the month of a date column, in the SQL dialect of the database
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return func.date_trunc("month", date_column)
+        return func.date(date_column, "start of month")
+
+    def cash_flow_entries(self, property_id: Optional[int] = None) -> List[Dict]:
+        """
+        Get the monthly totals of the expenses, the rent collected and the cash paid for purchases
+
+        :param property_id: only the cash flows of this property, of every property when not given
+        :return: ledger entries, one per property, month and kind of cash flow
+        """
+        sources = [
+            ("expenses", Expense.property_id, Expense.date, Expense.amount, []),
+            ("rent_collected", RentalIncome.property_id, RentalIncome.date, RentalIncome.amount, []),
+            (
+                "capital_invested",
+                PropertyTransaction.property_id,
+                PropertyTransaction.transaction_date,
+                PropertyTransaction.cash_payment,
+                [PropertyTransaction.transaction_type == TransactionType.PURCHASE],
+            ),
+        ]
+        entries = []
+        for amount, property_column, date_column, amount_column, conditions in sources:
+            month = self.month_start(date_column).label("month")
+            statement = (
+                select(property_column, month, func.sum(amount_column))
+                .where(property_column.is_not(None), date_column.is_not(None), *conditions)
+                .group_by(property_column, month)
+            )
+            if property_id is not None:
+                statement = statement.where(property_column == property_id)
+            entries.extend(
+                {"property_id": row_property_id, "date": row_month, amount: total}
+                for row_property_id, row_month, total in self.db.execute(statement)
+            )
+        return entries
+
+    def get_mortgages(self, property_id: Optional[int] = None) -> List[Mortgage]:
+        query = self.db.query(Mortgage).filter(Mortgage.property_id.is_not(None), Mortgage.start_date.is_not(None))
+        if property_id is not None:
+            query = query.filter(Mortgage.property_id == property_id)
+        return query.all()
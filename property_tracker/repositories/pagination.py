@@ -0,0 +1,57 @@
+from typing import Iterator, Optional, Union
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Query
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def paginate(
+    query: Union[Query, Select], id_column, limit: Optional[int] = None, offset: Optional[int] = None, after_id=None
+) -> Union[Query, Select]:
+    """
+    Order a query by id and restrict it to a page
+
+    Keyset pagination with ``after_id`` seeks straight to the first row of the page through the primary key index,
+    while ``offset`` makes the database read and discard the skipped rows, so prefer ``after_id`` for deep pages.
+
+    :param query: the query or select statement to paginate
+    :param id_column: the primary key column the pages are ordered by
+    :param limit: the maximum number of rows, all rows when not given
+    :param offset: the number of rows to skip
+    :param after_id: only return the rows with a greater id
+    :return: the paginated query
+    """
+    query = query.order_by(id_column)
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def stream(
+    query: Query,
+    id_column,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    after_id=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator:
+    """
+    Iterate over the rows of a query in batches fetched from a server-side cursor
+
+    Only one batch of rows is held in memory at a time, and each batch is released from the session once the
+    iteration moved past it. The session must stay open until the iteration is finished.
+
+    :param query: the query to stream
+    :param id_column: the primary key column the rows are ordered by
+    :param limit: the maximum number of rows, all rows when not given
+    :param offset: the number of rows to skip
+    :param after_id: only return the rows with a greater id
+    :param batch_size: the number of rows fetched at once
+    :return: an iterator over the rows
+    """
+    return iter(paginate(query, id_column, limit, offset, after_id).yield_per(batch_size))
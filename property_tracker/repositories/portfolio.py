@@ -0,0 +1,230 @@
+import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Row, Select, case, extract, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from property_tracker.models.finance import (
+    Expense,
+    Mortgage,
+    PropertyOwnership,
+    PropertyTransaction,
+    RentalIncome,
+    TransactionType,
+)
+from property_tracker.models.investor import Investor
+from property_tracker.models.property import Property
+from property_tracker.repositories.valuation import ValuationRepository
+
+
+class PortfolioRepository:
+    """
+    Computes the portfolio totals in the database, one row per property or investor
+
+    Every figure is aggregated by its own subquery grouped by property or investor and joined to the properties or
+    investors, so no ORM instances are loaded and the row count of one table never multiplies the sums of another.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def latest_valuations(as_of: datetime.date) -> Select:
+        """
+        The most recent valuation of each property at a date, picked with a ROW_NUMBER window
+        """
+        latest = ValuationRepository.latest_valuations(as_of).subquery()
+        return select(latest.c.property_id, latest.c.valuation_amount.label("latest_valuation"))
+
+    @staticmethod
+    def outstanding_mortgages(group_by, as_of: datetime.date) -> Select:
+        """
+        The balance of the mortgages running at a date, after the monthly payments due by then
+
+        The balance is the closed form of an annuity, the same as ``MortgageCalculator.calculate_balances``: after n of
+        N payments at the monthly rate r, P * ((1 + r)^N - (1 + r)^n) / ((1 + r)^N - 1), and P * (N - n) / N without
+        interest. The first payment is due a month after the start of the mortgage.
+        """
+        months_paid = (as_of.year * 12 + as_of.month) - (
+            extract("year", Mortgage.start_date) * 12 + extract("month", Mortgage.start_date)
+        )
+        months_paid = months_paid - case((extract("day", Mortgage.start_date) > as_of.day, 1), else_=0)
+        term_in_months = 12 * Mortgage.payment_term
+        months_paid = case(
+            (Mortgage.start_date.is_(None), 0), (months_paid > term_in_months, term_in_months), else_=months_paid
+        )
+        growth = 1 + func.coalesce(Mortgage.annual_interest_rate, 0) / 1200.0
+        balance = case(
+            (
+                func.coalesce(Mortgage.annual_interest_rate, 0) == 0,
+                Mortgage.principal * (term_in_months - months_paid) / term_in_months,
+            ),
+            else_=Mortgage.principal
+            * (func.power(growth, term_in_months) - func.power(growth, months_paid))
+            / (func.power(growth, term_in_months) - 1),
+        )
+        return (
+            select(group_by, func.sum(func.coalesce(balance, Mortgage.principal)).label("outstanding_principal"))
+            .where(
+                or_(Mortgage.start_date.is_(None), Mortgage.start_date <= as_of),
+                or_(Mortgage.end_date.is_(None), Mortgage.end_date >= as_of),
+            )
+            .group_by(group_by)
+        )
+
+    @staticmethod
+    def total(group_by, amount, date, label: str, as_of: datetime.date) -> Select:
+        """
+        The sum of the amounts up to a date, for the expenses and the rent collected
+        """
+        return select(group_by, func.sum(amount).label(label)).where(date <= as_of).group_by(group_by)
+
+    def get_property_summaries(self, as_of: Optional[datetime.date] = None, with_valuations: bool = True) -> List[Row]:
+        """
+        Get the totals of each property
+
+        :param as_of: the date of the totals, today by default
+        :param with_valuations: read the latest valuations with a window query, leave them out to take them from the
+            valuation index
+        :return: rows of property_id, address, purchase_cost, latest_valuation, outstanding_principal, expenses,
+            rent_collected and equity, without latest_valuation and equity when with_valuations is false
+        """
+        as_of = as_of or datetime.date.today()
+        purchases = (
+            select(
+                PropertyTransaction.property_id,
+                func.sum(PropertyTransaction.transaction_amount).label("purchase_cost"),
+            )
+            .where(
+                PropertyTransaction.transaction_type == TransactionType.PURCHASE,
+                PropertyTransaction.transaction_date <= as_of,
+            )
+            .group_by(PropertyTransaction.property_id)
+            .subquery()
+        )
+        mortgages = self.outstanding_mortgages(Mortgage.property_id, as_of).subquery()
+        expenses = self.total(Expense.property_id, Expense.amount, Expense.date, "expenses", as_of).subquery()
+        rent = self.total(
+            RentalIncome.property_id, RentalIncome.amount, RentalIncome.date, "rent_collected", as_of
+        ).subquery()
+
+        outstanding_principal = func.coalesce(mortgages.c.outstanding_principal, 0)
+        columns = {
+            "property_id": Property.id,
+            "address": Property.address,
+            "purchase_cost": func.coalesce(purchases.c.purchase_cost, 0),
+            "outstanding_principal": outstanding_principal,
+            "expenses": func.coalesce(expenses.c.expenses, 0),
+            "rent_collected": func.coalesce(rent.c.rent_collected, 0),
+        }
+        if with_valuations:
+            valuations = self.latest_valuations(as_of).subquery()
+            latest_valuation = func.coalesce(valuations.c.latest_valuation, 0)
+            columns = self.with_valuation_columns(columns, latest_valuation, outstanding_principal)
+        statement = (
+            select(*(column.label(name) for name, column in columns.items()))
+            .outerjoin(purchases, purchases.c.property_id == Property.id)
+            .outerjoin(mortgages, mortgages.c.property_id == Property.id)
+            .outerjoin(expenses, expenses.c.property_id == Property.id)
+            .outerjoin(rent, rent.c.property_id == Property.id)
+            .order_by(Property.id)
+        )
+        if with_valuations:
+            statement = statement.outerjoin(valuations, valuations.c.property_id == Property.id)
+        return self.db.execute(statement).all()
+
+    @staticmethod
+    def with_valuation_columns(columns: Dict, latest_valuation, outstanding_principal) -> Dict:
+        """
+        Add the latest valuation and the equity to the columns of a summary, the valuation after the purchase cost
+        """
+        items = list(columns.items())
+        position = list(columns).index("purchase_cost") + 1
+        items.insert(position, ("latest_valuation", latest_valuation))
+        items.append(("equity", latest_valuation - outstanding_principal))
+        return dict(items)
+
+    @staticmethod
+    def ownerships_at(as_of: datetime.date):
+        """
+        The conditions of the ownerships running at a date
+        """
+        return (
+            PropertyOwnership.ownership_start_date <= as_of,
+            or_(PropertyOwnership.ownership_end_date.is_(None), PropertyOwnership.ownership_end_date > as_of),
+        )
+
+    def get_ownership_shares(self, as_of: Optional[datetime.date] = None) -> List[Row]:
+        """
+        Get the share of every property owned by an investor at a date, to weigh the valuations of the index
+
+        :param as_of: the date of the ownerships, today by default
+        :return: rows of investor_id, property_id and share, a fraction
+        """
+        as_of = as_of or datetime.date.today()
+        statement = select(
+            PropertyOwnership.investor_id,
+            PropertyOwnership.property_id,
+            (PropertyOwnership.ownership_share / 100).label("share"),
+        ).where(*self.ownerships_at(as_of))
+        return self.db.execute(statement).all()
+
+    def get_investor_summaries(self, as_of: Optional[datetime.date] = None, with_valuations: bool = True) -> List[Row]:
+        """
+        Get the totals of each investor
+
+        The purchase cost and the latest valuation are the investor's share of the properties they own at the date,
+        the mortgages, expenses and rent are the ones recorded against the investor.
+
+        :param as_of: the date of the totals, today by default
+        :param with_valuations: read the latest valuations with a window query, leave them out to take them from the
+            valuation index
+        :return: rows of investor_id, name, properties, purchase_cost, latest_valuation, outstanding_principal,
+            expenses, rent_collected and equity, without latest_valuation and equity when with_valuations is false
+        """
+        as_of = as_of or datetime.date.today()
+        share = PropertyOwnership.ownership_share / 100
+        ownership_columns = [
+            PropertyOwnership.investor_id,
+            func.count(func.distinct(PropertyOwnership.property_id)).label("properties"),
+            func.sum(share * func.coalesce(PropertyTransaction.transaction_amount, 0)).label("purchase_cost"),
+        ]
+        if with_valuations:
+            valuations = self.latest_valuations(as_of).subquery()
+            ownership_columns.append(
+                func.sum(share * func.coalesce(valuations.c.latest_valuation, 0)).label("latest_valuation")
+            )
+        ownerships = select(*ownership_columns).outerjoin(
+            PropertyTransaction, PropertyTransaction.id == PropertyOwnership.transaction_id
+        )
+        if with_valuations:
+            ownerships = ownerships.outerjoin(valuations, valuations.c.property_id == PropertyOwnership.property_id)
+        ownerships = ownerships.where(*self.ownerships_at(as_of)).group_by(PropertyOwnership.investor_id).subquery()
+        mortgages = self.outstanding_mortgages(Mortgage.investor_id, as_of).subquery()
+        expenses = self.total(Expense.investor_id, Expense.amount, Expense.date, "expenses", as_of).subquery()
+        rent = self.total(
+            RentalIncome.investor_id, RentalIncome.amount, RentalIncome.date, "rent_collected", as_of
+        ).subquery()
+
+        outstanding_principal = func.coalesce(mortgages.c.outstanding_principal, 0)
+        columns = {
+            "investor_id": Investor.id,
+            "name": Investor.first_name + literal(" ") + Investor.last_name,
+            "properties": func.coalesce(ownerships.c.properties, 0),
+            "purchase_cost": func.coalesce(ownerships.c.purchase_cost, 0),
+            "outstanding_principal": outstanding_principal,
+            "expenses": func.coalesce(expenses.c.expenses, 0),
+            "rent_collected": func.coalesce(rent.c.rent_collected, 0),
+        }
+        if with_valuations:
+            latest_valuation = func.coalesce(ownerships.c.latest_valuation, 0)
+            columns = self.with_valuation_columns(columns, latest_valuation, outstanding_principal)
+        statement = (
+            select(*(column.label(name) for name, column in columns.items()))
+            .outerjoin(ownerships, ownerships.c.investor_id == Investor.id)
+            .outerjoin(mortgages, mortgages.c.investor_id == Investor.id)
+            .outerjoin(expenses, expenses.c.investor_id == Investor.id)
+            .outerjoin(rent, rent.c.investor_id == Investor.id)
+            .order_by(Investor.id)
+        )
+        return self.db.execute(statement).all()
@@ -1,6 +1,24 @@
-from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
 
+from sqlalchemy.orm import Session, raiseload, selectinload
+
+from property_tracker.models.finance import PropertyOwnership
 from property_tracker.models.property import Property
+from property_tracker.repositories.frames import read_frame, select_columns
+from property_tracker.repositories.pagination import DEFAULT_BATCH_SIZE, paginate, stream
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# The relationships of a property that get_property_detail can load
+PROPERTY_DETAIL_RELATIONSHIPS = (
+    "valuations",
+    "property_transactions",
+    "ownerships",
+    "mortgages",
+    "expenses",
+    "rental_income",
+)
 
 
 class PropertyRepository:
@@ -16,8 +34,62 @@ class PropertyRepository:
     def get_property(self, property_id: int):
         return self.db.query(Property).filter(Property.id == property_id).first()
 
-    def get_all_properties(self):
-        return self.db.query(Property).all()
+    def get_property_detail(
+        self, property_ids: Sequence[int], include: Optional[Sequence[str]] = None
+    ) -> List[Property]:
+        """
+        Get properties with their related records, in one query per included relationship
+
+        Every included relationship is loaded for all the properties at once with a SELECT ... WHERE property_id IN,
+        and the owners of the ownerships are joined to them, so the number of queries does not grow with the number
+        of properties. The relationships that are not included raise on access instead of lazy loading.
+
+        :param property_ids: the ids of the properties
+        :param include: the relationships to load, from PROPERTY_DETAIL_RELATIONSHIPS, all of them when not given
+        :return: the properties, ordered by id
+        """
+        include = PROPERTY_DETAIL_RELATIONSHIPS if include is None else include
+        unknown = [name for name in include if name not in PROPERTY_DETAIL_RELATIONSHIPS]
+        if unknown:
+            raise ValueError(f"Unknown property relationships: {', '.join(unknown)}")
+
+        options = []
+        for name in include:
+            loader = selectinload(getattr(Property, name))
+            if name == "ownerships":
+                loader = loader.joinedload(PropertyOwnership.investor)
+            options.append(loader)
+        return (
+            self.db.query(Property)
+            .options(*options, raiseload("*"))
+            .filter(Property.id.in_(property_ids))
+            .order_by(Property.id)
+            .all()
+        )
+
+    def get_all_properties(
+        self, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Property]:
+        return paginate(self.db.query(Property), Property.id, limit, offset, after_id).all()
+
+    def get_properties_frame(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> "pd.DataFrame":
+        statement, enums = select_columns(Property, columns)
+        return read_frame(self.db, paginate(statement, Property.id, limit, offset, after_id), enums)
+
+    def iter_properties(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Property]:
+        return stream(self.db.query(Property), Property.id, limit, offset, after_id, batch_size)
 
     def update_property(self, property_id: int, address: str):
         inv_property = self.get_property(property_id)
@@ -0,0 +1,105 @@
+import datetime
+from typing import Dict, List
+
+from sqlalchemy import Date, func, literal, select, true, union_all, update
+from sqlalchemy.orm import Session
+
+from property_tracker.models.finance import PropertyMonthlyLedger, RentalIncome
+from property_tracker.models.property import Property, Status
+from property_tracker.repositories.ledger import LedgerRepository, dialect_insert
+
+
+class RentRepository:
+    """
+    Writes the rent of many properties and months in set-based statements
+
+    Rent rows are unique per property and period, generating rent only inserts the missing rows and recording a
+    payment overwrites the payment of its period, so both can be rerun without duplicating rows.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.ledger = LedgerRepository(db)
+
+    def generate_rent(self, periods: List[datetime.date]) -> int:
+        """
+        Insert the expected rent of every rented property with a monthly rent, for every period, in one statement
+
+        :param periods: the first days of the months to generate
+        :return: the number of rent rows inserted, the periods already generated are skipped
+        """
+        if not periods:
+            return 0
+
+        months = union_all(*(select(literal(period, Date).label("period")) for period in periods)).subquery("months")
+        rented = (
+            select(Property.id, months.c.period, Property.monthly_rent)
+            .join(months, true())
+            .where(Property.status == Status.RENTED, Property.monthly_rent.is_not(None))
+        )
+        statement = (
+            dialect_insert(self.db, RentalIncome)
+            .from_select(["property_id", "period", "expected_amount"], rented)
+            .on_conflict_do_nothing(index_elements=["property_id", "period"])
+        )
+        inserted = self.db.execute(statement).rowcount
+        self.db.commit()
+        return inserted
+
+    def record_payments(self, payments: List[Dict]):
+        """
+        Record received rent payments in one statement, and refresh the rent collected in the ledger
+
+        The rent collected of the ledger is recomputed for the properties of the payments instead of incremented, so
+        recording the same payments twice does not count them twice.
+
+        :param payments: dictionaries with a property_id, a period, an amount, a date and optionally an investor_id
+        """
+        if not payments:
+            return
+
+        self.upsert_payments(payments)
+        self.db.commit()
+
+    def upsert_payments(self, payments: List[Dict], accumulate: bool = False):
+        """
+        Insert or overwrite the payments of their periods and refresh the rent collected in the ledger, without
+        committing
+
+        :param payments: dictionaries with a property_id, a period, an amount, a date and optionally an investor_id
+        :param accumulate: add the amounts to the rent already paid for their periods instead of replacing it
+        """
+        statement = dialect_insert(self.db, RentalIncome)
+        amount = statement.excluded.amount
+        if accumulate:
+            amount = func.coalesce(RentalIncome.amount, 0) + amount
+        statement = statement.on_conflict_do_update(
+            index_elements=["property_id", "period"],
+            set_={
+                "amount": amount,
+                "date": statement.excluded.date,
+                "investor_id": func.coalesce(statement.excluded.investor_id, RentalIncome.investor_id),
+            },
+        )
+        self.db.execute(statement, [{"investor_id": None, **payment} for payment in payments])
+        self.refresh_ledger({payment["property_id"] for payment in payments})
+
+    def refresh_ledger(self, property_ids):
+        """
+        Recompute the rent collected in the ledger of properties from their rent payments
+        """
+        property_ids = list(property_ids)
+        self.db.execute(
+            update(PropertyMonthlyLedger)
+            .where(PropertyMonthlyLedger.property_id.in_(property_ids))
+            .values(rent_collected=0)
+        )
+        month = self.ledger.month_start(RentalIncome.date).label("month")
+        totals = self.db.execute(
+            select(RentalIncome.property_id, month, func.sum(RentalIncome.amount))
+            .where(RentalIncome.property_id.in_(property_ids), RentalIncome.date.is_not(None))
+            .group_by(RentalIncome.property_id, month)
+        )
+        self.ledger.add(
+            {"property_id": property_id, "date": month, "rent_collected": total} for property_id, month, total in totals
+        )
@@ -0,0 +1,89 @@
+import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Row, Select, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from property_tracker.models.finance import Valuation
+
+# The key of the session info holding the properties whose valuations were written in the current transaction
+CHANGED_VALUATIONS = "changed_valuation_property_ids"
+
+
+def mark_valuations_changed(db: Session, property_ids: Iterable[Optional[int]]):
+    """
+    Record that the valuations of properties are written in the transaction of a session
+
+    The in-process valuation index drops the entries of these properties once the transaction commits.
+    """
+    db.info.setdefault(CHANGED_VALUATIONS, set()).update(
+        property_id for property_id in property_ids if property_id is not None
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def mark_flushed_valuations(session: Session, flush_context, instances):
+    # Valuations written through the ORM anywhere are marked here, bulk inserts mark their rows themselves
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Valuation):
+            history = inspect(instance).attrs.property_id.history
+            mark_valuations_changed(session, (instance.property_id, *history.deleted))
+
+
+class ValuationRepository:
+    """
+    Reads the valuations of the properties, the latest ones or the ones at a date, for all properties in one query
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def latest_valuations(as_of: Optional[datetime.date] = None) -> Select:
+        """
+        The most recent valuation of each property at a date, picked with a ROW_NUMBER window
+
+        Of the valuations of the same day, the last one recorded wins.
+
+        :param as_of: the date of the valuations, the latest valuations when not given
+        :return: a select of property_id, valuation_date and valuation_amount
+        """
+        ranked = select(
+            Valuation.property_id,
+            Valuation.valuation_date,
+            Valuation.valuation_amount,
+            func.row_number()
+            .over(partition_by=Valuation.property_id, order_by=(Valuation.valuation_date.desc(), Valuation.id.desc()))
+            .label("rank"),
+        )
+        if as_of is not None:
+            ranked = ranked.where(Valuation.valuation_date <= as_of)
+        ranked = ranked.subquery()
+        return select(ranked.c.property_id, ranked.c.valuation_date, ranked.c.valuation_amount).where(
+            ranked.c.rank == 1
+        )
+
+    def get_latest_valuations(self, as_of: Optional[datetime.date] = None) -> List[Row]:
+        """
+        Get the valuation of every valued property at a date, in one query
+
+        :param as_of: the date of the valuations, the latest valuations when not given
+        :return: rows of property_id, valuation_date and valuation_amount, ordered by property
+        """
+        latest = self.latest_valuations(as_of).subquery()
+        return self.db.execute(select(latest).order_by(latest.c.property_id)).all()
+
+    def get_valuation_history(self, property_ids: Optional[Iterable[int]] = None) -> List[Row]:
+        """
+        Get the valuations of properties in date order, read from the (property_id, valuation_date) index
+
+        :param property_ids: the ids of the properties, all properties when not given
+        :return: rows of property_id, valuation_date and valuation_amount, ordered by property, date and id
+        """
+        statement = select(Valuation.property_id, Valuation.valuation_date, Valuation.valuation_amount).where(
+            Valuation.property_id.is_not(None)
+        )
+        if property_ids is not None:
+            statement = statement.where(Valuation.property_id.in_(list(property_ids)))
+        statement = statement.order_by(Valuation.property_id, Valuation.valuation_date, Valuation.id)
+        return self.db.execute(statement).all()
@@ -1,3 +1,22 @@
-from .finance import FinanceService
-from .investor import InvestorService
-from .property import PropertyService
+import importlib
+
+# Services are imported on first access so that a command only pays for the dependencies of the services it uses,
+# e.g. listing investors does not import pandas through the simulation services.
+SERVICES = {
+    "FinanceService": ".finance",
+    "ImportService": ".importer",
+    "InvestorService": ".investor",
+    "LedgerService": ".ledger",
+    "PortfolioService": ".portfolio",
+    "PropertyService": ".property",
+    "RentService": ".rent",
+    "ValuationService": ".valuation",
+}
+
+__all__ = list(SERVICES)
+
+
+def __getattr__(name: str):
+    if name in SERVICES:
+        return getattr(importlib.import_module(SERVICES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from enum import Enum as PyEnum
+from typing import Any, Callable, Hashable, NamedTuple
+
+import pandas as pd
+
+# With Copy-on-Write, always on from pandas 3, a shallow copy of a DataFrame is a snapshot that never sees the writes
+# made to another copy, so cached frames can be shared without copying their data
+COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3 or pd.options.mode.copy_on_write is True
+
+
+class CacheInfo(NamedTuple):
+    """
+    Represents the statistics of a cache
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def normalize_key(*values: Any) -> tuple:
+    """
+    Normalize the inputs of a cached computation into a hashable key
+
+    Numbers are compared as floats so that 250000 and 250000.0 share an entry, and enums by their value so that
+    the investor type enums of the models and of the simulation share an entry.
+
+    :param values: the inputs of the computation
+    :return: the cache key
+    """
+    key = []
+    for value in values:
+        if isinstance(value, PyEnum):
+            value = value.value
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        elif isinstance(value, dict):
+            value = normalize_key(*sorted(value.items()))
+        elif isinstance(value, (list, tuple)):
+            value = normalize_key(*value)
+        key.append(value)
+    return tuple(key)
+
+
+def share_cached_value(value: Any) -> Any:
+    """
+    Share the DataFrames in a cached value so that callers cannot modify the cached entry
+
+    Under Copy-on-Write a frame is shared as a shallow copy, which costs no copy of its data: the data is only copied
+    by a caller that writes to its frame. Without Copy-on-Write the frame is copied.
+
+    :param value: the cached value, a DataFrame or a tuple that may contain DataFrames
+    :return: the shared value
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=not COPY_ON_WRITE)
+    if isinstance(value, tuple):
+        return tuple(share_cached_value(item) for item in value)
+    return value
+
+
+class LRUCache:
+    """
+    A bounded cache that evicts the least recently used entry when it is full
+
+    Values go through share_cached_value on the way in and out, so neither the caller that computed a value nor later
+    callers can corrupt the cached entry, and under Copy-on-Write a hit copies no data. The cache is safe to share
+    between threads.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get the value of a key, computing and storing it on a miss
+
+        :param key: the normalized inputs of the computation
+        :param compute: a function computing the value
+        :return: the cached value, shared with share_cached_value
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return share_cached_value(self._entries[key])
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = share_cached_value(value)
+            self._entries.move_to_end(key)
+            self._evict()
+        return value
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximum number of entries, evicting the least recently used entries if needed
+
+        :param maxsize: the maximum number of entries
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Get the statistics of the cache
+
+        :return: the hits, misses, maximum size and current size of the cache
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
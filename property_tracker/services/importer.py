@@ -0,0 +1,171 @@
+import csv
+import datetime
+import json
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, model_validator
+
+from property_tracker.models import Base
+from property_tracker.models.finance import Expense, Valuation, ValuationType
+from property_tracker.models.investor import Investor, InvestorType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import ImportRepository
+
+
+class ImportRow(BaseModel):
+    """
+    Base class of the rows of an import file, empty CSV fields are read as missing values
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def empty_fields_to_none(cls, values):
+        if isinstance(values, dict):
+            return {field: None if value == "" else value for field, value in values.items()}
+        return values
+
+
+class PropertyRow(ImportRow):
+    address: str
+    postcode: str
+    city: str
+    description: Optional[str] = None
+    no_of_bedrooms: int
+    no_of_bathrooms: int
+    sqm: float
+    floor: int
+    furnished: bool
+    property_type: PropertyType
+    status: Status
+    monthly_rent: Optional[float] = None
+
+
+class InvestorRow(ImportRow):
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+    address: str
+    investor_type: InvestorType
+    company_name: Optional[str] = None
+
+
+class ExpenseRow(ImportRow):
+    description: str
+    amount: float
+    date: datetime.date
+    investor_id: int
+    property_id: int
+
+
+class ValuationRow(ImportRow):
+    valuation_date: datetime.date
+    valuation_amount: float
+    valuation_type: Optional[ValuationType] = None
+    property_id: int
+
+
+IMPORT_ENTITIES: Dict[str, Tuple[Type[ImportRow], Type[Base]]] = {
+    "properties": (PropertyRow, Property),
+    "investors": (InvestorRow, Investor),
+    "expenses": (ExpenseRow, Expense),
+    "valuations": (ValuationRow, Valuation),
+}
+
+
+@dataclass
+class ImportResult:
+    """
+    Represents the outcome of an import
+    """
+
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    elapsed_seconds: float = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds else 0
+
+
+def read_rows(path: Path) -> Iterator[Dict]:
+    """
+    Stream the rows of a CSV file, or of a JSON Lines file for any other extension
+
+    :param path: the path of the file
+    :return: an iterator over the rows as dictionaries
+    """
+    with open(path, newline="") as file:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ImportService:
+    """
+    Service class for bulk imports of properties, investors, expenses and valuations
+    """
+
+    def __init__(self, import_repository: ImportRepository):
+        self.import_repository = import_repository
+
+    def import_file(
+        self, entity: str, path: Path, rejects_path: Optional[Path] = None, chunk_size: int = 1000
+    ) -> ImportResult:
+        """
+        Import a CSV or JSON Lines file in chunks
+
+        Rows are validated, then each chunk is inserted with one executemany and one commit. Rows that fail validation
+        or violate a database constraint are written with their errors to the rejects file.
+
+        :param entity: the kind of rows in the file, one of IMPORT_ENTITIES
+        :param path: the path of the file
+        :param rejects_path: the path of the rejects file, next to the file with a .rejects.jsonl suffix by default
+        :param chunk_size: the number of rows inserted at once
+        :return: the ImportResult
+        """
+        if entity not in IMPORT_ENTITIES:
+            raise ValueError(f"Unknown entity {entity}, expected one of {', '.join(IMPORT_ENTITIES)}")
+        row_schema, model = IMPORT_ENTITIES[entity]
+        rejects_path = rejects_path or path.with_suffix(".rejects.jsonl")
+
+        result = ImportResult()
+        start = time.perf_counter()
+        rows = enumerate(read_rows(path), start=1)
+        with open(rejects_path, "w") as rejects:
+            while chunk := list(islice(rows, chunk_size)):
+                valid_rows = []
+                for line_number, row in chunk:
+                    try:
+                        valid_rows.append((line_number, row, row_schema.model_validate(row).model_dump()))
+                    except ValidationError as error:
+                        self.write_reject(rejects, line_number, row, error.errors(include_url=False))
+
+                rejected = self.import_repository.bulk_insert(model, [values for _, _, values in valid_rows])
+                for position in rejected:
+                    line_number, row, _ = valid_rows[position]
+                    self.write_reject(rejects, line_number, row, "Violates a database constraint")
+
+                result.rows_read += len(chunk)
+                result.rows_imported += len(valid_rows) - len(rejected)
+                result.rows_rejected += len(chunk) - len(valid_rows) + len(rejected)
+
+        if not result.rows_rejected:
+            rejects_path.unlink()
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def write_reject(rejects, line_number: int, row: Dict, errors):
+        """
+        Write a rejected row and the reason it was rejected to the rejects file
+        """
+        rejects.write(json.dumps({"row": line_number, "values": row, "errors": errors}, default=str) + "\n")
@@ -53,13 +53,40 @@ class InvestorService:
 
         return self.investor_repository.get_investor(investor_id)
 
-    def get_all_investors(self):
+    def get_all_investors(self, limit: int = None, offset: int = None, after_id: int = None):
         """
-        Get all investors
+        Get all investors, or a page of them
+        :param limit: int, the maximum number of investors
+        :param offset: int, the number of investors to skip
+        :param after_id: int, only return the investors with a greater id
         :return: List[Investor]
         """
 
-        return self.investor_repository.get_all_investors()
+        return self.investor_repository.get_all_investors(limit, offset, after_id)
+
+    def get_investors_frame(self, columns=None, limit: int = None, offset: int = None, after_id: int = None):
+        """
+        Get the columns of all investors, or of a page of them, as a DataFrame, without loading the investors
+        :param columns: List[str], the names of the columns, all columns when not given
+        :param limit: int, the maximum number of investors
+        :param offset: int, the number of investors to skip
+        :param after_id: int, only return the investors with a greater id
+        :return: pd.DataFrame
+        """
+
+        return self.investor_repository.get_investors_frame(columns, limit, offset, after_id)
+
+    def iter_investors(self, limit: int = None, offset: int = None, after_id: int = None, batch_size: int = 1000):
+        """
+        Iterate over the investors in batches, without loading them all into memory
+        :param limit: int, the maximum number of investors
+        :param offset: int, the number of investors to skip
+        :param after_id: int, only return the investors with a greater id
+        :param batch_size: int, the number of investors fetched at once
+        :return: Iterator[Investor]
+        """
+
+        return self.investor_repository.iter_investors(limit, offset, after_id, batch_size)
 
     def update_investor(self, investor_id: int, name: str, contact_details: str, portfolio_value: float):
         """
@@ -0,0 +1,77 @@
+import datetime
+from typing import Dict, List, Optional
+
+from dateutil.relativedelta import relativedelta
+
+from property_tracker.models.finance import Mortgage, PropertyMonthlyLedger
+from property_tracker.repositories import LedgerRepository
+from property_tracker.services.simulate_v2 import MortgageCalculator
+
+
+def mortgage_payment_entries(mortgage: Mortgage) -> List[Dict]:
+    """
+    Get the ledger entries of the monthly payments of a mortgage, the first one a month after its start
+
+    The whole schedule is booked when the mortgage is written, the ledger is read up to a date to leave out the
+    payments still to come.
+    """
+    monthly_payment = MortgageCalculator.calculate_monthly_payment(
+        mortgage.principal, mortgage.payment_term, mortgage.annual_interest_rate
+    )
+    return [
+        {
+            "property_id": mortgage.property_id,
+            "date": mortgage.start_date + relativedelta(months=month),
+            "mortgage_payments": monthly_payment,
+        }
+        for month in range(1, 12 * mortgage.payment_term + 1)
+    ]
+
+
+class LedgerService:
+    """
+    Service class for the monthly cash flow ledger of the properties
+    """
+
+    def __init__(self, ledger_repository: LedgerRepository):
+        self.ledger_repository = ledger_repository
+
+    def get_ledger(
+        self,
+        property_id: int,
+        start_month: datetime.date = None,
+        end_month: datetime.date = None,
+        as_of: datetime.date = None,
+    ) -> List[PropertyMonthlyLedger]:
+        """
+        Get the monthly ledger of a property
+        :param property_id: int
+        :param start_month: date, the first month, from the first recorded month by default
+        :param end_month: date, the last month, the month of as_of by default
+        :param as_of: date, the date of the ledger when no end month is given, today by default, the scheduled mortgage
+            payments of the later months are left out
+        :return: List[PropertyMonthlyLedger]
+        """
+
+        end_month = end_month or as_of or datetime.date.today()
+        return self.ledger_repository.get_ledger(property_id, start_month, end_month)
+
+    def rebuild(self, property_id: int = None) -> int:
+        """
+        Rebuild the ledger from the expenses, rent payments, purchases and mortgages, in a single transaction
+        :param property_id: int, rebuild the ledger of this property only, of every property by default
+        :return: int, the number of ledger rows
+        """
+
+        db = self.ledger_repository.db
+        try:
+            self.ledger_repository.clear(property_id)
+            self.ledger_repository.add(self.ledger_repository.cash_flow_entries(property_id))
+            for mortgage in self.ledger_repository.get_mortgages(property_id):
+                self.ledger_repository.add(mortgage_payment_entries(mortgage))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return self.ledger_repository.count(property_id)
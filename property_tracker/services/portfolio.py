@@ -0,0 +1,128 @@
+import datetime
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from sqlalchemy import Row
+
+from property_tracker.repositories import PortfolioRepository
+from property_tracker.services.valuation import ValuationService
+
+PORTFOLIO_TOTALS = (
+    "purchase_cost",
+    "latest_valuation",
+    "outstanding_principal",
+    "expenses",
+    "rent_collected",
+    "equity",
+)
+
+
+class PropertySummary(NamedTuple):
+    property_id: int
+    address: str
+    purchase_cost: float
+    latest_valuation: float
+    outstanding_principal: float
+    expenses: float
+    rent_collected: float
+    equity: float
+
+
+class InvestorSummary(NamedTuple):
+    investor_id: int
+    name: str
+    properties: int
+    purchase_cost: float
+    latest_valuation: float
+    outstanding_principal: float
+    expenses: float
+    rent_collected: float
+    equity: float
+
+
+class PortfolioService:
+    """
+    Service class for the portfolio totals
+
+    With a valuation service the latest valuations come from its in-memory index, and the database only adds up the
+    purchases, mortgages, expenses and rent. Without one they are picked in the database with a window query, which is
+    what long running readers such as the API and the frontend use, since the index does not see the writes of other
+    processes.
+    """
+
+    def __init__(self, portfolio_repository: PortfolioRepository, valuation_service: Optional[ValuationService] = None):
+        self.portfolio_repository = portfolio_repository
+        self.valuation_service = valuation_service
+
+    def get_valuation_amounts(self, as_of: datetime.date) -> Dict[int, float]:
+        """
+        Get the latest valuation amount of every property at a date, from the valuation index
+        :param as_of: date
+        :return: Dict[int, float], by property id
+        """
+
+        return {
+            property_id: valuation.valuation_amount
+            for property_id, valuation in self.valuation_service.get_valuations(as_of).items()
+        }
+
+    def get_property_summaries(self, as_of: Optional[datetime.date] = None) -> List[Union[Row, PropertySummary]]:
+        """
+        Get the totals of each property
+        :param as_of: date, today by default
+        :return: List[Row] or List[PropertySummary] when the valuations come from the index
+        """
+
+        if self.valuation_service is None:
+            return self.portfolio_repository.get_property_summaries(as_of)
+
+        as_of = as_of or datetime.date.today()
+        valuations = self.get_valuation_amounts(as_of)
+        summaries = []
+        for row in self.portfolio_repository.get_property_summaries(as_of, with_valuations=False):
+            latest_valuation = valuations.get(row.property_id, 0)
+            summaries.append(
+                PropertySummary(
+                    **row._asdict(),
+                    latest_valuation=latest_valuation,
+                    equity=latest_valuation - row.outstanding_principal,
+                )
+            )
+        return summaries
+
+    def get_investor_summaries(self, as_of: Optional[datetime.date] = None) -> List[Union[Row, InvestorSummary]]:
+        """
+        Get the totals of each investor
+        :param as_of: date, today by default
+        :return: List[Row] or List[InvestorSummary] when the valuations come from the index
+        """
+
+        if self.valuation_service is None:
+            return self.portfolio_repository.get_investor_summaries(as_of)
+
+        as_of = as_of or datetime.date.today()
+        valuations = self.get_valuation_amounts(as_of)
+        investor_valuations = defaultdict(float)
+        for ownership in self.portfolio_repository.get_ownership_shares(as_of):
+            investor_valuations[ownership.investor_id] += ownership.share * valuations.get(ownership.property_id, 0)
+        summaries = []
+        for row in self.portfolio_repository.get_investor_summaries(as_of, with_valuations=False):
+            latest_valuation = investor_valuations.get(row.investor_id, 0)
+            summaries.append(
+                InvestorSummary(
+                    **row._asdict(),
+                    latest_valuation=latest_valuation,
+                    equity=latest_valuation - row.outstanding_principal,
+                )
+            )
+        return summaries
+
+    @staticmethod
+    def get_totals(summaries: List[Row]) -> Dict[str, float]:
+        """
+        Add up the totals of the property summaries into the totals of the portfolio
+        :param summaries: List[Row], the property summaries
+        :return: Dict[str, float]
+        """
+
+        return {column: sum(getattr(summary, column) for summary in summaries) for column in PORTFOLIO_TOTALS}
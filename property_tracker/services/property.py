@@ -1,6 +1,50 @@
+import datetime
+from typing import Dict, List
+
 from property_tracker.models.property import Property, PropertyType, Status
 from property_tracker.repositories import PropertyRepository
 
+# The columns shown for each relationship of the property detail, sorted by the first one, dotted for related records
+PROPERTY_DETAIL_COLUMNS = {
+    "valuations": ("valuation_date", "valuation_type", "valuation_amount"),
+    "property_transactions": ("transaction_date", "transaction_type", "transaction_amount", "cash_payment", "notes"),
+    "ownerships": (
+        "ownership_start_date",
+        "ownership_end_date",
+        "investor.first_name",
+        "investor.last_name",
+        "ownership_share",
+    ),
+    "mortgages": ("start_date", "end_date", "principal", "annual_interest_rate", "payment_term"),
+    "expenses": ("date", "description", "amount"),
+    "rental_income": ("period", "date", "expected_amount", "amount"),
+}
+
+
+def detail_rows(inv_property: Property, relationship: str) -> List[Dict]:
+    """
+    Get the rows of a loaded relationship of a property, with the values of the enums, sorted by date
+
+    :param inv_property: a property from get_property_detail
+    :param relationship: the name of the relationship, a key of PROPERTY_DETAIL_COLUMNS
+    :return: a dictionary of the columns of every related record
+    """
+    columns = PROPERTY_DETAIL_COLUMNS[relationship]
+    records = sorted(
+        getattr(inv_property, relationship),
+        key=lambda record: (getattr(record, columns[0]) or datetime.date.min, record.id),
+    )
+    rows = []
+    for record in records:
+        row = {}
+        for column in columns:
+            value = record
+            for name in column.split("."):
+                value = None if value is None else getattr(value, name)
+            row[column] = getattr(value, "value", value)
+        rows.append(row)
+    return rows
+
 
 class PropertyService:
     """
@@ -23,6 +67,7 @@ class PropertyService:
         furnished: bool,
         property_type: PropertyType,
         status: Status,
+        monthly_rent: float = None,
     ):
         """
         Create a new property
@@ -37,6 +82,7 @@ class PropertyService:
         :param furnished: bool
         :param property_type: Enum (PropertyType)
         :param status: Enum (Status)
+        :param monthly_rent: float
         :return: Property
         """
 
@@ -52,6 +98,7 @@ class PropertyService:
             furnished=furnished,
             property_type=property_type,
             status=status,
+            monthly_rent=monthly_rent,
         )
 
         return self.property_repository.add_property(inv_property)
@@ -65,13 +112,50 @@ class PropertyService:
 
         return self.property_repository.get_property(property_id)
 
-    def get_all_properties(self):
+    def get_property_detail(self, property_ids, include=None):
+        """
+        Get properties with their valuations, transactions, ownerships, mortgages, expenses and rental income
+        :param property_ids: List[int]
+        :param include: List[str], the relationships to load, all of them when not given
+        :return: List[Property]
+        """
+
+        return self.property_repository.get_property_detail(property_ids, include)
+
+    def get_all_properties(self, limit: int = None, offset: int = None, after_id: int = None):
         """
-        Get all properties
+        Get all properties, or a page of them
+        :param limit: int, the maximum number of properties
+        :param offset: int, the number of properties to skip
+        :param after_id: int, only return the properties with a greater id
         :return: List[Property]
         """
 
-        return self.property_repository.get_all_properties()
+        return self.property_repository.get_all_properties(limit, offset, after_id)
+
+    def get_properties_frame(self, columns=None, limit: int = None, offset: int = None, after_id: int = None):
+        """
+        Get the columns of all properties, or of a page of them, as a DataFrame, without loading the properties
+        :param columns: List[str], the names of the columns, all columns when not given
+        :param limit: int, the maximum number of properties
+        :param offset: int, the number of properties to skip
+        :param after_id: int, only return the properties with a greater id
+        :return: pd.DataFrame
+        """
+
+        return self.property_repository.get_properties_frame(columns, limit, offset, after_id)
+
+    def iter_properties(self, limit: int = None, offset: int = None, after_id: int = None, batch_size: int = 1000):
+        """
+        Iterate over the properties in batches, without loading them all into memory
+        :param limit: int, the maximum number of properties
+        :param offset: int, the number of properties to skip
+        :param after_id: int, only return the properties with a greater id
+        :param batch_size: int, the number of properties fetched at once
+        :return: Iterator[Property]
+        """
+
+        return self.property_repository.iter_properties(limit, offset, after_id, batch_size)
 
     def delete_property(self, property_id: int):
         """
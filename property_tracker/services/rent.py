@@ -0,0 +1,109 @@
+import datetime
+import time
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional
+
+from dateutil.relativedelta import relativedelta
+from pydantic import ValidationError, field_validator
+
+from property_tracker.repositories import RentRepository
+from property_tracker.services.importer import ImportResult, ImportRow, ImportService, read_rows
+
+
+def month_periods(start: datetime.date, end: datetime.date) -> List[datetime.date]:
+    """
+    Get the first days of the months from the month of a start date to the month of an end date, inclusive
+    """
+    period = start.replace(day=1)
+    periods = []
+    while period <= end:
+        periods.append(period)
+        period += relativedelta(months=1)
+    return periods
+
+
+class RentPaymentRow(ImportRow):
+    property_id: int
+    period: datetime.date
+    amount: float
+    date: datetime.date
+    investor_id: Optional[int] = None
+
+    @field_validator("period", mode="before")
+    @classmethod
+    def month_to_first_day(cls, value):
+        # periods are months, given as YYYY-MM or as any date in the month
+        if isinstance(value, str) and len(value) == 7:
+            value = f"{value}-01"
+        return value
+
+    @field_validator("period")
+    @classmethod
+    def first_day_of_month(cls, value: datetime.date) -> datetime.date:
+        return value.replace(day=1)
+
+
+class RentService:
+    """
+    Service class for the rent of many properties at once
+    """
+
+    def __init__(self, rent_repository: RentRepository):
+        self.rent_repository = rent_repository
+
+    def generate_rent(self, start: datetime.date, end: datetime.date) -> int:
+        """
+        Generate the expected monthly rent of every rented property from the month of start to the month of end
+        :param start: date
+        :param end: date
+        :return: int, the number of rent rows generated, the months already generated are skipped
+        """
+
+        if end < start:
+            raise ValueError("The end of the range is before its start")
+        return self.rent_repository.generate_rent(month_periods(start, end))
+
+    def record_payments_file(
+        self, path: Path, rejects_path: Optional[Path] = None, chunk_size: int = 1000
+    ) -> ImportResult:
+        """
+        Record the rent payments of a CSV or JSON Lines file, in chunks
+
+        Each row has a property_id, a period (YYYY-MM), an amount, a date and optionally an investor_id. Recording a
+        payment for a period that already has one replaces it, so a file can be recorded again after a correction.
+        Invalid rows are written with their errors to the rejects file.
+
+        :param path: Path, the file of payments
+        :param rejects_path: Path, next to the file with a .rejects.jsonl suffix by default
+        :param chunk_size: int, the number of payments recorded at once
+        :return: ImportResult
+        """
+
+        rejects_path = rejects_path or path.with_suffix(".rejects.jsonl")
+        result = ImportResult()
+        start = time.perf_counter()
+        rows = enumerate(read_rows(path), start=1)
+        with open(rejects_path, "w") as rejects:
+            while chunk := list(islice(rows, chunk_size)):
+                payments = {}
+                valid_rows = 0
+                for line_number, row in chunk:
+                    try:
+                        payment = RentPaymentRow.model_validate(row).model_dump()
+                    except ValidationError as error:
+                        ImportService.write_reject(rejects, line_number, row, error.errors(include_url=False))
+                        continue
+                    valid_rows += 1
+                    # the last payment of a period in the file wins, as it would across files
+                    payments[payment["property_id"], payment["period"]] = payment
+
+                self.rent_repository.record_payments(list(payments.values()))
+                result.rows_read += len(chunk)
+                result.rows_imported += valid_rows
+                result.rows_rejected += len(chunk) - valid_rows
+
+        if not result.rows_rejected:
+            rejects_path.unlink()
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
@@ -1,7 +1,10 @@
 from enum import Enum as PyEnum
 
+import numpy as np
 import pandas as pd
 
+from property_tracker.services.simulate_v2 import MortgageCalculator, StampDutyCalculator
+
 
 class InvestorType(PyEnum):
     """
@@ -18,32 +21,7 @@ def calculate_stamp_duty(value, investor_type: InvestorType):
     Calculate the stamp duty for a property purchase
     """
 
-    # Initialize the total stamp duty
-    total_duty = 0
-
-    # Determine the rate based on ownership type
-    if investor_type == InvestorType.SOLE_TRADER:
-        if value <= 250000:
-            total_duty += value * 0.03
-        elif value <= 925000:
-            total_duty += 250000 * 0.03 + (value - 250000) * 0.08
-        elif value <= 1500000:
-            total_duty += 250000 * 0.03 + 675000 * 0.08 + (value - 925000) * 0.13
-        else:
-            total_duty += 250000 * 0.03 + 675000 * 0.08 + 575000 * 0.13 + (value - 1500000) * 0.15
-    elif investor_type == InvestorType.LIMITED_COMPANY:
-        if value <= 125000:
-            total_duty += value * 0.03
-        elif value <= 250000:
-            total_duty += 125000 * 0.03 + (value - 125000) * 0.05
-        elif value <= 925000:
-            total_duty += 125000 * 0.03 + 125000 * 0.05 + (value - 250000) * 0.08
-        elif value <= 1500000:
-            total_duty += 125000 * 0.03 + 125000 * 0.05 + 675000 * 0.08 + (value - 925000) * 0.13
-        else:
-            total_duty += 125000 * 0.03 + 125000 * 0.05 + 675000 * 0.08 + 575000 * 0.13 + (value - 1500000) * 0.15
-
-    return total_duty
+    return StampDutyCalculator.calculate_stamp_duty(value, investor_type)
 
 
 class SimulationService:
@@ -59,11 +37,7 @@ class SimulationService:
         :param annual_interest_rate: the annual interest rate
         """
 
-        term_in_months = 12 * payment_term
-        monthly_interest_rate = annual_interest_rate / 1200
-        monthly_payment = principal * monthly_interest_rate / (1 - (1 + monthly_interest_rate) ** -term_in_months)
-
-        return monthly_payment
+        return MortgageCalculator.calculate_monthly_payment(principal, payment_term, annual_interest_rate)
 
     @staticmethod
     def mortage_calculator(principal, payment_term, annual_interest_rate):
@@ -75,24 +49,17 @@ class SimulationService:
         :param annual_interest_rate: the annual interest rate
         """
 
-        term_in_months = 12 * payment_term
-        monthly_interest_rate = annual_interest_rate / 1200
-        monthly_payment = SimulationService.get_monthly_payment(principal, payment_term, annual_interest_rate)
-
-        # create a payment schedule
-        balance = principal
-        payments = []
-        for month in range(1, term_in_months + 1):
-            interest = balance * monthly_interest_rate
-            principal_payment = monthly_payment - interest
-            balance -= principal_payment
-            payments.append((month, interest, principal_payment, balance))
-
-        payments = pd.DataFrame(payments, columns=["Month", "Interest", "Principal", "Balance"])
-        # make the dataframe annual
-        payments["Year"] = payments["Month"] // 12 + 1
-        payments = (
-            payments.groupby("Year").agg({"Interest": "sum", "Principal": "sum", "Balance": "last"}).reset_index()
+        interest, principal_payment, balance = MortgageCalculator.aggregate_to_years(
+            *MortgageCalculator.amortize(principal, payment_term, annual_interest_rate)
+        )
+
+        payments = pd.DataFrame(
+            {
+                "Year": np.arange(1, len(balance) + 1),
+                "Interest": interest,
+                "Principal": principal_payment,
+                "Balance": balance,
+            }
         )
         payments["Total Payment"] = payments["Interest"] + payments["Principal"]
         payments["Cumulative Interest"] = payments["Interest"].cumsum()
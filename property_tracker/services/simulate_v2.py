@@ -1,9 +1,17 @@
-from dataclasses import dataclass
+import inspect
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
 from enum import Enum as PyEnum
-from typing import Dict, List, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from property_tracker.profiling import timed_span
+from property_tracker.services.cache import LRUCache, normalize_key
+
 
 class InvestorType(PyEnum):
     """
@@ -21,6 +29,13 @@ STAMP_DUTY_RULES: Dict[InvestorType, List[Tuple[int, float]]] = {
 }
 PROPERTY_MANAGEMENT_CUT = 0.1
 REPAIRS_AND_MAINTENANCE_CUT = 0.05
+WEEKS_PER_YEAR = 52
+MONTE_CARLO_PERCENTILES = (5, 50, 95)
+
+# Shared caches of the simulation services, resize them with ``LRUCache.resize``
+PAYMENT_SCHEDULE_CACHE = LRUCache(maxsize=128)
+STAMP_DUTY_CACHE = LRUCache(maxsize=1024)
+SIMULATION_CACHE = LRUCache(maxsize=128)
 
 
 @dataclass
@@ -78,6 +93,39 @@ class InvestmentDetails:
         return self.down_payment + stamp_duty + self.legal_fees + self.refurbishment_cost + self.furnishing_cost
 
 
+@dataclass
+class PaymentSchedules:
+    """
+    Represents the yearly payment schedules of many mortgages
+
+    Row i holds mortgage i and column j holds schedule year j, padded to the longest term.
+    Padded years are zero and excluded by the mask.
+    """
+
+    monthly_payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+    mask: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert the schedules into a long-format DataFrame with one row per mortgage and year
+
+        :return: a DataFrame with the payment schedules
+        """
+        loan, year = np.nonzero(self.mask)
+        return pd.DataFrame(
+            {
+                "Loan": loan,
+                "Year": year,
+                "Interest": self.interest[self.mask],
+                "Principal": self.principal[self.mask],
+                "Balance": self.balance[self.mask],
+            }
+        )
+
+
 class MortgageCalculator:
     """
     A class to calculate mortgage-related metrics
@@ -95,52 +143,245 @@ class MortgageCalculator:
         """
         term_in_months = 12 * payment_term
         monthly_interest_rate = annual_interest_rate / 1200
+        if monthly_interest_rate == 0:
+            return principal / term_in_months
+
         monthly_payment = principal * monthly_interest_rate / (1 - (1 + monthly_interest_rate) ** -term_in_months)
 
         return monthly_payment
 
+    @staticmethod
+    def calculate_monthly_payments(
+        principals: np.ndarray, payment_terms: np.ndarray, annual_interest_rates: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the monthly mortgage payment of many mortgages at once
+
+        :param principals: the principal amounts
+        :param payment_terms: the payment terms in years
+        :param annual_interest_rates: the annual interest rates
+        :return: an array with the monthly mortgage payment of each mortgage
+        """
+        principals, payment_terms, annual_interest_rates = np.broadcast_arrays(
+            np.asarray(principals, dtype=float),
+            np.asarray(payment_terms, dtype=int),
+            np.asarray(annual_interest_rates, dtype=float),
+        )
+        term_in_months = 12 * payment_terms
+        monthly_interest_rates = annual_interest_rates / 1200
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annuity_payments = (
+                principals * monthly_interest_rates / (1 - (1 + monthly_interest_rates) ** -term_in_months)
+            )
+            return np.where(monthly_interest_rates == 0, principals / term_in_months, annuity_payments)
+
+    @staticmethod
+    def calculate_balances(
+        principals: np.ndarray, payment_terms: np.ndarray, annual_interest_rates: np.ndarray, months: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the remaining balance of many mortgages after a number of monthly payments
+
+        :param principals: the principal amounts
+        :param payment_terms: the payment terms in years
+        :param annual_interest_rates: the annual interest rates
+        :param months: the number of monthly payments made, capped at the end of each term
+        :return: an array with the remaining balance of each mortgage
+        """
+        monthly_payments = MortgageCalculator.calculate_monthly_payments(
+            principals, payment_terms, annual_interest_rates
+        )
+        months = np.minimum(months, 12 * np.asarray(payment_terms))
+        monthly_interest_rates = np.asarray(annual_interest_rates, dtype=float) / 1200
+        growth = (1 + monthly_interest_rates) ** months
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                monthly_interest_rates == 0,
+                principals - monthly_payments * months,
+                principals * growth - monthly_payments * (growth - 1) / monthly_interest_rates,
+            )
+
+    @staticmethod
+    def amortize(
+        principal: float, payment_term: int, annual_interest_rate: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the interest, principal repayment and remaining balance for every month of the mortgage
+
+        :param principal: the principal amount
+        :param payment_term: the payment term in years
+        :param annual_interest_rate: the annual interest rate
+        :return: arrays of the monthly interest, principal repayment and balance after each payment
+        """
+        monthly_payment = MortgageCalculator.calculate_monthly_payment(principal, payment_term, annual_interest_rate)
+        interest, principal_payment, balance, _ = MortgageCalculator.amortize_many(
+            [principal], [payment_term], [annual_interest_rate], monthly_payments=[monthly_payment]
+        )
+
+        return interest[0], principal_payment[0], balance[0]
+
+    @staticmethod
+    def amortize_many(
+        principals: np.ndarray,
+        payment_terms: np.ndarray,
+        annual_interest_rates: np.ndarray,
+        monthly_payments: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the monthly amortization of many mortgages at once
+
+        The balance after month k follows the closed-form annuity formula
+        B_k = P * (1 + r)^k - M * ((1 + r)^k - 1) / r, so every month of every mortgage is computed in one pass.
+        Rows are padded to the longest term; months after the end of a mortgage are masked to zero.
+
+        :param principals: the principal amounts
+        :param payment_terms: the payment terms in years
+        :param annual_interest_rates: the annual interest rates
+        :param monthly_payments: the monthly payments, calculated from the other inputs when not given
+        :return: 2-D arrays of the monthly interest, principal repayment and balance after each payment,
+        and the mask of the months within each mortgage's term
+        """
+        principals, payment_terms, annual_interest_rates = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(principals, dtype=float)),
+            np.atleast_1d(np.asarray(payment_terms, dtype=int)),
+            np.atleast_1d(np.asarray(annual_interest_rates, dtype=float)),
+        )
+        if monthly_payments is None:
+            monthly_payments = MortgageCalculator.calculate_monthly_payments(
+                principals, payment_terms, annual_interest_rates
+            )
+
+        term_in_months = 12 * payment_terms[:, None]
+        monthly_interest_rates = annual_interest_rates[:, None] / 1200
+        monthly_payments = np.asarray(monthly_payments, dtype=float)[:, None]
+        principals = principals[:, None]
+
+        months = np.arange(term_in_months.max(initial=0) + 1)
+        growth = (1 + monthly_interest_rates) ** months
+        with np.errstate(divide="ignore", invalid="ignore"):
+            balance = np.where(
+                monthly_interest_rates == 0,
+                principals - monthly_payments * months,
+                principals * growth - monthly_payments * (growth - 1) / monthly_interest_rates,
+            )
+
+        mask = months[1:] <= term_in_months
+        interest = np.where(mask, balance[:, :-1] * monthly_interest_rates, 0.0)
+        principal_payment = np.where(mask, monthly_payments - interest, 0.0)
+
+        return interest, principal_payment, np.where(mask, balance[:, 1:], 0.0), mask
+
+    @staticmethod
+    def aggregate_to_years(
+        interest: np.ndarray, principal_payment: np.ndarray, balance: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aggregate a monthly amortization into years
+
+        Months are numbered from 1 and grouped by ``month // 12 + 1``: the first year holds months 1-11,
+        every following year starts on a multiple of 12 and the final month closes a year of its own.
+        2-D inputs are aggregated along their last axis.
+
+        :param interest: the monthly interest
+        :param principal_payment: the monthly principal repayment
+        :param balance: the balance after each monthly payment
+        :return: arrays of the yearly interest, yearly principal repayment and closing balance of each year
+        """
+        num_months = balance.shape[-1]
+        year_starts = np.concatenate(([0], np.arange(11, num_months, 12)))
+        year_ends = np.append(year_starts[1:] - 1, num_months - 1)
+
+        return (
+            np.add.reduceat(interest, year_starts, axis=-1),
+            np.add.reduceat(principal_payment, year_starts, axis=-1),
+            balance[..., year_ends],
+        )
+
+    @staticmethod
+    def generate_payment_schedules(
+        principals: np.ndarray, payment_terms: np.ndarray, annual_interest_rates: np.ndarray
+    ) -> PaymentSchedules:
+        """
+        Generate the yearly payment schedules of many mortgages in one vectorized pass
+
+        Mortgages with different terms are padded to the longest term and masked rather than looped over.
+        Unlike ``generate_payment_schedule`` the values are not rounded.
+
+        :param principals: the principal amounts
+        :param payment_terms: the payment terms in years
+        :param annual_interest_rates: the annual interest rates
+        :return: the padded payment schedules
+        """
+        principals, payment_terms, annual_interest_rates = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(principals, dtype=float)),
+            np.atleast_1d(np.asarray(payment_terms, dtype=int)),
+            np.atleast_1d(np.asarray(annual_interest_rates, dtype=float)),
+        )
+        monthly_payments = MortgageCalculator.calculate_monthly_payments(
+            principals, payment_terms, annual_interest_rates
+        )
+        interest, principal_payment, balance = MortgageCalculator.aggregate_to_years(
+            *MortgageCalculator.amortize_many(
+                principals, payment_terms, annual_interest_rates, monthly_payments=monthly_payments
+            )[:3]
+        )
+
+        # Year 0 is the start of the mortgage; a mortgage of n years has schedule years 0..n + 1
+        start = np.zeros((len(principals), 1))
+        years = np.arange(interest.shape[1] + 1)
+
+        return PaymentSchedules(
+            monthly_payment=monthly_payments,
+            interest=np.hstack([start, interest]),
+            principal=np.hstack([start, principal_payment]),
+            balance=np.hstack([principals[:, None], balance]),
+            mask=years <= payment_terms[:, None] + 1,
+        )
+
     @staticmethod
     def generate_payment_schedule(principal: float, payment_term: int, annual_interest_rate: float) -> pd.DataFrame:
         """
         Generate a mortgage payment schedule
 
+        Schedules are memoized in ``PAYMENT_SCHEDULE_CACHE``, every call returns its own snapshot.
+
         :param principal: the principal amount
         :param payment_term: the payment term in years
         :param annual_interest_rate: the annual interest rate
         :return: a DataFrame with the payment schedule
         """
-        term_in_months = 12 * payment_term
-        monthly_interest_rate = annual_interest_rate / 1200
-        monthly_payment = MortgageCalculator.calculate_monthly_payment(principal, payment_term, annual_interest_rate)
+        return PAYMENT_SCHEDULE_CACHE.get_or_compute(
+            normalize_key(principal, payment_term, annual_interest_rate),
+            lambda: MortgageCalculator.build_payment_schedule(principal, payment_term, annual_interest_rate),
+        )
 
-        # create a payment schedule
-        balance = principal
-        payments = []
-        for month in range(1, term_in_months + 1):
-            interest = balance * monthly_interest_rate
-            principal_payment = monthly_payment - interest
-            balance -= principal_payment
-            payments.append((month, interest, principal_payment, balance))
-
-        payments = pd.DataFrame(payments, columns=["Month", "Interest", "Principal", "Balance"])
-        # make the dataframe annual
-        payments["Year"] = payments["Month"] // 12 + 1
-        payments = (
-            payments.groupby("Year").agg({"Interest": "sum", "Principal": "sum", "Balance": "last"}).reset_index()
+    @staticmethod
+    def build_payment_schedule(principal: float, payment_term: int, annual_interest_rate: float) -> pd.DataFrame:
+        """
+        Build a mortgage payment schedule without the cache
+
+        :param principal: the principal amount
+        :param payment_term: the payment term in years
+        :param annual_interest_rate: the annual interest rate
+        :return: a DataFrame with the payment schedule
+        """
+        interest, principal_payment, balance = MortgageCalculator.aggregate_to_years(
+            *MortgageCalculator.amortize(principal, payment_term, annual_interest_rate)
         )
-        # Add an ititial row for the start of the mortgage
-        payments = pd.concat(
-            [
-                pd.DataFrame(
-                    {
-                        "Year": [0],
-                        "Interest": [0],
-                        "Principal": [0],
-                        "Balance": [principal],
-                    }
-                ),
-                payments,
-            ]
+        num_years = len(balance)
+
+        # The first row is the start of the mortgage. It keeps the index label 0 next to the
+        # yearly rows labelled 0..n, which is what lookups such as ``payment_schedule.loc[year]`` rely on.
+        payments = pd.DataFrame(
+            {
+                "Year": np.arange(num_years + 1),
+                "Interest": np.concatenate(([0.0], interest)),
+                "Principal": np.concatenate(([0.0], principal_payment)),
+                "Balance": np.concatenate(([principal], balance)),
+            },
+            index=np.concatenate(([0], np.arange(num_years))),
         )
 
         # round the values to 1 decimal place
@@ -149,6 +390,53 @@ class MortgageCalculator:
         return payments
 
 
+@dataclass(frozen=True)
+class StampDutyTable:
+    """
+    Represents stamp duty brackets compiled into arrays
+
+    The duty accumulated below each bracket is precomputed, so the duty on any price is a lookup of its bracket
+    plus one multiply-add.
+    """
+
+    thresholds: np.ndarray
+    rates: np.ndarray
+    cumulative_duty: np.ndarray
+
+    @classmethod
+    def from_rules(cls, brackets_and_rates: List[Tuple[int, float]]) -> "StampDutyTable":
+        """
+        Compile a list of brackets and rates into a table
+
+        :param brackets_and_rates: the lower bound and rate of each bracket, in ascending order
+        :return: the compiled table
+        """
+        thresholds = np.array([bracket for bracket, _ in brackets_and_rates], dtype=float)
+        rates = np.array([rate for _, rate in brackets_and_rates], dtype=float)
+        cumulative_duty = np.concatenate(([0.0], np.cumsum(np.diff(thresholds) * rates[:-1])))
+
+        return cls(thresholds=thresholds, rates=rates, cumulative_duty=cumulative_duty)
+
+    def calculate(self, values: np.ndarray) -> np.ndarray:
+        """
+        Calculate the stamp duty payable on one or many purchase prices
+
+        :param values: the purchase prices
+        :return: the stamp duty payable on each price
+        """
+        values = np.asarray(values, dtype=float)
+        bracket = np.maximum(np.searchsorted(self.thresholds, values, side="right") - 1, 0)
+        duty = self.cumulative_duty[bracket] + (values - self.thresholds[bracket]) * self.rates[bracket]
+
+        return np.where(values > self.thresholds[0], duty, 0.0)
+
+
+STAMP_DUTY_TABLES: Dict[InvestorType, StampDutyTable] = {
+    investor_type: StampDutyTable.from_rules(brackets_and_rates)
+    for investor_type, brackets_and_rates in STAMP_DUTY_RULES.items()
+}
+
+
 class StampDutyCalculator:
     """
     A class to calculate stamp duty
@@ -158,29 +446,21 @@ class StampDutyCalculator:
     """
 
     @staticmethod
-    def calculate_stamp_duty(value: float, investor_type: InvestorType) -> float:
+    def calculate_stamp_duty(value: Union[float, np.ndarray], investor_type: PyEnum) -> Union[float, np.ndarray]:
         """
         Calculate the stamp duty payable on a property purchase
 
-        :param value: the purchase price of the property
-        :param investor_type: the type of investor
-        :return: the stamp duty payable
+        :param value: the purchase price of the property, or an array of purchase prices
+        :param investor_type: the type of investor, any investor type enum with the same values is accepted
+        :return: the stamp duty payable, an array when an array of prices is given
         """
+        table = STAMP_DUTY_TABLES[InvestorType(investor_type.value)]
+        if np.ndim(value) > 0:
+            return table.calculate(value)
 
-        def calculate_duty(brackets_and_rates: List[Tuple[int, float]]) -> float:
-            duty = 0
-            for i, (bracket, rate) in enumerate(brackets_and_rates):
-                if i + 1 < len(brackets_and_rates):
-                    next_bracket = brackets_and_rates[i + 1][0]
-                    if value > bracket:
-                        duty += (min(value, next_bracket) - bracket) * rate
-                    else:
-                        break
-                else:
-                    duty += (value - bracket) * rate
-            return duty
-
-        return calculate_duty(STAMP_DUTY_RULES[investor_type])
+        return STAMP_DUTY_CACHE.get_or_compute(
+            normalize_key(value, investor_type), lambda: float(table.calculate(value))
+        )
 
 
 @dataclass
@@ -260,17 +540,22 @@ class EquityGrowthCalculator:
         return purchase_price * (1 + annual_price_appreciation) ** years
 
     @staticmethod
-    def calculate_equity_growth(future_property_value: float, payment_schedule: pd.DataFrame, year: int) -> float:
+    def calculate_equity_growth(
+        future_property_value: Union[float, np.ndarray],
+        payment_schedule: pd.DataFrame,
+        year: Union[int, np.ndarray],
+    ) -> Union[float, np.ndarray]:
         """
         Calculate the equity growth of a property investment at a given year in the future
 
-        :param principal: the principal amount of the mortgage
-        :param annual_price_appreciation: the annual price appreciation of the property
+        :param future_property_value: the value of the property at that year
         :param payment_schedule: the mortgage payment schedule
-        :param year: the year in the future
+        :param year: the year in the future, or an array of years
         :return: the equity growth
         """
-        final_balance = payment_schedule.loc[year, "Balance"]
+        # The schedule starts with an extra row for the start of the mortgage, so the balance of a year is
+        # the row after its label. Years past the end of the schedule keep the final balance.
+        final_balance = np.take(payment_schedule["Balance"].to_numpy(), np.asarray(year) + 1, mode="clip")
         equity_growth = future_property_value - final_balance
         return equity_growth
 
@@ -314,119 +599,586 @@ class InvestmentMetricsCalculator:
         return equity_growth / total_cash_investment
 
 
-class SimulationService:
+@dataclass
+class MonteCarloSettings:
     """
-    A service to run simulations of property investments
+    Represents the distributions and execution settings of a Monte Carlo simulation
+
+    Each year the price and rent appreciation are drawn from normal distributions centred on the property's annual
+    appreciation, the mortgage rate takes a normally distributed step from the previous year's rate and the void
+    weeks are drawn from a Poisson distribution.
     """
 
-    def run_simulation(
+    num_paths: int = 10000
+    price_appreciation_volatility: float = 0.05
+    rent_appreciation_volatility: float = 0.02
+    interest_rate_volatility: float = 0.5
+    mean_void_weeks: float = 2
+    seed: int = 0
+    chunk_size: int = 1000
+    max_workers: Optional[int] = None
+
+    def __post_init__(self):
+        if self.num_paths < 1:
+            raise ValueError(f"The number of Monte Carlo paths must be at least 1, got {self.num_paths}")
+        if self.chunk_size < 1:
+            raise ValueError(f"The Monte Carlo chunk size must be at least 1, got {self.chunk_size}")
+
+
+def simulate_monte_carlo_paths(
+    property_details: PropertyDetails,
+    investment_details: InvestmentDetails,
+    total_cash_investment: float,
+    num_years: int,
+    settings: MonteCarloSettings,
+    num_paths: int,
+    seed_sequence: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate a chunk of Monte Carlo paths of a property investment
+
+    The paths are simulated together, one year at a time. The mortgage is re-amortized every year over its remaining
+    term at that year's interest rate.
+
+    :param property_details: the details of the property investment
+    :param investment_details: the details of the investment
+    :param total_cash_investment: the total cash investment
+    :param num_years: the number of years to project
+    :param settings: the Monte Carlo settings
+    :param num_paths: the number of paths in the chunk
+    :param seed_sequence: the seed sequence of the chunk
+    :return: arrays of the equity, annual cash flow and ROI with one row per path and one column per year
+    """
+    rng = np.random.default_rng(seed_sequence)
+    shape = (num_paths, num_years)
+
+    # Year 0 is the first year of the investment, growth applies from year 1 onwards
+    price_appreciation = rng.normal(
+        property_details.annual_price_appreciation, settings.price_appreciation_volatility, shape
+    )
+    rent_appreciation = rng.normal(
+        property_details.annual_rent_appreciation, settings.rent_appreciation_volatility, shape
+    )
+    price_appreciation[:, 0] = 0
+    rent_appreciation[:, 0] = 0
+    property_value = property_details.purchase_price * np.cumprod(1 + price_appreciation, axis=1)
+    rent_growth = np.cumprod(1 + rent_appreciation, axis=1)
+
+    interest_rate_steps = rng.normal(0, settings.interest_rate_volatility, shape)
+    interest_rate_steps[:, 0] = 0
+    interest_rates = np.maximum(investment_details.interest_rate + np.cumsum(interest_rate_steps, axis=1), 0)
+
+    void_weeks = np.minimum(rng.poisson(settings.mean_void_weeks, shape), WEEKS_PER_YEAR)
+
+    # Roll the mortgage forward one year at a time for all paths
+    balance = np.full(num_paths, investment_details.calculate_loan_amount(property_details.purchase_price))
+    closing_balance = np.empty(shape)
+    mortgage_payment = np.empty(shape)
+    for year in range(num_years):
+        remaining_years = max(investment_details.payment_term - year, 0)
+        if remaining_years == 0:
+            balance = np.zeros(num_paths)
+            mortgage_payment[:, year] = 0
+            closing_balance[:, year] = 0
+            continue
+
+        monthly_interest_rate = interest_rates[:, year] / 1200
+        monthly_payment = MortgageCalculator.calculate_monthly_payments(
+            balance, remaining_years, interest_rates[:, year]
+        )
+        growth = (1 + monthly_interest_rate) ** 12
+        with np.errstate(divide="ignore", invalid="ignore"):
+            balance = np.where(
+                monthly_interest_rate == 0,
+                balance - 12 * monthly_payment,
+                balance * growth - monthly_payment * (growth - 1) / monthly_interest_rate,
+            )
+        mortgage_payment[:, year] = monthly_payment
+        closing_balance[:, year] = balance
+
+    monthly_rent = property_details.monthly_rent * rent_growth
+    collected_rent = monthly_rent * (1 - void_weeks / WEEKS_PER_YEAR)
+    running_costs = (
+        mortgage_payment
+        + (property_details.insurance + property_details.service_charge + property_details.ground_rent) * rent_growth
+        + collected_rent * (PROPERTY_MANAGEMENT_CUT + REPAIRS_AND_MAINTENANCE_CUT)
+    )
+    annual_cash_flow = RentalIncomeCalculator.calculate_annual_cash_flow(
+        RentalIncomeCalculator.calculate_monthly_rental_income(collected_rent, running_costs)
+    )
+
+    # Equity is measured against the balance at the start of each year, so year 0 is the down payment
+    opening_balance = np.hstack(
+        [
+            np.full((num_paths, 1), investment_details.calculate_loan_amount(property_details.purchase_price)),
+            closing_balance[:, :-1],
+        ]
+    )
+    equity = property_value - opening_balance
+    roi = InvestmentMetricsCalculator.calculate_rental_roi(annual_cash_flow, total_cash_investment)
+
+    return equity, annual_cash_flow, roi
+
+
+def expand_sweep_grid(
+    property_details: PropertyDetails, investment_details: InvestmentDetails, grid: Dict[str, List[float]]
+) -> Dict[str, np.ndarray]:
+    """
+    Expand a grid specification into the Cartesian product of its values
+
+    Fields of the property and investment details that are not in the grid keep their value for every point.
+
+    :param property_details: the base details of the property investment
+    :param investment_details: the base details of the investment
+    :param grid: the values to sweep for each field of the property or investment details
+    :return: a column of values for every field, with one entry per grid point
+    """
+    base = {**asdict(property_details), **asdict(investment_details)}
+    unknown_fields = set(grid) - set(base)
+    if unknown_fields:
+        raise ValueError(f"Unknown sweep fields: {', '.join(sorted(unknown_fields))}")
+    empty_fields = [field for field, values in grid.items() if len(values) == 0]
+    if empty_fields:
+        raise ValueError(f"Sweep fields without values: {', '.join(empty_fields)}")
+
+    mesh = np.meshgrid(*[np.asarray(values, dtype=float) for values in grid.values()], indexing="ij")
+    num_points = mesh[0].size if mesh else 1
+    columns = {field: np.full(num_points, value, dtype=float) for field, value in base.items()}
+    columns.update({field: values.ravel() for field, values in zip(grid, mesh)})
+
+    return columns
+
+
+def evaluate_sweep_points(
+    columns: Dict[str, np.ndarray], investor_type: InvestorType, num_years: int
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the final year of the simulation for every point of a sweep at once
+
+    The metrics follow ``SimulationService.run_simulation``: ``rental_roi`` and ``equity`` are the values of its last
+    yearly row. ``total_roi`` adds the cash flow of all years and the equity, net of the total cash investment.
+
+    :param columns: a column of values for every field of the property and investment details
+    :param investor_type: the type of investor
+    :param num_years: the number of years to project
+    :return: a column for every metric, with one entry per point
+    """
+    purchase_price = columns["purchase_price"]
+    monthly_rent = columns["monthly_rent"]
+    payment_term = columns["payment_term"].astype(int)
+    last_year = max(num_years, 1) - 1
+
+    stamp_duty = StampDutyCalculator.calculate_stamp_duty(purchase_price, investor_type)
+    total_cash_investment = (
+        columns["down_payment"]
+        + stamp_duty
+        + columns["legal_fees"]
+        + columns["refurbishment_cost"]
+        + columns["furnishing_cost"]
+    )
+    loan_amount = purchase_price - columns["down_payment"]
+    mortgage_payment = MortgageCalculator.calculate_monthly_payments(
+        loan_amount, payment_term, columns["interest_rate"]
+    )
+    running_costs = RunningCostsCalculator(
+        property_management_cut=PROPERTY_MANAGEMENT_CUT, repairs_and_maintenance_cut=REPAIRS_AND_MAINTENANCE_CUT
+    ).calculate_running_costs(
+        mortgage_payment, monthly_rent, columns["insurance"], columns["service_charge"], columns["ground_rent"]
+    )
+
+    rent_growth = (1 + columns["annual_rent_appreciation"][:, None]) ** np.arange(last_year + 1)
+    annual_cash_flow = RentalIncomeCalculator.calculate_annual_cash_flow(
+        RentalIncomeCalculator.calculate_monthly_rental_income(
+            monthly_rent[:, None] * rent_growth, running_costs[:, None] * rent_growth
+        )
+    )
+
+    # The equity of year n uses the balance of payment schedule year n + 1, which closes after month 12n + 11
+    if last_year == 0:
+        equity = columns["down_payment"].copy()
+    else:
+        balance = MortgageCalculator.calculate_balances(
+            loan_amount, payment_term, columns["interest_rate"], 12 * last_year + 11
+        )
+        equity = purchase_price - balance
+
+    cumulative_cash_flow = annual_cash_flow.sum(axis=1)
+
+    return {
+        "total_cash_investment": total_cash_investment,
+        "mortgage_payment": mortgage_payment,
+        "annual_cash_flow": annual_cash_flow[:, -1],
+        "rental_roi": InvestmentMetricsCalculator.calculate_rental_roi(annual_cash_flow[:, -1], total_cash_investment),
+        "equity": equity,
+        "cumulative_cash_flow": cumulative_cash_flow,
+        "total_roi": (cumulative_cash_flow + equity - total_cash_investment) / total_cash_investment,
+    }
+
+
+@dataclass(frozen=True)
+class SimulationNode:
+    """
+    A derived quantity of a simulation, computed from the simulation inputs and the nodes declared before it
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable
+
+
+# The inputs of a simulation, the fields of the property and investment details, the investor type and the horizon
+SIMULATION_INPUTS = (
+    *(field.name for field in fields(PropertyDetails)),
+    *(field.name for field in fields(InvestmentDetails)),
+    "investor_type",
+    "num_years",
+)
+
+# The nodes of a simulation in dependency order, every node only depends on the inputs and the nodes before it
+SIMULATION_NODES: List[SimulationNode] = []
+
+
+def simulation_node(compute: Callable) -> Callable:
+    """
+    Declare a function as a node of the simulation, its parameters name the inputs and nodes it depends on
+    """
+    inputs = tuple(inspect.signature(compute).parameters)
+    known = set(SIMULATION_INPUTS) | {node.name for node in SIMULATION_NODES}
+    unknown = [name for name in inputs if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown inputs of the simulation node {compute.__name__}: {', '.join(unknown)}")
+    SIMULATION_NODES.append(SimulationNode(compute.__name__, inputs, compute))
+    return compute
+
+
+@simulation_node
+def stamp_duty(purchase_price: float, investor_type: InvestorType) -> float:
+    """
+    The stamp duty payable on the purchase
+    """
+    return StampDutyCalculator.calculate_stamp_duty(purchase_price, investor_type)
+
+
+@simulation_node
+def loan_amount(purchase_price: float, down_payment: float) -> float:
+    """
+    The amount borrowed, the part of the purchase price not paid by the down payment
+    """
+    return purchase_price - down_payment
+
+
+@simulation_node
+def mortgage_payment(loan_amount: float, payment_term: int, interest_rate: float) -> float:
+    """
+    The monthly payment of the mortgage
+    """
+    return MortgageCalculator.calculate_monthly_payment(loan_amount, payment_term, interest_rate)
+
+
+@simulation_node
+def payment_schedule(loan_amount: float, payment_term: int, interest_rate: float) -> pd.DataFrame:
+    """
+    The yearly interest, principal repayments and balance of the mortgage
+    """
+    return MortgageCalculator.generate_payment_schedule(loan_amount, payment_term, interest_rate)
+
+
+@simulation_node
+def running_costs(
+    mortgage_payment: float, monthly_rent: float, insurance: float, service_charge: float, ground_rent: float
+) -> float:
+    """
+    The monthly running costs, the mortgage payment included
+    """
+    return RunningCostsCalculator(
+        property_management_cut=PROPERTY_MANAGEMENT_CUT, repairs_and_maintenance_cut=REPAIRS_AND_MAINTENANCE_CUT
+    ).calculate_running_costs(mortgage_payment, monthly_rent, insurance, service_charge, ground_rent)
+
+
+@simulation_node
+def annual_cash_flow(monthly_rent: float, running_costs: float) -> float:
+    """
+    The cash flow of the first year, the rent net of the running costs
+    """
+    return RentalIncomeCalculator.calculate_annual_cash_flow(
+        RentalIncomeCalculator.calculate_monthly_rental_income(monthly_rent, running_costs)
+    )
+
+
+@simulation_node
+def total_cash_investment(
+    down_payment: float, stamp_duty: float, legal_fees: float, refurbishment_cost: float, furnishing_cost: float
+) -> float:
+    """
+    The cash put into the investment at the purchase
+    """
+    return down_payment + stamp_duty + legal_fees + refurbishment_cost + furnishing_cost
+
+
+@simulation_node
+def equity(purchase_price: float, down_payment: float, payment_schedule: pd.DataFrame, num_years: int) -> np.ndarray:
+    """
+    The equity at the start of each year, the purchase price net of the mortgage balance
+    """
+    # The equity at the start of the investment is the down payment
+    equity = EquityGrowthCalculator.calculate_equity_growth(
+        purchase_price, payment_schedule, np.arange(max(num_years, 1))
+    )
+    equity[0] = down_payment
+    return equity
+
+
+@simulation_node
+def yearly_metrics(
+    purchase_price: float,
+    monthly_rent: float,
+    annual_rent_appreciation: float,
+    running_costs: float,
+    annual_cash_flow: float,
+    total_cash_investment: float,
+    equity: np.ndarray,
+    num_years: int,
+) -> pd.DataFrame:
+    """
+    The yield, cash flow, ROI and equity of each year
+    """
+    # Project the yearly metrics for all years at once, rent and running costs grow with the rent appreciation
+    years = np.arange(max(num_years, 1))
+    rent_growth = (1 + annual_rent_appreciation) ** years
+    future_annual_cash_flow = RentalIncomeCalculator.calculate_annual_cash_flow(
+        RentalIncomeCalculator.calculate_monthly_rental_income(monthly_rent * rent_growth, running_costs * rent_growth)
+    )
+    return pd.DataFrame(
+        {
+            "Year": years,
+            "Gross Yield": (monthly_rent * 12) / purchase_price,
+            "Net Yield": InvestmentMetricsCalculator.calculate_net_yield(annual_cash_flow, purchase_price),
+            "Annual Cash Flow": future_annual_cash_flow,
+            "Rental ROI": InvestmentMetricsCalculator.calculate_rental_roi(
+                future_annual_cash_flow, total_cash_investment
+            ),
+            "equity": equity,
+        }
+    )
+
+
+class IncrementalSimulation:
+    """
+    A simulation that keeps its inputs and nodes between runs, and only recomputes the nodes whose inputs changed
+
+    Changing the insurance, for instance, recomputes the running costs, the cash flow and the yearly metrics, while the
+    stamp duty, the loan and the payment schedule are reused. Keep one per user session, in the SimulationService of the
+    session, which recomputes it on the misses of the simulation cache.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, object] = {}
+        # The names of the nodes computed by the last run, in order
+        self.recomputed: List[str] = []
+
+    def run(
         self,
         property_details: PropertyDetails,
         investment_details: InvestmentDetails,
         investor_type: InvestorType,
         num_years: int,
-    ) -> Tuple[float, pd.DataFrame, float, float]:
+    ) -> Tuple[float, float, pd.DataFrame]:
         """
-        Run a simulation of a property investment
+        Run the simulation, recomputing the nodes that depend on the inputs changed since the last run
 
         :param property_details: the details of the property investment
         :param investment_details: the details of the investment
         :param investor_type: the type of investor
-        :return: a tuple containing the total cash investment, the mortgage payment schedule, the gross yield,
-        and the net yield
+        :param num_years: the number of years to project
+        :return: a tuple containing the total cash investment, the monthly mortgage payment and a DataFrame with the
+        numeric yearly metrics
         """
+        inputs = {
+            **asdict(property_details),
+            **asdict(investment_details),
+            "investor_type": investor_type,
+            "num_years": num_years,
+        }
+        changed = {name for name, value in inputs.items() if name not in self.values or self.values[name] != value}
+        self.values.update(inputs)
+
+        self.recomputed = []
+        for node in SIMULATION_NODES:
+            if node.name in self.values and changed.isdisjoint(node.inputs):
+                continue
+            self.values[node.name] = node.compute(*(self.values[name] for name in node.inputs))
+            changed.add(node.name)
+            self.recomputed.append(node.name)
+
+        return (
+            self.values["total_cash_investment"],
+            self.values["mortgage_payment"],
+            self.values["yearly_metrics"].copy(),
+        )
 
-        yearly_metrics = []
 
-        # Calculate the stamp duty
-        stamp_duty = StampDutyCalculator.calculate_stamp_duty(property_details.purchase_price, investor_type)
+class SimulationService:
+    """
+    A service to run simulations of property investments
 
-        # Calculate the loan amount
-        loan_amount = investment_details.calculate_loan_amount(property_details.purchase_price)
+    Results are read from the cache, the shared SIMULATION_CACHE by default. On a miss, a service given an
+    IncrementalSimulation only recomputes the nodes whose inputs changed since its last run. Such a service is kept per
+    user session, a simulation is not safe to share between threads.
+    """
 
-        # Calculate the monthly mortgage payment
-        mortgage_payment = MortgageCalculator.calculate_monthly_payment(
-            loan_amount, investment_details.payment_term, investment_details.interest_rate
-        )
+    def __init__(self, cache: Optional[LRUCache] = None, simulation: Optional[IncrementalSimulation] = None):
+        self.cache = SIMULATION_CACHE if cache is None else cache
+        self.simulation = simulation
 
-        # Generate the mortgage payment schedule
-        payment_schedule = MortgageCalculator.generate_payment_schedule(
-            loan_amount, investment_details.payment_term, investment_details.interest_rate
-        )
+    @timed_span
+    def run_simulation(
+        self,
+        property_details: PropertyDetails,
+        investment_details: InvestmentDetails,
+        investor_type: InvestorType,
+        num_years: int,
+    ) -> Tuple[float, float, pd.DataFrame]:
+        """
+        Run a simulation of a property investment
 
-        # Calculate the running costs
-        running_costs = RunningCostsCalculator(
-            property_management_cut=PROPERTY_MANAGEMENT_CUT, repairs_and_maintenance_cut=REPAIRS_AND_MAINTENANCE_CUT
-        ).calculate_running_costs(
-            mortgage_payment,
-            property_details.monthly_rent,
-            property_details.insurance,
-            property_details.service_charge,
-            property_details.ground_rent,
-        )
+        Results are memoized in the service's cache, every call returns its own snapshot of the yearly metrics.
 
-        # Calculate the monthly rental income
-        monthly_rental_income = RentalIncomeCalculator.calculate_monthly_rental_income(
-            property_details.monthly_rent, running_costs
+        :param property_details: the details of the property investment
+        :param investment_details: the details of the investment
+        :param investor_type: the type of investor
+        :param num_years: the number of years to project
+        :return: a tuple containing the total cash investment, the monthly mortgage payment and a DataFrame with the
+        numeric yearly metrics
+        """
+        return self.cache.get_or_compute(
+            normalize_key(asdict(property_details), asdict(investment_details), investor_type, num_years),
+            lambda: self.compute_simulation(property_details, investment_details, investor_type, num_years),
         )
 
-        # Calculate the annual cash flow
-        annual_cash_flow = RentalIncomeCalculator.calculate_annual_cash_flow(monthly_rental_income)
+    @timed_span
+    def compute_simulation(
+        self,
+        property_details: PropertyDetails,
+        investment_details: InvestmentDetails,
+        investor_type: InvestorType,
+        num_years: int,
+    ) -> Tuple[float, float, pd.DataFrame]:
+        """
+        Run a simulation of a property investment without the cache, evaluating the nodes of SIMULATION_NODES
 
-        # Calculate the gross yield
-        gross_yield = property_details.calculate_gross_yield()
-        # Calculate the net yield
-        net_yield = InvestmentMetricsCalculator.calculate_net_yield(annual_cash_flow, property_details.purchase_price)
+        Every node is evaluated, or with the simulation of the service only the nodes whose inputs changed since its
+        last run.
 
-        # Calculate the total cash investment
-        total_cash_investment = investment_details.calculate_total_cash_investment(stamp_duty)
+        :param property_details: the details of the property investment
+        :param investment_details: the details of the investment
+        :param investor_type: the type of investor
+        :param num_years: the number of years to project
+        :return: a tuple containing the total cash investment, the monthly mortgage payment and a DataFrame with the
+        numeric yearly metrics
+        """
+        simulation = self.simulation or IncrementalSimulation()
+        return simulation.run(property_details, investment_details, investor_type, num_years)
 
-        # Calculate the ROI
-        rental_roi = InvestmentMetricsCalculator.calculate_rental_roi(annual_cash_flow, total_cash_investment)
+    @timed_span
+    def run_monte_carlo(
+        self,
+        property_details: PropertyDetails,
+        investment_details: InvestmentDetails,
+        investor_type: InvestorType,
+        num_years: int,
+        settings: Optional[MonteCarloSettings] = None,
+    ) -> pd.DataFrame:
+        """
+        Run a Monte Carlo simulation of a property investment
 
-        yearly_metrics.append(
-            {
-                "Year": 0,
-                "Gross Yield": gross_yield,
-                "Net Yield": net_yield,
-                "Rental ROI": f"{rental_roi:.2%}",
-                "equity": f"£{investment_details.down_payment/1000:.0f}K",
-            }
+        The paths are split into chunks that are simulated on a process pool. Every chunk gets its own child of the
+        seed sequence, so the results only depend on the seed and the chunk size, not on the number of workers.
+
+        :param property_details: the details of the property investment
+        :param investment_details: the details of the investment
+        :param investor_type: the type of investor
+        :param num_years: the number of years to project
+        :param settings: the Monte Carlo settings, the defaults are used when not given
+        :return: a DataFrame with the P5/P50/P95 bands of the equity, annual cash flow and ROI of each year
+        """
+        settings = settings or MonteCarloSettings()
+        num_years = max(num_years, 1)
+
+        stamp_duty = StampDutyCalculator.calculate_stamp_duty(property_details.purchase_price, investor_type)
+        total_cash_investment = investment_details.calculate_total_cash_investment(stamp_duty)
+
+        num_chunks = math.ceil(settings.num_paths / settings.chunk_size)
+        chunk_sizes = [settings.chunk_size] * (num_chunks - 1) + [
+            settings.num_paths - settings.chunk_size * (num_chunks - 1)
+        ]
+        seed_sequences = np.random.SeedSequence(settings.seed).spawn(num_chunks)
+        simulate_chunk = partial(
+            simulate_monte_carlo_paths, property_details, investment_details, total_cash_investment, num_years, settings
         )
 
-        property_value = property_details.purchase_price
-        for year in range(1, num_years):
+        if settings.max_workers == 1 or num_chunks == 1:
+            chunks = list(map(simulate_chunk, chunk_sizes, seed_sequences))
+        else:
+            with ProcessPoolExecutor(max_workers=settings.max_workers) as executor:
+                chunks = list(executor.map(simulate_chunk, chunk_sizes, seed_sequences))
 
-            equity_growth = EquityGrowthCalculator.calculate_equity_growth(property_value, payment_schedule, year)
+        percentiles = {"Year": np.arange(num_years)}
+        for name, values in zip(["Equity", "Cash Flow", "ROI"], zip(*chunks)):
+            bands = np.percentile(np.vstack(values), MONTE_CARLO_PERCENTILES, axis=0)
+            for percentile, band in zip(MONTE_CARLO_PERCENTILES, bands):
+                percentiles[f"{name} P{percentile}"] = band
 
-            future_running_costs = running_costs * (1 + property_details.annual_rent_appreciation) ** year
-            future_monthly_rent = (
-                property_details.monthly_rent * (1 + property_details.annual_rent_appreciation) ** year
-            )
+        return pd.DataFrame(percentiles)
 
-            # Calculate the monthly rental income
-            monthly_rental_income = RentalIncomeCalculator.calculate_monthly_rental_income(
-                future_monthly_rent, future_running_costs
-            )
-            # Calculate the annual cash flow
-            annual_cash_flow = RentalIncomeCalculator.calculate_annual_cash_flow(monthly_rental_income)
-
-            # Calculate the ROI
-            rental_roi = InvestmentMetricsCalculator.calculate_rental_roi(annual_cash_flow, total_cash_investment)
-
-            # Show equity growth as £ and human readable money format, cast as string like so "£100K"
-            equity_growth = f"£{equity_growth/1000:.0f}K"
-
-            yearly_metrics.append(
-                {
-                    "Year": year,
-                    "Gross Yield": gross_yield,
-                    "Net Yield": net_yield,
-                    "Rental ROI": f"{rental_roi:.2%}",
-                    "equity": equity_growth,
-                }
-            )
+    @timed_span
+    def run_sweep(
+        self,
+        property_details: PropertyDetails,
+        investment_details: InvestmentDetails,
+        investor_type: InvestorType,
+        num_years: int,
+        grid: Dict[str, List[float]],
+        metric: str = "total_roi",
+        ascending: bool = False,
+        chunk_size: int = 10000,
+        max_workers: Optional[int] = 1,
+    ) -> pd.DataFrame:
+        """
+        Evaluate a simulation over the Cartesian product of a grid of inputs
 
-        yearly_metrics = pd.DataFrame(yearly_metrics)
+        The grid points are evaluated in vectorized chunks, optionally spread over a process pool.
 
-        return total_cash_investment, mortgage_payment, yearly_metrics
+        :param property_details: the base details of the property investment
+        :param investment_details: the base details of the investment
+        :param investor_type: the type of investor
+        :param num_years: the number of years to project
+        :param grid: the values to sweep for each field of the property or investment details
+        :param metric: the metric to rank the points by
+        :param ascending: whether lower values of the metric rank first
+        :param chunk_size: the number of points evaluated at once
+        :param max_workers: the number of worker processes, 1 evaluates the chunks in this process
+        :return: a DataFrame with the swept inputs and the metrics of every point, ranked by the metric
+        """
+        if chunk_size < 1:
+            raise ValueError(f"The sweep chunk size must be at least 1, got {chunk_size}")
+        columns = expand_sweep_grid(property_details, investment_details, grid)
+        num_points = len(columns["purchase_price"])
+        chunks = [
+            {field: values[start : start + chunk_size] for field, values in columns.items()}
+            for start in range(0, num_points, chunk_size)
+        ]
+        evaluate_chunk = partial(evaluate_sweep_points, investor_type=investor_type, num_years=num_years)
+
+        if max_workers == 1 or len(chunks) == 1:
+            results = list(map(evaluate_chunk, chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(evaluate_chunk, chunks))
+
+        sweep = pd.DataFrame({field: columns[field] for field in grid})
+        for name in results[0]:
+            sweep[name] = np.concatenate([result[name] for result in results])
+        if metric not in sweep:
+            raise ValueError(f"Unknown sweep metric: {metric}")
+
+        return sweep.sort_values(metric, ascending=ascending, ignore_index=True)
@@ -0,0 +1,189 @@
+import datetime
+import threading
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from property_tracker.repositories.valuation import CHANGED_VALUATIONS, ValuationRepository
+
+
+class PropertyValuation(NamedTuple):
+    """
+    Represents the valuation of a property at a date
+    """
+
+    property_id: int
+    valuation_date: datetime.date
+    valuation_amount: float
+
+
+class ValuationIndex:
+    """
+    The valuation history of every property, in memory, sorted by date
+
+    The history is read in one query on first use, and again in full when it is used with another database. A lookup
+    at a date is a bisection of the dates of the property, so it costs O(log n) in the number of its valuations.
+    Invalidating a property drops only its entry, which is read again, alone, on its next lookup. The index is safe to
+    share between threads, its lock is never held during a query.
+
+    Only the writes of this process invalidate the index, so it suits short-lived processes such as the commands. Long
+    running readers of a database written by other processes query the latest valuations instead.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._bind = None
+        self._generation = 0
+        self._dates: Dict[int, List[datetime.date]] = {}
+        self._amounts: Dict[int, List[float]] = {}
+        self._stale: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _group(rows):
+        dates: Dict[int, List[datetime.date]] = {}
+        amounts: Dict[int, List[float]] = {}
+        for property_id, valuation_date, valuation_amount in rows:
+            dates.setdefault(property_id, []).append(valuation_date)
+            amounts.setdefault(property_id, []).append(valuation_amount)
+        return dates, amounts
+
+    def refresh(self, valuation_repository: ValuationRepository):
+        """
+        Read the history of every property on first use, and of the invalidated properties afterwards
+
+        The history is read without the lock and swapped in under it, the lists of a property are replaced whole, so
+        lookups running meanwhile see either the old or the new history. Invalidations made during the read are kept
+        for the next refresh.
+        """
+        bind = valuation_repository.db.get_bind()
+        with self._lock:
+            reload = not self.loaded or self._bind is not bind
+            generation = self._generation
+            stale = set(self._stale)
+        if not reload and not stale:
+            return
+
+        if reload:
+            dates, amounts = self._group(valuation_repository.get_valuation_history())
+        else:
+            dates, amounts = self._group(valuation_repository.get_valuation_history(sorted(stale)))
+
+        with self._lock:
+            if generation != self._generation:
+                # the whole index was invalidated during the read, the next refresh reads it again
+                return
+            if reload:
+                self._dates, self._amounts = dates, amounts
+                self._bind = bind
+                self.loaded = True
+            else:
+                for property_id in stale:
+                    if property_id in dates:
+                        self._dates[property_id] = dates[property_id]
+                        self._amounts[property_id] = amounts[property_id]
+                    else:
+                        self._dates.pop(property_id, None)
+                        self._amounts.pop(property_id, None)
+            self._stale -= stale
+
+    def invalidate(self, property_ids: Optional[Iterable[int]] = None):
+        """
+        Drop the entries of properties, of every property when not given
+        """
+        with self._lock:
+            if property_ids is None:
+                self.loaded = False
+                self._generation += 1
+                self._stale.clear()
+            else:
+                self._stale.update(property_ids)
+
+    def as_of(self, property_id: int, as_of: Optional[datetime.date] = None) -> Optional[PropertyValuation]:
+        """
+        Get the valuation of a property at a date, the last one of the day when it was valued several times
+
+        :param property_id: the id of the property
+        :param as_of: the date of the valuation, the latest valuation when not given
+        :return: the valuation, None when the property was not valued by that date
+        """
+        dates = self._dates.get(property_id)
+        if not dates:
+            return None
+        position = len(dates) if as_of is None else bisect_right(dates, as_of)
+        if position == 0:
+            return None
+        return PropertyValuation(property_id, dates[position - 1], self._amounts[property_id][position - 1])
+
+    def all_as_of(self, as_of: Optional[datetime.date] = None) -> Dict[int, PropertyValuation]:
+        """
+        Get the valuation of every property valued by a date, by property id
+        """
+        valuations = {}
+        for property_id in list(self._dates):
+            valuation = self.as_of(property_id, as_of)
+            if valuation is not None:
+                valuations[property_id] = valuation
+        return valuations
+
+
+# The valuation index of the process, valuation writes invalidate the entries of their properties when they commit
+VALUATION_INDEX = ValuationIndex()
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_valuations(session: Session):
+    property_ids = session.info.pop(CHANGED_VALUATIONS, None)
+    if property_ids:
+        VALUATION_INDEX.invalidate(property_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_changed_valuations(session: Session, previous_transaction):
+    # A savepoint rolled back leaves the writes of the enclosing transaction to be committed
+    if previous_transaction.parent is None:
+        session.info.pop(CHANGED_VALUATIONS, None)
+
+
+class ValuationService:
+    """
+    Service class for the valuations of the properties
+    """
+
+    def __init__(self, valuation_repository: ValuationRepository, index: Optional[ValuationIndex] = None):
+        self.valuation_repository = valuation_repository
+        self.index = VALUATION_INDEX if index is None else index
+
+    def get_valuation(self, property_id: int, as_of: Optional[datetime.date] = None) -> Optional[PropertyValuation]:
+        """
+        Get the valuation of a property at a date, from the index
+        :param property_id: int
+        :param as_of: date, the latest valuation when not given
+        :return: PropertyValuation or None
+        """
+
+        self.index.refresh(self.valuation_repository)
+        return self.index.as_of(property_id, as_of)
+
+    def get_valuations(self, as_of: Optional[datetime.date] = None) -> Dict[int, PropertyValuation]:
+        """
+        Get the valuation of every property at a date, from the index
+        :param as_of: date, the latest valuations when not given
+        :return: Dict[int, PropertyValuation], by property id
+        """
+
+        self.index.refresh(self.valuation_repository)
+        return self.index.all_as_of(as_of)
+
+    def query_valuations(self, as_of: Optional[datetime.date] = None) -> Dict[int, PropertyValuation]:
+        """
+        Get the valuation of every property at a date from the database, in one query, without the index
+        :param as_of: date, the latest valuations when not given
+        :return: Dict[int, PropertyValuation], by property id
+        """
+
+        return {
+            row.property_id: PropertyValuation(*row) for row in self.valuation_repository.get_latest_valuations(as_of)
+        }
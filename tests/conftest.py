@@ -0,0 +1,48 @@
+import pytest
+
+from property_tracker import database
+from property_tracker.database import DatabaseSettings
+from property_tracker.models.investor import Investor, InvestorType
+
+
+@pytest.fixture
+def engine():
+    """
+    An in-memory SQLite database with the tables, configured as the shared database so that commands use it too
+    """
+    engine = database.configure(DatabaseSettings(url="sqlite://"))
+    yield engine
+    database.configure(DatabaseSettings(url="sqlite://"))
+
+
+@pytest.fixture
+def session(engine):
+    """
+    The shared session on the test database
+    """
+    return database.get_session()
+
+
+@pytest.fixture
+def investor(session):
+    """
+    Add an investor, Ada Lovelace, a sole trader unless other fields are given
+    """
+
+    def add_investor(**fields) -> Investor:
+        investor = Investor(
+            **{
+                "first_name": "Ada",
+                "last_name": "Lovelace",
+                "email": "ada@example.com",
+                "phone_number": "0123456789",
+                "address": "1 Example Street",
+                "investor_type": InvestorType.SOLE_TRADER,
+                **fields,
+            }
+        )
+        session.add(investor)
+        session.commit()
+        return investor
+
+    return add_investor
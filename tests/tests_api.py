@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from property_tracker.api import create_app
+from property_tracker.database import DatabaseSettings
+
+INVESTOR = {
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "email": "ada@example.com",
+    "phone_number": "0123456789",
+    "address": "1 Example Street",
+    "investor_type": "Sole Trader",
+}
+
+PROPERTY = {
+    "address": "1 Test Road",
+    "postcode": "E1 1AA",
+    "city": "London",
+    "no_of_bedrooms": 2,
+    "no_of_bathrooms": 1,
+    "sqm": 65.5,
+    "floor": 3,
+    "furnished": True,
+    "property_type": "Flat",
+    "status": "Rented",
+    "monthly_rent": 1200,
+}
+
+
+@pytest.fixture
+def client():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with TestClient(create_app(DatabaseSettings(url="sqlite://"), executor=executor)) as client:
+            yield client
+
+
+def test_create_and_list_records(client):
+    assert client.post("/investors", json=INVESTOR).status_code == 201
+    inv_property = client.post("/properties", json=PROPERTY).json()
+    purchase = client.post(
+        "/purchases",
+        json={
+            "property_id": inv_property["id"],
+            "investor_id": 1,
+            "transaction_date": "2024-06-01",
+            "transaction_amount": 250000,
+            "cash_payment": 62500,
+            "annual_interest_rate": 4.5,
+            "principal": 187500,
+            "payment_term": 25,
+        },
+    )
+    rent = client.post(
+        "/rent", json={"property_id": 1, "investor_id": 1, "amount": 1200, "date": "2024-07-01", "period": "2024-06"}
+    )
+
+    assert purchase.status_code == 201
+    assert rent.json()["period"] == "2024-06-01"
+    assert client.get("/properties/1").json()["monthly_rent"] == 1200
+    assert [expense["description"] for expense in client.get("/expenses", params={"property_id": 1}).json()] == [
+        "Legal Fees",
+        "Stamp Duty",
+    ]
+    assert client.get("/mortgages").json()[0]["principal"] == 187500
+    assert client.get("/portfolio/properties").json()[0]["rent_collected"] == 1200
+    assert client.get("/investors", params={"after_id": 1}).json() == []
+
+
+def test_errors(client):
+    assert client.get("/properties/42").status_code == 404
+    response = client.post(
+        "/purchases",
+        json={
+            "property_id": 1,
+            "investor_id": 42,
+            "transaction_date": "2024-06-01",
+            "transaction_amount": 250000,
+            "cash_payment": 62500,
+            "annual_interest_rate": 4.5,
+            "principal": 187500,
+            "payment_term": 25,
+        },
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Investor not found"}
+
+
+def test_simulation(client):
+    response = client.post(
+        "/simulations",
+        json={
+            "property_details": {
+                "purchase_price": 250000,
+                "monthly_rent": 1200,
+                "insurance": 30,
+                "service_charge": 100,
+                "ground_rent": 20,
+                "annual_price_appreciation": 0.03,
+                "annual_rent_appreciation": 0.02,
+            },
+            "investment_details": {
+                "down_payment": 62500,
+                "interest_rate": 4.5,
+                "payment_term": 25,
+                "legal_fees": 2000,
+                "refurbishment_cost": 5000,
+                "furnishing_cost": 3000,
+            },
+            "investor_type": "Sole Trader",
+            "num_years": 5,
+        },
+    )
+
+    result = response.json()
+    assert response.status_code == 200
+    assert result["total_cash_investment"] == 62500 + 7500 + 2000 + 5000 + 3000
+    assert [metrics["Year"] for metrics in result["yearly_metrics"]] == [0, 1, 2, 3, 4]
+    assert result["yearly_metrics"][0]["equity"] == 62500
+
+
+def test_responses_report_their_statements(client):
+    response = client.get("/properties")
+
+    assert response.headers["X-DB-Statements"] == "1"
+    assert float(response.headers["X-DB-Time-Ms"]) > 0
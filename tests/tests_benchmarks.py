@@ -0,0 +1,49 @@
+import json
+
+from typer.testing import CliRunner
+
+from benchmarks.suite import app, compare_results, run_suite
+
+
+def results(**medians):
+    return {"commit": None, "benchmarks": {name: {"median_ms": median} for name, median in medians.items()}}
+
+
+def test_compare_results_flags_changes_beyond_the_threshold():
+    comparison = compare_results(
+        results(slower=10.0, faster=10.0, same=10.0, removed=1.0),
+        results(slower=12.0, faster=5.0, same=10.5, added=1.0),
+        threshold=0.1,
+    )
+
+    assert {row["name"]: row["status"] for row in comparison} == {
+        "added": "added",
+        "faster": "improved",
+        "removed": "removed",
+        "same": "unchanged",
+        "slower": "regressed",
+    }
+
+
+def test_run_suite_times_the_selected_benchmarks():
+    suite = run_suite(rows=[10], years=[5], repeat=2, match="rows=10]")
+
+    assert sorted(suite["benchmarks"]) == [
+        "repository.get_all_expenses[rows=10]",
+        "repository.get_all_investors[rows=10]",
+        "repository.get_all_mortgages[rows=10]",
+        "repository.get_all_properties[rows=10]",
+        "repository.get_properties_frame[rows=10]",
+    ]
+    assert all(timing["repeat"] == 2 for timing in suite["benchmarks"].values())
+
+
+def test_compare_exits_with_an_error_on_regressions(tmp_path):
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps(results(purchase=10.0)))
+    new.write_text(json.dumps(results(purchase=20.0)))
+
+    assert CliRunner().invoke(app, ["compare", str(old), str(old)]).exit_code == 0
+    result = CliRunner().invoke(app, ["compare", str(old), str(new)])
+    assert result.exit_code == 1
+    assert "regressed" in result.stdout
@@ -0,0 +1,49 @@
+import importlib
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+import main
+from benchmarks.startup import import_times, total_import_time_ms
+
+HEAVY_MODULES = {"pandas", "numpy", "sqlalchemy", "pydantic", "property_tracker.database"}
+
+
+def imported(times):
+    return {name.strip() for name in times}
+
+
+def test_help_does_not_import_commands():
+    times = import_times(["--help"])
+
+    assert not imported(times) & HEAVY_MODULES
+    assert total_import_time_ms(times) < 500
+
+
+@pytest.mark.parametrize("args", [["investor", "--help"], ["investor", "ls"], ["property", "ls"]])
+def test_commands_import_only_what_they_use(args):
+    times = import_times(args)
+
+    assert not imported(times) & {"pandas", "numpy", "pydantic", "property_tracker.services.simulate_v2"}
+
+
+def eager_app():
+    # the CLI as it was before the sub-commands were loaded lazily, every sub-app added with add_typer
+    app = typer.Typer()
+    app.callback()(main.callback)
+    for name, (import_path, help_text) in main.SUB_COMMANDS.items():
+        app.add_typer(importlib.import_module(import_path).app, name=name, help=help_text)
+    return app
+
+
+@pytest.mark.parametrize("args", [[]] + [[name] for name in main.SUB_COMMANDS])
+def test_lazy_help_matches_the_eager_app(args):
+    runner = CliRunner()
+
+    lazy = runner.invoke(main.app, args + ["--help"], prog_name="main.py")
+    eager = runner.invoke(eager_app(), args + ["--help"], prog_name="main.py")
+
+    assert lazy.exit_code == 0
+    assert lazy.output == eager.output
+    assert args == [] or "--install-completion" not in lazy.output
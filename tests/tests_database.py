@@ -0,0 +1,49 @@
+from sqlalchemy.pool import StaticPool
+
+from property_tracker import database
+from property_tracker.database import DatabaseSettings
+from property_tracker.migrations import upgrade
+from property_tracker.models.finance import Expense
+from property_tracker.models.investor import Investor
+
+
+def test_database_settings_from_env(monkeypatch):
+    monkeypatch.setenv("PROPERTY_TRACKER_DATABASE_URL", "postgresql://user:secret@db/portfolio")
+    monkeypatch.setenv("PROPERTY_TRACKER_DATABASE_POOL_SIZE", "20")
+    monkeypatch.setenv("PROPERTY_TRACKER_DATABASE_POOL_PRE_PING", "false")
+    monkeypatch.setenv("PROPERTY_TRACKER_DATABASE_STATEMENT_TIMEOUT", "5000")
+
+    settings = DatabaseSettings.from_env()
+
+    assert settings.url == "postgresql://user:secret@db/portfolio"
+    assert (settings.pool_size, settings.max_overflow, settings.pool_pre_ping) == (20, 10, False)
+    assert settings.statement_timeout == 5000
+    assert not settings.is_sqlite
+
+
+def test_in_memory_sqlite_is_shared_between_sessions(engine, investor):
+    investor()
+
+    assert isinstance(engine.pool, StaticPool)
+    assert database.get_engine() is engine
+    with database.get_session_factory()() as session:
+        assert session.query(Investor).count() == 1
+
+
+def test_upgrade_creates_missing_indexes(engine):
+    for index in Expense.__table__.indexes:
+        index.drop(engine)
+
+    created = upgrade(engine)
+
+    assert created == sorted(index.name for index in Expense.__table__.indexes)
+    assert upgrade(engine) == []
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN SELECT * FROM expenses WHERE property_id = 1").all()
+    assert "ix_expenses_property_id_date" in plan[0][-1]
+
+
+def test_sqlite_connections_enforce_foreign_keys_and_have_power(engine):
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert connection.exec_driver_sql("SELECT power(1.5, 2), power(NULL, 2)").one() == (2.25, None)
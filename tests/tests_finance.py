@@ -1,7 +1,15 @@
+import numpy as np
 import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 
+from property_tracker.models.finance import Expense, Mortgage, PropertyOwnership, PropertyTransaction, Valuation
 from property_tracker.models.investor import InvestorType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, InvestorRepository
+from property_tracker.services import FinanceService
 from property_tracker.services.finance import calculate_stamp_duty
+from property_tracker.services.simulate_v2 import STAMP_DUTY_RULES, StampDutyCalculator
 
 
 @pytest.mark.parametrize(
@@ -9,8 +17,120 @@ from property_tracker.services.finance import calculate_stamp_duty
     [
         (250000, InvestorType.SOLE_TRADER, 7500),
         (600000, InvestorType.LIMITED_COMPANY, 38000),
+        (1000000, InvestorType.SOLE_TRADER, 71250),
+        (0, InvestorType.LIMITED_COMPANY, 0),
     ],
 )
 def test_calculate_stamp_duty(amount, investor_type, expected):
     result = calculate_stamp_duty(amount, investor_type)
     assert result == expected
+
+
+def stamp_duty_brackets(investor_type):
+    return next(brackets for rule_type, brackets in STAMP_DUTY_RULES.items() if rule_type.value == investor_type.value)
+
+
+def reference_stamp_duty(price, investor_type):
+    # an independent loop over the bracket definitions, taxing the part of the price in each bracket at its rate
+    brackets = stamp_duty_brackets(investor_type)
+    upper_bounds = [lower for lower, _ in brackets[1:]] + [float("inf")]
+    return sum(max(0, min(price, upper) - lower) * rate for (lower, rate), upper in zip(brackets, upper_bounds))
+
+
+@pytest.mark.parametrize(
+    "amount, investor_type, expected",
+    [
+        (249999, InvestorType.SOLE_TRADER, 7499.97),
+        (250001, InvestorType.SOLE_TRADER, 7500.08),
+        (925000, InvestorType.SOLE_TRADER, 61500),
+        (925001, InvestorType.SOLE_TRADER, 61500.13),
+        (1500000, InvestorType.SOLE_TRADER, 136250),
+        (1500001, InvestorType.SOLE_TRADER, 136250.15),
+        (125000, InvestorType.LIMITED_COMPANY, 3750),
+        (125001, InvestorType.LIMITED_COMPANY, 3750.05),
+        (250000, InvestorType.LIMITED_COMPANY, 10000),
+        (925000, InvestorType.LIMITED_COMPANY, 64000),
+        (1500001, InvestorType.LIMITED_COMPANY, 138750.15),
+    ],
+)
+def test_calculate_stamp_duty_at_the_bracket_edges(amount, investor_type, expected):
+    assert calculate_stamp_duty(amount, investor_type) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("investor_type", [InvestorType.SOLE_TRADER, InvestorType.LIMITED_COMPANY])
+def test_calculate_stamp_duty_for_array_of_prices(investor_type):
+    edges = [
+        lower + offset
+        for lower, _ in stamp_duty_brackets(investor_type)
+        for offset in (-1, 0, 1)
+        if lower + offset >= 0
+    ]
+    prices = np.concatenate([np.linspace(0, 3000000, 1001), edges])
+    result = StampDutyCalculator.calculate_stamp_duty(prices, investor_type)
+    assert result == pytest.approx([reference_stamp_duty(price, investor_type) for price in prices])
+
+
+@pytest.fixture
+def session(session, investor):
+    investor()
+    session.add(Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.VACANT))
+    session.commit()
+    return session
+
+
+def purchase(session, investor_id=1, property_id=1):
+    return FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+        property_id=property_id,
+        investor_id=investor_id,
+        transaction_date="2024-06-01",
+        transaction_amount=250000,
+        transaction_notes="Test purchase",
+        cash_payment=62500,
+        ownership_share=100,
+        annual_interest_rate=4.5,
+        principal=187500,
+        payment_term=25,
+    )
+
+
+def test_purchase_property_commits_once(session):
+    commits = []
+    event.listen(session.bind, "commit", commits.append)
+
+    ownership = purchase(session)
+
+    assert len(commits) == 1
+    assert ownership.transaction.mortgage.principal == 187500
+    assert session.query(Valuation).one().valuation_amount == 250000
+    assert sorted((expense.description, expense.amount) for expense in session.query(Expense)) == [
+        ("Legal Fees", 2000),
+        ("Stamp Duty", 7500),
+    ]
+
+
+def test_purchase_property_leaves_no_partial_state(session):
+    with pytest.raises(ValueError):
+        purchase(session, investor_id=2)
+
+    for model in [Mortgage, PropertyTransaction, Valuation, PropertyOwnership, Expense]:
+        assert session.query(model).count() == 0
+
+
+def test_purchase_of_a_missing_property_violates_its_foreign_key(session):
+    with pytest.raises(IntegrityError):
+        purchase(session, property_id=2)
+
+    for model in [Mortgage, PropertyTransaction, Valuation, PropertyOwnership, Expense]:
+        assert session.query(model).count() == 0
+
+
+def test_purchase_property_rolls_back_on_failure(session, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("Expense could not be created")
+
+    monkeypatch.setattr(FinanceService, "generate_expense", fail)
+    with pytest.raises(RuntimeError):
+        purchase(session)
+
+    for model in [Mortgage, PropertyTransaction, Valuation, PropertyOwnership, Expense]:
+        assert session.query(model).count() == 0
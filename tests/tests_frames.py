@@ -0,0 +1,48 @@
+import pytest
+
+from property_tracker.models.investor import InvestorType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import InvestorRepository, PropertyRepository
+
+
+@pytest.fixture
+def session(session, investor):
+    session.add_all(
+        [
+            Property(address=f"{i} High Street", property_type=PropertyType.SEMI_DETACHED, status=status)
+            for i, status in enumerate([Status.RENTED, Status.UNDER_REPAIR, None], start=1)
+        ]
+    )
+    investor(investor_type=InvestorType.LIMITED_COMPANY)
+    session.expunge_all()
+    return session
+
+
+def test_properties_frame_projects_columns_and_decodes_enums(session):
+    frame = PropertyRepository(session).get_properties_frame(["id", "address", "status", "property_type"])
+
+    assert list(frame.columns) == ["id", "address", "status", "property_type"]
+    assert frame["status"].tolist()[:2] == ["Rented", "Under Repair"]
+    assert frame["status"].isna().tolist() == [False, False, True]
+    assert frame["property_type"].unique().tolist() == ["Semi-Detached"]
+    # the rows are read without loading any instance into the session
+    assert len(session.identity_map) == 0
+
+
+def test_properties_frame_pages_by_id(session):
+    frame = PropertyRepository(session).get_properties_frame(["id"], limit=1, after_id=1)
+
+    assert frame["id"].tolist() == [2]
+
+
+def test_investors_frame_has_every_column(session):
+    frame = InvestorRepository(session).get_investors_frame()
+
+    assert "_sa_instance_state" not in frame.columns
+    assert frame.loc[0, "investor_type"] == "Limited Company"
+    assert frame.loc[0, "email"] == "ada@example.com"
+
+
+def test_unknown_columns_are_rejected(session):
+    with pytest.raises(ValueError, match="Unknown properties columns: rooms"):
+        PropertyRepository(session).get_properties_frame(["id", "rooms"])
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from property_tracker.models.finance import Expense
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import ImportRepository
+from property_tracker.services import ImportService
+
+PROPERTIES_CSV = """address,postcode,city,description,no_of_bedrooms,no_of_bathrooms,sqm,floor,furnished,property_type,status
+1 Test Road,E1 1AA,London,,2,1,65.5,3,true,Flat,Rented
+2 Test Road,E1 1AB,London,Corner flat,1,1,48,0,false,Studio,Vacant
+3 Test Road,E1 1AC,London,,two,1,48,0,false,Studio,Vacant
+1 Test Road,E1 1AA,London,,2,1,65.5,3,true,Flat,Rented
+4 Test Road,E1 1AD,London,,3,2,90,1,false,Castle,Vacant
+"""
+
+
+@pytest.fixture
+def import_service(session):
+    return ImportService(ImportRepository(session))
+
+
+@pytest.fixture
+def expenses_path(import_service, investor, tmp_path):
+    investor()
+    db = import_service.import_repository.db
+    db.add(Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED))
+    db.commit()
+    return tmp_path / "expenses.jsonl"
+
+
+def test_import_file_validates_and_rejects_rows(import_service, tmp_path):
+    path = tmp_path / "properties.csv"
+    path.write_text(PROPERTIES_CSV)
+
+    result = import_service.import_file("properties", path, chunk_size=2)
+
+    db = import_service.import_repository.db
+    assert (result.rows_read, result.rows_imported, result.rows_rejected) == (5, 2, 3)
+    assert [p.property_type for p in db.query(Property).order_by(Property.id)] == [
+        PropertyType.FLAT,
+        PropertyType.STUDIO,
+    ]
+    rejects = [json.loads(line) for line in (tmp_path / "properties.rejects.jsonl").read_text().splitlines()]
+    assert [reject["row"] for reject in rejects] == [3, 4, 5]
+
+
+def test_import_file_reads_json_lines(import_service, expenses_path, tmp_path):
+    expenses_path.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "description": "Repairs",
+                    "amount": 100 + i,
+                    "date": "2024-01-0%d" % (i + 1),
+                    "investor_id": 1,
+                    "property_id": 1,
+                }
+            )
+            for i in range(3)
+        )
+    )
+
+    result = import_service.import_file("expenses", expenses_path)
+
+    assert result.rows_imported == 3
+    assert not (tmp_path / "expenses.rejects.jsonl").exists()
+    assert sum(expense.amount for expense in import_service.import_repository.db.query(Expense)) == 303
+
+
+def test_import_file_rejects_rows_of_missing_parents(import_service, expenses_path, tmp_path):
+    expenses_path.write_text(
+        '{"description": "Repairs", "amount": 100, "date": "2024-01-01", "investor_id": 1, "property_id": 1}\n'
+        '{"description": "Repairs", "amount": 200, "date": "2024-01-02", "investor_id": 1, "property_id": 2}\n'
+        '{"description": "Repairs", "amount": 300, "date": "2024-01-03", "investor_id": 2, "property_id": 1}\n'
+    )
+
+    result = import_service.import_file("expenses", expenses_path)
+
+    assert (result.rows_imported, result.rows_rejected) == (1, 2)
+    rejects = [json.loads(line) for line in (tmp_path / "expenses.rejects.jsonl").read_text().splitlines()]
+    assert [(reject["row"], reject["errors"]) for reject in rejects] == [
+        (2, "Violates a database constraint"),
+        (3, "Violates a database constraint"),
+    ]
+    assert [expense.amount for expense in import_service.import_repository.db.query(Expense)] == [100]
@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+
+from property_tracker.instrumentation import RepeatedStatementWarning, count_statements
+from property_tracker.models.finance import Valuation, ValuationType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository
+from property_tracker.services import FinanceService
+
+
+@pytest.fixture
+def session(session, investor):
+    investor()
+    for i in range(12):
+        inv_property = Property(address=f"{i} High Street", property_type=PropertyType.FLAT, status=Status.VACANT)
+        inv_property.valuations.append(
+            Valuation(
+                valuation_date=datetime.date(2024, 1, 1),
+                valuation_amount=250000,
+                valuation_type=ValuationType.PURCHASE,
+            )
+        )
+        session.add(inv_property)
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+def test_purchase_stays_within_its_statement_budget(session):
+    with count_statements(max_statements=12) as stats:
+        FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+            property_id=1,
+            investor_id=1,
+            transaction_date=datetime.date(2024, 6, 1),
+            transaction_amount=250000,
+            transaction_notes="",
+            cash_payment=62500,
+            ownership_share=100,
+            annual_interest_rate=4.5,
+            principal=187500,
+            payment_term=25,
+        )
+
+    assert stats.commits == 1
+    assert stats.round_trips == stats.statements + 1
+    assert stats.db_time > 0
+
+
+def test_lazy_loads_in_a_loop_are_reported(session):
+    with pytest.warns(RepeatedStatementWarning, match="ran 12 times"):
+        with count_statements() as stats:
+            properties = PropertyRepository(session).get_all_properties()
+            assert sum(len(inv_property.valuations) for inv_property in properties) == 12
+
+    assert stats.statements == 13
+    assert [count for _, count in stats.repeated()] == [12]
+
+
+def test_nested_scopes_count_the_inner_statements(session):
+    with count_statements() as outer:
+        PropertyRepository(session).get_property(1)
+        with count_statements() as inner:
+            PropertyRepository(session).get_property(2)
+
+    assert (outer.statements, inner.statements) == (2, 1)
+
+
+def test_exceeding_the_budget_fails(session):
+    with pytest.raises(AssertionError, match="2 statements exceed the budget of 1"):
+        with count_statements(max_statements=1):
+            PropertyRepository(session).get_property(1)
+            PropertyRepository(session).get_property(2)
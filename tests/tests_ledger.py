@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+
+from property_tracker.models.finance import PropertyMonthlyLedger
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, ImportRepository, InvestorRepository, LedgerRepository
+from property_tracker.services import FinanceService, ImportService, LedgerService
+
+
+@pytest.fixture
+def session(session, investor):
+    investor()
+    session.add(Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED))
+    session.commit()
+
+    finance_service = FinanceService(FinanceRepository(session), InvestorRepository(session))
+    finance_service.purchase_property(
+        property_id=1,
+        investor_id=1,
+        transaction_date="2024-06-15",
+        transaction_amount=250000,
+        transaction_notes="Test purchase",
+        cash_payment=62500,
+        ownership_share=100,
+        annual_interest_rate=4.5,
+        principal=187500,
+        payment_term=25,
+    )
+    finance_service.collect_rent(property_id=1, investor_id=1, amount=1200, date="2024-07-01")
+    finance_service.collect_rent(property_id=1, investor_id=1, amount=1200, date="2024-07-28")
+    finance_service.generate_expense("Boiler", 800, "2024-07-10", investor_id=1, property_id=1)
+    return session
+
+
+def ledger_rows(session):
+    return [
+        (row.month, row.rent_collected, row.expenses, round(row.mortgage_payments, 2), row.capital_invested)
+        for row in LedgerService(LedgerRepository(session)).get_ledger(1, as_of=datetime.date(2049, 6, 30))
+    ]
+
+
+def test_ledger_is_updated_incrementally(session):
+    june, july, august = LedgerService(LedgerRepository(session)).get_ledger(1, as_of=datetime.date(2024, 8, 31))
+
+    assert (june.month, june.expenses, june.capital_invested, june.mortgage_payments) == (
+        datetime.date(2024, 6, 1),
+        2000 + 7500,
+        62500,
+        0,
+    )
+    assert (july.rent_collected, july.expenses) == (2400, 800)
+    assert july.mortgage_payments == pytest.approx(1042.19, abs=0.01)
+    assert july.net_cash_flow == pytest.approx(2400 - 800 - 1042.19, abs=0.01)
+    assert august.rent_collected == 0
+    # the whole schedule of the mortgage is booked
+    assert session.query(PropertyMonthlyLedger).count() == 1 + 12 * 25
+
+
+def test_rebuild_matches_the_incremental_ledger(session):
+    incremental = ledger_rows(session)
+
+    rows = LedgerService(LedgerRepository(session)).rebuild()
+
+    assert rows == len(incremental)
+    assert ledger_rows(session) == incremental
+
+
+def test_ledger_is_read_up_to_a_date(session):
+    ledger_service = LedgerService(LedgerRepository(session))
+
+    # the purchase month, then the payments of July 2024 to June 2025
+    ledger = ledger_service.get_ledger(1, as_of=datetime.date(2025, 6, 14))
+    assert len(ledger) == 1 + 12
+    assert ledger[-1].month == datetime.date(2025, 6, 1)
+    assert len(ledger_service.get_ledger(1, as_of=datetime.date(2049, 6, 15))) == 1 + 12 * 25
+
+
+def test_import_adds_expenses_to_the_ledger(session, tmp_path):
+    path = tmp_path / "expenses.jsonl"
+    path.write_text(
+        '{"description": "Repairs", "amount": 200, "date": "2024-07-20", "investor_id": 1, "property_id": 1}\n'
+        '{"description": "Repairs", "amount": 300, "date": "2024-08-20", "investor_id": 1, "property_id": 1}\n'
+    )
+
+    ImportService(ImportRepository(session)).import_file("expenses", path)
+
+    july, august = LedgerService(LedgerRepository(session)).get_ledger(1, "2024-07-01", "2024-08-31")
+    assert (july.expenses, august.expenses) == (1000, 300)
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+from typer.testing import CliRunner
+
+from property_tracker.commands.finance import app
+from property_tracker.models.finance import Expense
+from property_tracker.repositories import FinanceRepository
+
+
+@pytest.fixture
+def session(session):
+    session.add_all(
+        [Expense(description=f"Expense {i}", amount=i, date=datetime.date(2024, 1, 1)) for i in range(1, 26)]
+    )
+    session.commit()
+    return session
+
+
+def test_pages_by_offset_and_by_id_match(session):
+    finance_repository = FinanceRepository(session)
+
+    by_offset = finance_repository.get_all_expenses(limit=10, offset=10)
+    by_id = finance_repository.get_all_expenses(limit=10, after_id=by_offset[0].id - 1)
+
+    assert [expense.id for expense in by_offset] == list(range(11, 21))
+    assert by_id == by_offset
+    assert len(finance_repository.get_all_expenses(after_id=20)) == 5
+
+
+def test_iter_expenses_streams_every_row(session):
+    expenses = FinanceRepository(session).iter_expenses(after_id=5, batch_size=4)
+
+    assert [expense.amount for expense in expenses] == list(range(6, 26))
+
+
+def test_ls_stream_writes_csv(session):
+    result = CliRunner().invoke(app, ["ls", "expenses", "--stream", "--after-id", "20", "--limit", "2"])
+
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        "ID,Description,Amount,Date,Investor ID,Property ID",
+        "21,Expense 21,21.0,2024-01-01,None,None",
+        "22,Expense 22,22.0,2024-01-01,None,None",
+    ]
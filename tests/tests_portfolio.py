@@ -0,0 +1,151 @@
+import datetime
+
+import pytest
+
+from property_tracker.models.finance import Expense, Mortgage, RentalIncome, Valuation, ValuationType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import (
+    FinanceRepository,
+    InvestorRepository,
+    PortfolioRepository,
+    ValuationRepository,
+)
+from property_tracker.services import FinanceService, PortfolioService, ValuationService
+from property_tracker.services.simulate_v2 import MortgageCalculator
+
+
+@pytest.fixture
+def session(session, investor):
+    investor()
+    session.add(Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED))
+    session.add(Property(address="2 Test Road", property_type=PropertyType.HOUSE, status=Status.VACANT))
+    session.commit()
+
+    FinanceService(FinanceRepository(session), InvestorRepository(session)).purchase_property(
+        property_id=1,
+        investor_id=1,
+        transaction_date="2024-06-01",
+        transaction_amount=250000,
+        transaction_notes="Test purchase",
+        cash_payment=62500,
+        ownership_share=50,
+        annual_interest_rate=4.5,
+        principal=187500,
+        payment_term=25,
+    )
+    session.add_all(
+        [
+            Valuation(
+                property_id=1,
+                valuation_date=datetime.date(2025, 6, 1),
+                valuation_amount=270000,
+                valuation_type=ValuationType.PURCHASE,
+            ),
+            Expense(property_id=1, investor_id=1, description="Boiler", amount=1500, date=datetime.date(2025, 1, 1)),
+            RentalIncome(property_id=1, investor_id=1, amount=1200, date=datetime.date(2024, 7, 1)),
+            RentalIncome(property_id=1, investor_id=1, amount=1200, date=datetime.date(2024, 8, 1)),
+        ]
+    )
+    session.commit()
+    return session
+
+
+def mortgage_balance(months_paid):
+    return MortgageCalculator.calculate_balances(187500, 25, 4.5, months_paid).item()
+
+
+def test_property_summaries(session):
+    summaries = PortfolioService(PortfolioRepository(session)).get_property_summaries(datetime.date(2025, 12, 31))
+    # the payments of July 2024 to December 2025 have been made
+    balance = mortgage_balance(18)
+
+    assert [summary._asdict() for summary in summaries] == [
+        {
+            "property_id": 1,
+            "address": "1 Test Road",
+            "purchase_cost": 250000,
+            "latest_valuation": 270000,
+            "outstanding_principal": pytest.approx(balance),
+            "expenses": 2000 + 7500 + 1500,
+            "rent_collected": 2400,
+            "equity": pytest.approx(270000 - balance),
+        },
+        {
+            "property_id": 2,
+            "address": "2 Test Road",
+            "purchase_cost": 0,
+            "latest_valuation": 0,
+            "outstanding_principal": 0,
+            "expenses": 0,
+            "rent_collected": 0,
+            "equity": 0,
+        },
+    ]
+
+
+def test_summaries_as_of_an_earlier_date(session):
+    portfolio_service = PortfolioService(PortfolioRepository(session))
+
+    summary = portfolio_service.get_property_summaries(datetime.date(2024, 7, 15))[0]
+    assert summary.latest_valuation == 250000
+    assert summary.expenses == 2000 + 7500
+    assert summary.rent_collected == 1200
+    assert summary.outstanding_principal == pytest.approx(mortgage_balance(1))
+
+    assert portfolio_service.get_property_summaries(datetime.date(2024, 1, 1))[0].outstanding_principal == 0
+
+
+def test_investor_summaries_use_the_ownership_share(session):
+    portfolio_service = PortfolioService(PortfolioRepository(session))
+
+    (summary,) = portfolio_service.get_investor_summaries(datetime.date(2025, 12, 31))
+
+    assert summary.name == "Ada Lovelace"
+    assert summary.properties == 1
+    assert summary.purchase_cost == 125000
+    assert summary.latest_valuation == 135000
+    assert summary.outstanding_principal == pytest.approx(mortgage_balance(18))
+    assert summary.rent_collected == 2400
+    totals = portfolio_service.get_totals(portfolio_service.get_property_summaries(datetime.date(2049, 6, 1)))
+    assert totals["outstanding_principal"] == pytest.approx(0, abs=1e-6)
+    assert totals["equity"] == pytest.approx(270000)
+
+
+def test_interest_free_mortgages_are_repaid_linearly(session):
+    session.add(
+        Mortgage(
+            property_id=2,
+            investor_id=1,
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2035, 1, 1),
+            principal=120000,
+            annual_interest_rate=0,
+            payment_term=10,
+        )
+    )
+    session.commit()
+
+    summary = PortfolioService(PortfolioRepository(session)).get_property_summaries(datetime.date(2025, 12, 31))[1]
+    assert summary.outstanding_principal == pytest.approx(120000 - 11 * 1000)
+
+
+@pytest.mark.parametrize("as_of", [datetime.date(2024, 1, 1), datetime.date(2024, 7, 15), datetime.date(2025, 12, 31)])
+def test_summaries_with_the_valuation_index_match_the_query(session, as_of):
+    session.add(
+        Valuation(
+            property_id=2,
+            valuation_date=datetime.date(2024, 7, 1),
+            valuation_amount=180000,
+            valuation_type=ValuationType.PURCHASE,
+        )
+    )
+    session.commit()
+    portfolio_service = PortfolioService(PortfolioRepository(session))
+    indexed_service = PortfolioService(PortfolioRepository(session), ValuationService(ValuationRepository(session)))
+
+    for get_summaries in ("get_property_summaries", "get_investor_summaries"):
+        summaries = getattr(portfolio_service, get_summaries)(as_of)
+        indexed_summaries = getattr(indexed_service, get_summaries)(as_of)
+        assert [summary._asdict() for summary in indexed_summaries] == [
+            pytest.approx(summary._asdict()) for summary in summaries
+        ]
@@ -0,0 +1,65 @@
+import pstats
+
+from typer.testing import CliRunner
+
+import main
+from property_tracker.models.finance import Mortgage
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.profiling import record_spans, timed_span
+
+
+@timed_span
+def add(a, b):
+    return a + b
+
+
+@timed_span(name="custom")
+def fail():
+    raise ValueError("failed")
+
+
+def test_timed_span_records_only_inside_record_spans():
+    assert add(1, 2) == 3
+
+    with record_spans() as spans:
+        add(1, 2)
+        add(3, 4)
+        try:
+            fail()
+        except ValueError:
+            pass
+
+    assert len(spans["add"]) == 2
+    assert len(spans["custom"]) == 1
+    add(5, 6)
+    assert len(spans["add"]) == 2
+
+
+def test_profile_option_writes_stats_and_prints_summary(engine, tmp_path):
+    output = tmp_path / "investor.pstats"
+
+    result = CliRunner().invoke(
+        main.app, ["--profile", "--profile-output", str(output), "--profile-top", "5", "investor", "ls"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Top 5 functions by cumulative time" in result.output
+    assert pstats.Stats(str(output)).total_calls > 0
+
+
+def test_profile_the_purchase_command(session, investor, tmp_path):
+    investor()
+    session.add(Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.VACANT))
+    session.commit()
+    output = tmp_path / "purchase.pstats"
+
+    result = CliRunner().invoke(
+        main.app,
+        ["--profile", "--profile-output", str(output), "property", "purchase", "1", "1", "2024-06-01", "250000"]
+        + ["Test purchase", "62500", "100", "4.5", "187500", "--mortgage-payment-term", "20"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Property purchased successfully." in result.output
+    assert "FinanceService.purchase_property" in result.output
+    assert session.query(Mortgage).one().payment_term == 20
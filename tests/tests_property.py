@@ -0,0 +1,66 @@
+import datetime
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from typer.testing import CliRunner
+
+from property_tracker.commands.property import app
+from property_tracker.instrumentation import count_statements
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, InvestorRepository, PropertyRepository
+from property_tracker.services import FinanceService
+
+
+@pytest.fixture
+def session(session, investor):
+    investor()
+    session.add_all(
+        Property(address=f"{i} High Street", property_type=PropertyType.FLAT, status=Status.RENTED) for i in range(1, 6)
+    )
+    session.commit()
+    finance_service = FinanceService(FinanceRepository(session), InvestorRepository(session))
+    for property_id in range(1, 6):
+        finance_service.purchase_property(
+            property_id, 1, datetime.date(2024, 6, 1), 250000, "", 62500, 100, 4.5, 187500, 25
+        )
+    session.expunge_all()
+    return session
+
+
+def test_property_detail_loads_in_a_constant_number_of_queries(session):
+    property_repository = PropertyRepository(session)
+
+    with count_statements() as one:
+        property_repository.get_property_detail([1])
+    session.expunge_all()
+    with count_statements() as five:
+        inv_properties = property_repository.get_property_detail([1, 2, 3, 4, 5])
+        owners = [
+            ownership.investor.last_name for inv_property in inv_properties for ownership in inv_property.ownerships
+        ]
+        expenses = [len(inv_property.expenses) for inv_property in inv_properties]
+
+    assert one.statements == five.statements == 7
+    assert owners == ["Lovelace"] * 5
+    assert expenses == [2] * 5
+
+
+def test_relationships_not_included_raise(session):
+    (inv_property,) = PropertyRepository(session).get_property_detail([1], include=["valuations"])
+
+    assert len(inv_property.valuations) == 1
+    with pytest.raises(InvalidRequestError):
+        inv_property.expenses
+    with pytest.raises(ValueError, match="Unknown property relationships: rent"):
+        PropertyRepository(session).get_property_detail([1], include=["rent"])
+
+
+def test_show_prints_the_included_records(session):
+    result = CliRunner().invoke(app, ["show", "1", "6", "--include", "expenses", "--include", "ownerships"])
+
+    assert result.exit_code == 0, result.output
+    assert "Stamp Duty" in result.output
+    assert "Lovelace" in result.output
+    assert "Valuations" not in result.output
+    assert "valued 250,000.00 on 2024-06-01" in result.output
+    assert "Properties not found: 6" in result.output
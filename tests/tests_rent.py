@@ -0,0 +1,119 @@
+import datetime
+
+import pytest
+
+from property_tracker.models.finance import PropertyMonthlyLedger, RentalIncome
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import (
+    FinanceRepository,
+    InvestorRepository,
+    LedgerRepository,
+    PortfolioRepository,
+    RentRepository,
+)
+from property_tracker.services import FinanceService, LedgerService, PortfolioService, RentService
+
+PAYMENTS_CSV = """property_id,period,amount,date,investor_id
+1,2024-01,1200,2024-01-03,
+1,2024-02,1150,2024-02-05,
+2,2024-01,900,2024-01-10,
+1,2024-03,twelve hundred,2024-03-01,
+"""
+
+
+@pytest.fixture
+def rent_service(session):
+    session.add_all(
+        [
+            Property(address="1 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED, monthly_rent=1200),
+            Property(address="2 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED, monthly_rent=900),
+            Property(address="3 Test Road", property_type=PropertyType.FLAT, status=Status.VACANT, monthly_rent=800),
+            Property(address="4 Test Road", property_type=PropertyType.FLAT, status=Status.RENTED),
+        ]
+    )
+    session.commit()
+    return RentService(RentRepository(session))
+
+
+def test_generate_rent_is_idempotent(rent_service):
+    db = rent_service.rent_repository.db
+
+    assert rent_service.generate_rent(datetime.date(2024, 1, 15), datetime.date(2024, 6, 1)) == 2 * 6
+    assert rent_service.generate_rent(datetime.date(2024, 4, 1), datetime.date(2024, 9, 30)) == 2 * 3
+
+    rents = db.query(RentalIncome).order_by(RentalIncome.property_id, RentalIncome.period).all()
+    assert len(rents) == 2 * 9
+    assert (rents[0].property_id, rents[0].period, rents[0].expected_amount, rents[0].amount) == (
+        1,
+        datetime.date(2024, 1, 1),
+        1200,
+        None,
+    )
+    assert {rent.property_id for rent in rents} == {1, 2}
+
+
+def test_record_payments_file_fills_generated_rent_and_can_be_rerun(rent_service, tmp_path):
+    db = rent_service.rent_repository.db
+    path = tmp_path / "payments.csv"
+    path.write_text(PAYMENTS_CSV)
+    rent_service.generate_rent(datetime.date(2024, 1, 1), datetime.date(2024, 3, 1))
+
+    result = rent_service.record_payments_file(path, chunk_size=2)
+    rent_service.record_payments_file(path)
+
+    assert (result.rows_read, result.rows_imported, result.rows_rejected) == (4, 3, 1)
+    assert db.query(RentalIncome).count() == 2 * 3
+    january = db.query(RentalIncome).filter_by(property_id=1, period=datetime.date(2024, 1, 1)).one()
+    assert (january.expected_amount, january.amount, january.date) == (1200, 1200, datetime.date(2024, 1, 3))
+    assert [
+        (row.month.month, row.rent_collected) for row in db.query(PropertyMonthlyLedger).filter_by(property_id=1)
+    ] == [
+        (1, 1200),
+        (2, 1150),
+    ]
+
+
+def test_collected_rent_and_recorded_payments_share_the_period(rent_service, tmp_path):
+    db = rent_service.rent_repository.db
+    path = tmp_path / "payments.csv"
+    path.write_text("property_id,period,amount,date,investor_id\n1,2024-01,1500,2024-01-03,\n")
+
+    FinanceService(FinanceRepository(db), InvestorRepository(db)).collect_rent(
+        property_id=1, investor_id=None, amount=1500, date="2024-01-03"
+    )
+    rent_service.record_payments_file(path)
+    rent_service.generate_rent(datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+    LedgerService(LedgerRepository(db)).rebuild(1)
+
+    rents = db.query(RentalIncome).filter_by(property_id=1).all()
+    assert [(rent.period, rent.amount, rent.expected_amount) for rent in rents] == [
+        (datetime.date(2024, 1, 1), 1500, None)
+    ]
+    assert [row.rent_collected for row in db.query(PropertyMonthlyLedger).filter_by(property_id=1)] == [1500]
+    summary = PortfolioService(PortfolioRepository(db)).get_property_summaries()[0]
+    assert summary.rent_collected == 1500
+
+
+def test_collected_rent_is_kept_per_period(rent_service):
+    db = rent_service.rent_repository.db
+    finance_service = FinanceService(FinanceRepository(db), InvestorRepository(db))
+
+    # June's rent paid late, then July's rent, then July's rent paid in two parts
+    finance_service.collect_rent(property_id=1, investor_id=None, amount=1200, date="2024-07-01", period="2024-06")
+    finance_service.collect_rent(property_id=1, investor_id=None, amount=1200, date="2024-07-28")
+    payment = finance_service.collect_rent(property_id=2, investor_id=None, amount=400, date="2024-07-02")
+    assert payment.amount == 400
+    payment = finance_service.collect_rent(property_id=2, investor_id=None, amount=500, date="2024-07-20")
+    assert (payment.period, payment.amount, payment.date) == (
+        datetime.date(2024, 7, 1),
+        900,
+        datetime.date(2024, 7, 20),
+    )
+
+    rents = db.query(RentalIncome).order_by(RentalIncome.property_id, RentalIncome.period).all()
+    assert [(rent.property_id, rent.period, rent.amount) for rent in rents] == [
+        (1, datetime.date(2024, 6, 1), 1200),
+        (1, datetime.date(2024, 7, 1), 1200),
+        (2, datetime.date(2024, 7, 1), 900),
+    ]
+    assert [row.rent_collected for row in db.query(PropertyMonthlyLedger).filter_by(property_id=1)] == [2400]
@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from property_tracker.services.cache import COPY_ON_WRITE, LRUCache
+from property_tracker.services.simulate_v2 import (
+    IncrementalSimulation,
+    InvestmentDetails,
+    InvestorType,
+    MortgageCalculator,
+    PropertyDetails,
+    MonteCarloSettings,
+    SimulationService,
+    simulation_node,
+)
+
+
+def iterative_schedule(principal, payment_term, annual_interest_rate):
+    monthly_interest_rate = annual_interest_rate / 1200
+    monthly_payment = MortgageCalculator.calculate_monthly_payment(principal, payment_term, annual_interest_rate)
+    balance = principal
+    payments = []
+    for month in range(1, 12 * payment_term + 1):
+        interest = balance * monthly_interest_rate
+        balance -= monthly_payment - interest
+        payments.append((month // 12 + 1, interest, monthly_payment - interest, balance))
+    return payments
+
+
+@pytest.mark.parametrize(
+    "principal, payment_term, annual_interest_rate",
+    [
+        (200000, 25, 4.5),
+        (150000, 35, 3.0),
+        (50000, 1, 7.0),
+    ],
+)
+def test_generate_payment_schedule_matches_iterative(principal, payment_term, annual_interest_rate):
+    schedule = MortgageCalculator.generate_payment_schedule(principal, payment_term, annual_interest_rate)
+    payments = iterative_schedule(principal, payment_term, annual_interest_rate)
+
+    assert schedule.iloc[0]["Balance"] == principal
+    for _, row in schedule.iloc[1:].iterrows():
+        months = [payment for payment in payments if payment[0] == row["Year"]]
+        assert row["Interest"] == pytest.approx(sum(month[1] for month in months), abs=0.01)
+        assert row["Principal"] == pytest.approx(sum(month[2] for month in months), abs=0.01)
+        assert row["Balance"] == pytest.approx(months[-1][3], abs=0.01)
+
+
+def test_generate_payment_schedule_zero_interest():
+    schedule = MortgageCalculator.generate_payment_schedule(120000, 10, 0)
+
+    assert MortgageCalculator.calculate_monthly_payment(120000, 10, 0) == 1000
+    assert schedule["Interest"].sum() == 0
+    assert schedule["Principal"].sum() == pytest.approx(120000)
+    assert schedule.iloc[-1]["Balance"] == pytest.approx(0)
+
+
+def test_generate_payment_schedules_matches_single_schedules():
+    principals = [200000, 150000, 120000]
+    payment_terms = [25, 35, 10]
+    annual_interest_rates = [4.5, 3.0, 0]
+
+    schedules = MortgageCalculator.generate_payment_schedules(principals, payment_terms, annual_interest_rates)
+    frame = schedules.to_frame()
+
+    assert schedules.balance.shape == (3, 37)
+    for loan, loan_args in enumerate(zip(principals, payment_terms, annual_interest_rates)):
+        schedule = MortgageCalculator.generate_payment_schedule(*loan_args)
+        assert schedules.monthly_payment[loan] == pytest.approx(
+            MortgageCalculator.calculate_monthly_payment(*loan_args)
+        )
+        assert schedules.mask[loan].sum() == len(schedule)
+        loan_frame = frame[frame["Loan"] == loan]
+        assert loan_frame["Year"].tolist() == schedule["Year"].tolist()
+        for column in ["Interest", "Principal", "Balance"]:
+            assert loan_frame[column].to_numpy() == pytest.approx(schedule[column].to_numpy(), abs=0.01)
+
+
+def make_property_details():
+    return PropertyDetails(
+        purchase_price=250000,
+        monthly_rent=1200,
+        insurance=30,
+        service_charge=100,
+        ground_rent=20,
+        annual_price_appreciation=0.03,
+        annual_rent_appreciation=0.02,
+    )
+
+
+def make_investment_details():
+    return InvestmentDetails(
+        down_payment=62500,
+        interest_rate=4.5,
+        payment_term=25,
+        legal_fees=2000,
+        refurbishment_cost=5000,
+        furnishing_cost=3000,
+    )
+
+
+def test_run_simulation_returns_numeric_yearly_metrics():
+    total_cash_investment, mortgage_payment, yearly_metrics = SimulationService().run_simulation(
+        make_property_details(), make_investment_details(), InvestorType.SOLE_TRADER, 10
+    )
+    schedule = MortgageCalculator.generate_payment_schedule(187500, 25, 4.5)
+
+    assert total_cash_investment == 62500 + 7500 + 2000 + 5000 + 3000
+    assert mortgage_payment == MortgageCalculator.calculate_monthly_payment(187500, 25, 4.5)
+    assert yearly_metrics["Year"].tolist() == list(range(10))
+    assert yearly_metrics["equity"].iloc[0] == 62500
+    assert yearly_metrics["equity"].iloc[5] == pytest.approx(250000 - schedule.iloc[6]["Balance"])
+    assert yearly_metrics["Annual Cash Flow"].iloc[3] == pytest.approx(
+        yearly_metrics["Annual Cash Flow"].iloc[0] * 1.02**3
+    )
+    assert yearly_metrics["Rental ROI"].to_numpy() == pytest.approx(
+        yearly_metrics["Annual Cash Flow"].to_numpy() / total_cash_investment
+    )
+
+
+def test_run_monte_carlo_is_reproducible_across_workers():
+    settings = MonteCarloSettings(num_paths=2000, chunk_size=500, seed=42, max_workers=1)
+    args = (make_property_details(), make_investment_details(), InvestorType.SOLE_TRADER, 10)
+
+    serial = SimulationService().run_monte_carlo(*args, settings=settings)
+    settings.max_workers = 2
+    parallel = SimulationService().run_monte_carlo(*args, settings=settings)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert (serial["Equity P5"] <= serial["Equity P50"]).all()
+    assert (serial["Equity P50"] <= serial["Equity P95"]).all()
+    assert serial["Equity P50"].iloc[0] == 62500
+
+
+def test_run_monte_carlo_without_uncertainty_collapses_bands():
+    settings = MonteCarloSettings(
+        num_paths=100,
+        price_appreciation_volatility=0,
+        rent_appreciation_volatility=0,
+        interest_rate_volatility=0,
+        mean_void_weeks=0,
+        max_workers=1,
+    )
+
+    bands = SimulationService().run_monte_carlo(
+        make_property_details(), make_investment_details(), InvestorType.SOLE_TRADER, 30, settings=settings
+    )
+
+    assert bands["Cash Flow P5"].to_numpy() == pytest.approx(bands["Cash Flow P95"].to_numpy())
+    assert bands["Equity P50"].iloc[29] == pytest.approx(250000 * 1.03**29)
+
+
+def test_run_sweep_matches_run_simulation():
+    simulation_service = SimulationService()
+    sweep = simulation_service.run_sweep(
+        make_property_details(),
+        make_investment_details(),
+        InvestorType.SOLE_TRADER,
+        10,
+        {"down_payment": [62500, 100000, 150000], "payment_term": [15, 25]},
+        chunk_size=4,
+    )
+
+    assert len(sweep) == 6
+    assert sweep["total_roi"].is_monotonic_decreasing
+    for row in sweep.itertuples():
+        investment_details = make_investment_details()
+        investment_details.down_payment = row.down_payment
+        investment_details.payment_term = int(row.payment_term)
+        _, _, yearly_metrics = simulation_service.run_simulation(
+            make_property_details(), investment_details, InvestorType.SOLE_TRADER, 10
+        )
+        assert row.equity == pytest.approx(yearly_metrics["equity"].iloc[-1], abs=0.01)
+        assert row.rental_roi == pytest.approx(yearly_metrics["Rental ROI"].iloc[-1])
+        assert row.cumulative_cash_flow == pytest.approx(yearly_metrics["Annual Cash Flow"].sum())
+
+
+def test_run_sweep_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        SimulationService().run_sweep(
+            make_property_details(), make_investment_details(), InvestorType.SOLE_TRADER, 10, {"deposit": [1]}
+        )
+
+
+def test_run_sweep_rejects_fields_without_values():
+    with pytest.raises(ValueError, match="Sweep fields without values: payment_term"):
+        SimulationService().run_sweep(
+            make_property_details(),
+            make_investment_details(),
+            InvestorType.SOLE_TRADER,
+            10,
+            {"down_payment": [62500], "payment_term": []},
+        )
+
+
+@pytest.mark.parametrize("settings", [{"num_paths": 0}, {"num_paths": -5}, {"chunk_size": 0}])
+def test_monte_carlo_settings_reject_empty_runs(settings):
+    with pytest.raises(ValueError, match="must be at least 1"):
+        MonteCarloSettings(**settings)
+
+
+def test_lru_cache_evicts_least_recently_used_entry():
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("b", lambda: 4) == 4
+    assert cache.info() == (1, 4, 2, 2)
+
+
+def test_run_simulation_is_cached_and_returns_snapshots():
+    simulation_service = SimulationService(cache=LRUCache(maxsize=4))
+    args = (make_property_details(), make_investment_details(), InvestorType.SOLE_TRADER, 10)
+
+    _, _, yearly_metrics = simulation_service.run_simulation(*args)
+    yearly_metrics["equity"] = 0
+    _, _, cached_yearly_metrics = simulation_service.run_simulation(*args)
+    _, _, other_yearly_metrics = simulation_service.run_simulation(*args)
+    cached_yearly_metrics.loc[0, "equity"] = 0
+
+    assert simulation_service.cache.info().hits == 2
+    assert other_yearly_metrics["equity"].iloc[0] == 62500
+    assert simulation_service.run_simulation(*args)[2]["equity"].iloc[0] == 62500
+
+
+@pytest.mark.skipif(not COPY_ON_WRITE, reason="cached frames are copied without Copy-on-Write")
+def test_cache_hits_share_the_data_of_the_cached_frames():
+    cache = LRUCache(maxsize=1)
+    cache.get_or_compute("a", lambda: pd.DataFrame({"x": [1.0, 2.0]}))
+
+    first, second = cache.get_or_compute("a", list), cache.get_or_compute("a", list)
+
+    assert np.shares_memory(first["x"].to_numpy(), second["x"].to_numpy())
+
+
+def test_incremental_simulation_recomputes_only_the_changed_nodes():
+    simulation = IncrementalSimulation()
+    property_details = make_property_details()
+    simulation.run(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+
+    property_details.insurance += 50
+    results = simulation.run(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+    assert simulation.recomputed == ["running_costs", "annual_cash_flow", "yearly_metrics"]
+
+    simulation.run(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+    assert simulation.recomputed == []
+
+    expected = SimulationService().compute_simulation(
+        property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10
+    )
+    assert results[:2] == expected[:2]
+    pd.testing.assert_frame_equal(results[2], expected[2])
+
+
+def test_service_recomputes_its_simulation_on_cache_misses():
+    simulation_service = SimulationService(cache=LRUCache(maxsize=4), simulation=IncrementalSimulation())
+    property_details = make_property_details()
+    simulation_service.run_simulation(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+
+    property_details.insurance += 50
+    simulation_service.run_simulation(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+    assert simulation_service.simulation.recomputed == ["running_costs", "annual_cash_flow", "yearly_metrics"]
+
+    simulation_service.run_simulation(property_details, make_investment_details(), InvestorType.SOLE_TRADER, 10)
+    assert simulation_service.cache.info().hits == 1
+
+
+def test_simulation_nodes_must_depend_on_known_inputs():
+    with pytest.raises(ValueError, match="Unknown inputs of the simulation node vacancy: void_weeks"):
+
+        @simulation_node
+        def vacancy(void_weeks):
+            return void_weeks
@@ -0,0 +1,133 @@
+import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from property_tracker import database
+from property_tracker.database import DatabaseSettings
+from property_tracker.instrumentation import count_statements
+from property_tracker.models.finance import Valuation, ValuationType
+from property_tracker.models.property import Property, PropertyType, Status
+from property_tracker.repositories import FinanceRepository, ImportRepository, ValuationRepository
+from property_tracker.services import ValuationService
+from property_tracker.services.valuation import ValuationIndex
+
+
+@pytest.fixture
+def session(session):
+    for number in range(1, 4):
+        session.add(Property(address=f"{number} Test Road", property_type=PropertyType.FLAT, status=Status.RENTED))
+    session.add_all(
+        [
+            Valuation(property_id=1, valuation_date=datetime.date(2024, 1, 1), valuation_amount=200000),
+            Valuation(property_id=1, valuation_date=datetime.date(2025, 1, 1), valuation_amount=220000),
+            Valuation(property_id=1, valuation_date=datetime.date(2025, 1, 1), valuation_amount=225000),
+            Valuation(property_id=1, valuation_date=datetime.date(2023, 1, 1), valuation_amount=180000),
+            Valuation(property_id=2, valuation_date=datetime.date(2024, 6, 1), valuation_amount=300000),
+        ]
+    )
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def service(session):
+    return ValuationService(ValuationRepository(session))
+
+
+def test_latest_valuations_query(session):
+    rows = ValuationRepository(session).get_latest_valuations()
+    assert [tuple(row) for row in rows] == [
+        (1, datetime.date(2025, 1, 1), 225000),
+        (2, datetime.date(2024, 6, 1), 300000),
+    ]
+
+    rows = ValuationRepository(session).get_latest_valuations(datetime.date(2024, 3, 1))
+    assert [tuple(row) for row in rows] == [(1, datetime.date(2024, 1, 1), 200000)]
+
+
+@pytest.mark.parametrize(
+    "as_of", [None, datetime.date(2022, 1, 1), datetime.date(2024, 1, 1), datetime.date(2024, 7, 1)]
+)
+def test_index_matches_query(service, as_of):
+    assert service.get_valuations(as_of) == service.query_valuations(as_of)
+
+
+def test_index_lookups(service):
+    with count_statements() as stats:
+        assert service.get_valuation(1).valuation_amount == 225000
+        assert service.get_valuation(1, datetime.date(2024, 12, 31)).valuation_amount == 200000
+        assert service.get_valuation(1, datetime.date(2022, 12, 31)) is None
+        assert service.get_valuation(3) is None
+        assert set(service.get_valuations()) == {1, 2}
+    assert stats.statements == 1
+
+
+def test_valuation_writes_invalidate_their_property(session, service):
+    service.get_valuations()
+    FinanceRepository(session).create_valuation_record(3, "2025-02-01", 150000, ValuationType.PURCHASE)
+    ImportRepository(session).bulk_insert(
+        Valuation, [{"property_id": 2, "valuation_date": datetime.date(2025, 3, 1), "valuation_amount": 310000}]
+    )
+
+    with count_statements() as stats:
+        assert service.get_valuation(3).valuation_amount == 150000
+        assert service.get_valuation(2).valuation_amount == 310000
+        assert service.get_valuation(1).valuation_amount == 225000
+    assert stats.statements == 1
+    assert "property_id IN" in next(iter(stats.counts))
+
+
+def test_rolled_back_writes_keep_the_index(session, service):
+    service.get_valuations()
+    with pytest.raises(RuntimeError):
+        with FinanceRepository(session).unit_of_work() as finance_repository:
+            finance_repository.create_valuation_record(3, "2025-02-01", 150000, ValuationType.PURCHASE)
+            raise RuntimeError
+
+    with count_statements() as stats:
+        assert service.get_valuation(3) is None
+    assert stats.statements == 0
+
+
+def test_orm_valuation_writes_invalidate_their_property(session, service):
+    service.get_valuations()
+    session.add(Valuation(property_id=3, valuation_date=datetime.date(2025, 2, 1), valuation_amount=150000))
+    session.get(Valuation, 5).valuation_amount = 305000
+    session.commit()
+
+    assert service.get_valuation(3).valuation_amount == 150000
+    assert service.get_valuation(2).valuation_amount == 305000
+
+
+def test_refresh_reads_the_history_without_the_lock(session):
+    index = ValuationIndex()
+    valuation_repository = ValuationRepository(session)
+    get_valuation_history = valuation_repository.get_valuation_history
+    locked = []
+
+    def read_history(*args):
+        locked.append(index._lock.locked())
+        return get_valuation_history(*args)
+
+    valuation_repository.get_valuation_history = read_history
+    service = ValuationService(valuation_repository, index)
+    service.get_valuations()
+    index.invalidate([1])
+    assert service.get_valuation(1).valuation_amount == 225000
+    assert locked == [False, False]
+
+
+def test_index_reloads_from_another_database(session, service):
+    assert service.get_valuation(1).valuation_amount == 225000
+
+    database.configure(DatabaseSettings(url="sqlite://"))
+    other_session = database.get_session()
+    other_session.add(Property(address="1 Other Road", property_type=PropertyType.FLAT, status=Status.RENTED))
+    # a core insert, so that the session does not invalidate the property in the index
+    other_session.execute(
+        insert(Valuation).values(property_id=1, valuation_date=datetime.date(2025, 1, 1), valuation_amount=99000)
+    )
+    other_session.commit()
+
+    assert ValuationService(ValuationRepository(other_session)).get_valuation(1).valuation_amount == 99000